@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""star systems generation throughput per level of detail"""
+
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gs4worldbuilding import Builder, Detail
+
+
+def main(n=50):
+    warnings.simplefilter('ignore')
+    print('| detail | systems/s |')
+    print('|:-:|:-:|')
+    for detail in Detail:
+        start = time.perf_counter()
+        for seed in range(1, n + 1):
+            Builder.build_star_system(seed, detail=detail)
+        print(f'| {detail.value} | {n / (time.perf_counter() - start):.1f} |')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""streaming generation throughput and latency with and without pooling"""
+
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gs4worldbuilding import Builder
+
+
+def _latencies(seeds, detail, pooled):
+    """the seconds taken by each system of a flattened stream"""
+    latencies = []
+    start = time.perf_counter()
+    for _ in Builder.iter_star_systems(seeds, detail=detail, flatten=True,
+                                       pooled=pooled):
+        latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+    return np.array(latencies)
+
+
+def main(n=36, detail='types'):
+    warnings.simplefilter('ignore')
+    # seeds which do not hit the nan luminosities or tidal effects
+    seeds = [(42, 7, 3, 11, 5, 1)[i % 6] for i in range(n)]
+    _latencies(seeds[:1], detail, False)
+    print('| pooled | systems/s | p50 ms | p99 ms |')
+    print('|:-:|:-:|:-:|:-:|')
+    for pooled in (False, True):
+        latencies = _latencies(seeds, detail, pooled)
+        print(f'| {pooled} | {len(latencies) / latencies.sum():.2f} | '
+              f'{np.percentile(latencies, 50) * 1e3:.0f} | '
+              f'{np.percentile(latencies, 99) * 1e3:.0f} |')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) if arg.isdigit() else arg for arg in sys.argv[1:]))
@@ -4,6 +4,7 @@ from .planet import Planet, InplacePlanet
 from .terrestrial import Terrestrial
 from .star_system import StarSystem
 from .star import Star
+from .detail import Detail
 from . import constants
 from . import units
 from .builder import Builder
@@ -3,6 +3,8 @@
 from .world import World
 from .model import bounds, RandomizableModel
 from .random import RandomGenerator
+from .tables import Table
+from .utils import class_factory
 
 import numpy as np
 
@@ -18,23 +20,21 @@ class AsteroidBelt(RandomizableModel, World):
     _absorption = .97
     _resource_bounds = bounds.ValueBounds(World.Resource.WORTHLESS,
                                           World.Resource.MOTHERLODE)
+    _resources = Table({4: World.Resource.WORTHLESS,
+                        5: World.Resource.VERY_SCANT,
+                        6: World.Resource.SCANT,
+                        8: World.Resource.VERY_POOR,
+                        10: World.Resource.POOR,
+                        12: World.Resource.AVERAGE,
+                        14: World.Resource.ABUNDANT,
+                        16: World.Resource.VERY_ABUNDANT,
+                        17: World.Resource.RICH,
+                        18: World.Resource.VERY_RICH},
+                       default=World.Resource.MOTHERLODE)
 
     def random_resource(self) -> None:
         """sum of a 3d roll times over Resource Value Table"""
-        table = {4: World.Resource.WORTHLESS,
-                 5: World.Resource.VERY_SCANT,
-                 6: World.Resource.SCANT,
-                 8: World.Resource.VERY_POOR,
-                 10: World.Resource.POOR,
-                 12: World.Resource.AVERAGE,
-                 14: World.Resource.ABUNDANT,
-                 16: World.Resource.VERY_ABUNDANT,
-                 17: World.Resource.RICH,
-                 18: World.Resource.VERY_RICH}
-        roll = RandomGenerator().roll3d6()
-        filtered = list(filter(lambda x: roll < x, table.keys()))
-        self.resource = (table[filtered[0]] if len(filtered) > 0 else
-                         World.Resource.MOTHERLODE)
+        self.resource = self._resources.lookup(RandomGenerator().roll3d6())
 
     @property
     def blackbody_correction(self) -> float:
@@ -46,7 +46,7 @@ class AsteroidBelt(RandomizableModel, World):
         """the habitability score"""
         return 0
 
-    def __init__(self, orbit=None):
+    def __init__(self, orbit=None, randomize=True):
 
         self._orbit = orbit
 
@@ -56,9 +56,12 @@ class AsteroidBelt(RandomizableModel, World):
             world = self
             world.__class__ = inplace(type(self))
 
-        self.randomize()
+        if randomize:
+            # or left to assign
+            self.randomize()
 
 
+@class_factory
 def inplace(world):
 
     class InplaceAsteroidBelt(world):
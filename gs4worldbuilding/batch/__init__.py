@@ -0,0 +1,18 @@
+from .stellar import stellar_properties, LUMINOSITY_CLASSES
+from .layout import orbital_layouts, Layouts, GAS_GIANT_ARRANGEMENTS
+from .moons import moon_systems, materialize_moons, Moons, SIZES
+from .terrestrial import terrestrial_properties, temperatures
+from .gas_giant import gas_giant_properties, GAS_GIANT_TYPES
+from .star_system import (star_systems, star_layouts, StarSystems,
+                          POPULATIONS, SEPARATIONS)
+from .classify import (climate, pressure_category, habitability, affinity,
+                       CLIMATES, PRESSURES, VOLCANIC_ACTIVITIES,
+                       TECTONIC_ACTIVITIES)
+from .catalog import catalog, Catalog, WORLD_TYPES
+from .views import (SystemViews, SystemView, StarView, AsteroidBeltView,
+                    GasGiantView, TerrestrialView, MoonView, OrbitView,
+                    world_view)
+from .records import (records, share, unlink, Records, SharedRecords,
+                      SYSTEM_RECORD, STAR_RECORD, WORLD_RECORD)
+from .aggregate import (Counts, Histogram, Moments, Quantiles, Statistics,
+                        merge_tree)
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from .catalog import WORLD_TYPES
+
+
+def _values(values):
+    """the float array of values without nan"""
+    values = np.asarray(values, dtype=float).ravel()
+    return values[~np.isnan(values)]
+
+
+class Counts():
+    """counts of the codes indexing categories, -1 codes are not counted"""
+
+    def __init__(self, categories):
+        self.categories = tuple(categories)
+        self.counts = np.zeros(len(self.categories), dtype=np.int64)
+
+    def update(self, codes):
+        codes = np.asarray(codes).ravel()
+        self.counts += np.bincount(codes[codes >= 0],
+                                   minlength=len(self.categories))
+        return self
+
+    def merge(self, other):
+        if other.categories != self.categories:
+            raise ValueError("can't merge counts of other categories")
+        self.counts += other.counts
+        return self
+
+    def __getitem__(self, category):
+        return int(self.counts[self.categories.index(category)])
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+
+class Histogram():
+    """counts of values over fixed bin edges, the last bin including its
+    upper edge, with the values below the first edge and above the last one
+    counted apart"""
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, values):
+        values = _values(values)
+        self.counts += np.histogram(values, self.edges)[0]
+        self.underflow += int(np.sum(values < self.edges[0]))
+        self.overflow += int(np.sum(values > self.edges[-1]))
+        return self
+
+    def merge(self, other):
+        if not np.array_equal(other.edges, self.edges):
+            raise ValueError("can't merge histograms of other bin edges")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+
+class Moments():
+    """count, mean and central moments sums of values up to the fourth,
+    merged with the pairwise update formulas of Pébay (2008), nan values
+    are left out"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = np.nan
+        # sums of the powers 2 to 4 of the deviations from the mean
+        self._m = np.zeros(3)
+
+    def update(self, values):
+        values = _values(values)
+        if len(values) == 0:
+            return self
+        batch = Moments()
+        batch.count = len(values)
+        batch.mean = values.mean()
+        deviations = values - batch.mean
+        batch._m = np.array([np.sum(deviations ** k) for k in (2, 3, 4)])
+        return self.merge(batch)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self._m = (other.count, other.mean,
+                                              other._m.copy())
+            return self
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        (m2a, m3a, m4a), (m2b, m3b, m4b) = self._m, other._m
+        m2 = m2a + m2b + delta ** 2 * na * nb / n
+        m3 = (m3a + m3b + delta ** 3 * na * nb * (na - nb) / n ** 2 +
+              3 * delta * (na * m2b - nb * m2a) / n)
+        m4 = (m4a + m4b +
+              delta ** 4 * na * nb * (na ** 2 - na * nb + nb ** 2) / n ** 3 +
+              6 * delta ** 2 * (na ** 2 * m2b + nb ** 2 * m2a) / n ** 2 +
+              4 * delta * (na * m3b - nb * m3a) / n)
+        self.count, self.mean = n, self.mean + delta * nb / n
+        self._m = np.array([m2, m3, m4])
+        return self
+
+    @property
+    def variance(self) -> float:
+        """the population variance"""
+        return self._m[0] / self.count if self.count else np.nan
+
+    @property
+    def skewness(self) -> float:
+        return (np.sqrt(self.count) * self._m[1] / self._m[0] ** 1.5
+                if self.count and self._m[0] else np.nan)
+
+    @property
+    def kurtosis(self) -> float:
+        """the excess kurtosis"""
+        return (self.count * self._m[2] / self._m[0] ** 2 - 3
+                if self.count and self._m[0] else np.nan)
+
+
+class Quantiles():
+    """quantiles sketch of values within a relative accuracy, counting the
+    values in logarithmic buckets which merge exactly (DDSketch, Masson et
+    al. 2019), nan values are left out"""
+
+    def __init__(self, relative_accuracy=.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('relative accuracy has to be in ]0, 1[')
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        # bucket counts of the positive and negative values magnitudes
+        self._positive, self._negative = {}, {}
+        self._zeros = 0
+        self.count = 0
+
+    def _add(self, buckets, magnitudes):
+        keys, counts = np.unique(np.ceil(np.log(magnitudes) /
+                                         np.log(self._gamma)).astype(int),
+                                 return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            buckets[key] = buckets.get(key, 0) + count
+
+    def update(self, values):
+        values = _values(values)
+        self._add(self._positive, values[values > 0])
+        self._add(self._negative, -values[values < 0])
+        self._zeros += int(np.sum(values == 0))
+        self.count += len(values)
+        return self
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("can't merge quantiles of another accuracy")
+        for buckets, others in ((self._positive, other._positive),
+                                (self._negative, other._negative)):
+            for key, count in others.items():
+                buckets[key] = buckets.get(key, 0) + count
+        self._zeros += other._zeros
+        self.count += other.count
+        return self
+
+    def _value(self, key):
+        """the value of a bucket, within the relative accuracy of its
+        values"""
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def quantile(self, q) -> float:
+        """the value of the q quantile"""
+        if not 0 <= q <= 1:
+            raise ValueError('quantile has to be in [0, 1]')
+        if self.count == 0:
+            return np.nan
+        rank, seen = q * (self.count - 1), 0
+        buckets = ([(-self._value(k), self._negative[k])
+                    for k in sorted(self._negative, reverse=True)] +
+                   [(0., self._zeros)] +
+                   [(self._value(k), self._positive[k])
+                    for k in sorted(self._positive)])
+        for value, count in buckets:
+            seen += count
+            if seen > rank:
+                return value
+        return buckets[-1][0]
+
+
+def merge_tree(aggregates):
+    """the merge of a list of aggregates, by pairs of neighbours level after
+    level, so that the floating point sums only depend on the order of the
+    list and not on the order in which the aggregates were computed"""
+    aggregates = list(aggregates)
+    if not aggregates:
+        raise ValueError("can't merge an empty list of aggregates")
+    while len(aggregates) > 1:
+        aggregates = [aggregates[i].merge(aggregates[i + 1])
+                      if i + 1 < len(aggregates) else aggregates[i]
+                      for i in range(0, len(aggregates), 2)]
+    return aggregates[0]
+
+
+class Statistics():
+    """the statistics of a stream of star systems Records: the counts of
+    the world types of the worlds orbiting stars and of the moons, the
+    histograms of the worlds habitability and of the stars masses in M☉,
+    and the moments and quantiles of the worlds average temperatures in K"""
+
+    _HABITABILITY_EDGES = np.arange(-10, 12) - .5
+    _MASS_EDGES = np.geomspace(.08, 3, 33)
+
+    def __init__(self, relative_accuracy=.01):
+        self.systems = 0
+        self.world_types = Counts(WORLD_TYPES)
+        self.moon_types = Counts(WORLD_TYPES)
+        self.habitability = Histogram(self._HABITABILITY_EDGES)
+        self.star_mass = Histogram(self._MASS_EDGES)
+        self.temperature = Moments()
+        self.temperature_quantiles = Quantiles(relative_accuracy)
+
+    def update(self, records):
+        worlds = records.worlds
+        planets = worlds['parent'] < 0
+        self.systems += len(records.systems)
+        self.world_types.update(worlds['type'][planets])
+        self.moon_types.update(worlds['type'][~planets])
+        self.habitability.update(worlds['habitability'])
+        self.star_mass.update(records.stars['mass'])
+        self.temperature.update(worlds['temperature'])
+        self.temperature_quantiles.update(worlds['temperature'])
+        return self
+
+    def merge(self, other):
+        self.systems += other.systems
+        for name in ('world_types', 'moon_types', 'habitability',
+                     'star_mass', 'temperature', 'temperature_quantiles'):
+            getattr(self, name).merge(getattr(other, name))
+        return self
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+import numpy as np
+from astropy import units as u
+from astropy.units import cds
+
+from ..random import RandomGenerator
+from ..units import d_earth, D_earth, G_earth
+from ..star import Star
+from ..asteroid_belt import AsteroidBelt
+from .. import terrestrial
+from ..populate_star import _WORLD_TYPES, _ORBIT_CONTENTS
+from .star_system import star_systems, star_layouts
+from .gas_giant import gas_giant_properties, GAS_GIANT_TYPES
+from .terrestrial import terrestrial_properties
+from .moons import moon_systems, SIZES
+from .classify import climate, pressure_category
+
+# world types in order of their codes in the worlds and moons tables, -1
+# stands for terrestrials no world type matches (nan temperatures)
+WORLD_TYPES = (AsteroidBelt, *GAS_GIANT_TYPES,
+               terrestrial.TinyIce, terrestrial.TinySulfur,
+               terrestrial.TinyRock, terrestrial.SmallHadean,
+               terrestrial.SmallIce, terrestrial.SmallRock,
+               terrestrial.StandardHadean, terrestrial.StandardAmmonia,
+               terrestrial.StandardIce, terrestrial.StandardOcean,
+               terrestrial.StandardGarden, terrestrial.StandardGreenhouse,
+               terrestrial.StandardChthonian, terrestrial.LargeAmmonia,
+               terrestrial.LargeIce, terrestrial.LargeOcean,
+               terrestrial.LargeGarden, terrestrial.LargeGreenhouse,
+               terrestrial.LargeChthonian)
+
+# linked tables of a catalog, the rows of each table are sorted by parent
+# and the rows of parent i are offsets[table][i]:offsets[table][i + 1]
+Catalog = namedtuple('Catalog', ['systems', 'stars', 'orbits', 'worlds',
+                                 'moons', 'offsets'])
+
+_ARRANGEMENTS = tuple(Star.GasGiantArrangement)
+_NONE, _CONVENTIONAL, _ECCENTRIC, _EPISTELLAR = range(len(_ARRANGEMENTS))
+
+# kinds of the entries of the make_worlds orbits list
+_LIMIT, _FORBIDDEN_ZONE, _GAS_GIANT, _EMPTY = range(4)
+
+
+def _type_codes(types):
+    """the default then alternative world type codes of the outcomes of a
+    World Types Table, -1 past the outcomes"""
+    outcomes = types.outcomes[:-1]
+    return (np.array([WORLD_TYPES.index(t[0]) for t in outcomes] + [-1]),
+            np.array([WORLD_TYPES.index(t[1]) if len(t) > 1 else -1
+                      for t in outcomes] + [-1]))
+
+
+# world type codes by ammonia flag and size code
+_TYPE_CODES = {(ammonia, SIZES.index(size)): _type_codes(types)
+               for ammonia, tables in _WORLD_TYPES.items()
+               for size, types in tables.items()}
+
+
+def _offsets(parent, n):
+    """the offsets of the rows of n parents in a table sorted by parent"""
+    return np.searchsorted(parent, np.arange(n + 1))
+
+
+def terrestrial_types(size, blackbody_temperature, ammonia, age,
+                      gas_giant_parent=False):
+    """the world type codes (indexing WORLD_TYPES) of terrestrials of given
+    size codes at blackbody temperatures in K over the World Types Table,
+    given whether their star is light enough for ammonia worlds, the system
+    ages in Ga and for moons whether their parent is a gas giant, rolling
+    for the garden and sulfur alternatives as terrestrial_type does"""
+    size, temperature, ammonia, age, gas_giant_parent = (np.ravel(a) for a in (
+        np.broadcast_arrays(size, np.asarray(blackbody_temperature,
+                                             dtype=float),
+                            np.asarray(ammonia, dtype=bool),
+                            np.asarray(age, dtype=float),
+                            np.asarray(gas_giant_parent, dtype=bool))))
+    codes, alternatives = np.full(len(size), -1), np.full(len(size), -1)
+
+    tiny = size == SIZES.index(terrestrial.Terrestrial.Size.TINY)
+    codes[tiny] = np.where(temperature[tiny] > 140,
+                           WORLD_TYPES.index(terrestrial.TinyRock),
+                           WORLD_TYPES.index(terrestrial.TinyIce))
+    # tiny sulfur worlds are rolled for the ice moons of gas giants
+    mask = tiny & (temperature <= 140) & gas_giant_parent
+    sulfur = RandomGenerator().roll1d6(size=np.count_nonzero(mask)) < 4
+    codes[np.flatnonzero(mask)[sulfur]] = WORLD_TYPES.index(
+        terrestrial.TinySulfur)
+
+    for (flag, code), (defaults, alternates) in _TYPE_CODES.items():
+        mask = ~tiny & (size == code) & (ammonia == flag)
+        index = _WORLD_TYPES[flag][SIZES[code]].index(temperature[mask])
+        codes[mask], alternatives[mask] = defaults[index], alternates[index]
+
+    # garden worlds are rolled with a modifier growing with the system age
+    mask = alternatives >= 0
+    cap = np.where(size[mask] == SIZES.index(
+        terrestrial.Terrestrial.Size.STANDARD), 10, 5)
+    garden = (RandomGenerator().roll3d6(size=np.count_nonzero(mask)) +
+              np.minimum(age[mask] // .5, cap)) >= 18
+    codes[np.flatnonzero(mask)[garden]] = alternatives[mask][garden]
+    return codes
+
+
+def place_gas_giants(stars, layouts):
+    """places the gas giants over the orbits of a stars table following
+    populate_star and make_gas_giants, a placed gas giant skips the roll of
+    the next orbit as the scalar procedure does
+
+    returns the gas giant mask of the layouts radii and whether each radius
+    is taken as the first beyond the snow line"""
+    n_orbits = np.diff(layouts.offsets)
+    star = np.repeat(np.arange(len(n_orbits)), n_orbits)
+    position = np.arange(len(layouts.radii)) - layouts.offsets[star]
+    snow_line = stars['snow_line'].to(u.au).value[star]
+    arrangement = stars['gas_giant_arrangement'][star]
+    # the outermost radius is the one taken as first beyond the snow line
+    first_beyond = ((position == n_orbits[star] - 1) &
+                    (layouts.radii >= snow_line))
+
+    gas_giant = ((position == layouts.first_gas_giant[star]) &
+                 (position > 0))
+    inside = layouts.radii <= snow_line
+    threshold = np.where(
+        inside, np.select([arrangement == _ECCENTRIC,
+                           arrangement == _EPISTELLAR], [8, 6], 0),
+        np.where(arrangement == _CONVENTIONAL, 15, 14))
+    threshold[arrangement == _NONE] = 0
+
+    # rank of each remaining radius within its star
+    remaining = ~gas_giant
+    count = np.concatenate([[0], np.cumsum(remaining)])
+    rank = count[1:] - 1 - count[layouts.offsets[:-1]][star]
+    skip = np.zeros(len(n_orbits), dtype=bool)
+    for k in range(rank.max(initial=-1) + 1):
+        rows = np.flatnonzero(remaining & (rank == k))
+        rows = rows[~skip[star[rows]]]
+        rows = rows[threshold[rows] > 0]
+        placed = rows[RandomGenerator().roll3d6(size=len(rows)) <=
+                      threshold[rows]]
+        gas_giant[placed] = True
+        skip[:] = False
+        skip[star[placed]] = True
+    return gas_giant, first_beyond
+
+
+def place_worlds(stars, layouts, gas_giant):
+    """rolls the contents of the orbits left empty by the gas giants over
+    the make_worlds table, with the modifiers of the neighbouring limits,
+    forbidden zone limits and gas giants
+
+    returns the content codes of the layouts radii, indexing the outcomes
+    of populate_star._ORBIT_CONTENTS, 0 for empty orbits and gas giants"""
+    n = len(layouts.offsets) - 1
+    star = np.repeat(np.arange(n), np.diff(layouts.offsets))
+    forbidden = np.flatnonzero(~np.isnan(stars['forbidden_lower'].value))
+    entries = [
+        (np.tile(np.arange(n), 2), np.concatenate(
+            [stars['inner_limit'].to(u.au).value,
+             stars['outer_limit'].to(u.au).value]), _LIMIT, -1),
+        (np.tile(forbidden, 2), np.concatenate(
+            [stars['forbidden_lower'].to(u.au).value[forbidden],
+             stars['forbidden_upper'].to(u.au).value[forbidden]]),
+         _FORBIDDEN_ZONE, -1),
+        (star[gas_giant], layouts.radii[gas_giant], _GAS_GIANT, -1),
+        (star[~gas_giant], layouts.radii[~gas_giant], _EMPTY,
+         np.flatnonzero(~gas_giant))]
+    entry_star = np.concatenate([e[0] for e in entries])
+    radius = np.concatenate([e[1] for e in entries])
+    kind = np.concatenate([np.full(len(e[0]), e[2]) for e in entries])
+    row = np.concatenate([np.broadcast_to(e[3], len(e[0])) for e in entries])
+
+    # entries sorted by radius per star, ties kept in insertion order
+    order = np.lexsort((radius, entry_star))
+    entry_star, kind, row = entry_star[order], kind[order], row[order]
+    previous = np.concatenate([[-1], kind[:-1]])
+    previous[1:][entry_star[1:] != entry_star[:-1]] = -1
+    following = np.concatenate([kind[1:], [-1]])
+    following[:-1][entry_star[1:] != entry_star[:-1]] = -1
+
+    # the first entry of each star is never rolled
+    rolled = (kind == _EMPTY) & (previous >= 0)
+    modifier = (np.where((previous == _LIMIT) | (following == _LIMIT),
+                         -3, 0) +
+                np.where((previous == _FORBIDDEN_ZONE) |
+                         (following == _FORBIDDEN_ZONE), -6, 0) +
+                np.where(previous == _GAS_GIANT, -3, 0) +
+                np.where(following == _GAS_GIANT, -6, 0))[rolled]
+    content = np.zeros(len(layouts.radii), dtype=int)
+    content[row[rolled]] = _ORBIT_CONTENTS.index(
+        RandomGenerator().roll3d6(size=len(modifier)) + modifier)
+    return content
+
+
+def _physical_properties(codes, blackbody_temperature):
+    """the physical parameters columns of terrestrials given their world type
+    codes and blackbody temperatures in K, nan where not applicable"""
+    columns = {name: np.full(len(codes), np.nan) for name in (
+        'density', 'diameter', 'mass', 'gravity', 'hydrographic_coverage',
+        'volatile_mass', 'temperature', 'pressure')}
+    for code in np.unique(codes[codes >= 0]):
+        mask = codes == code
+        for name, values in terrestrial_properties(
+                WORLD_TYPES[code], blackbody_temperature[mask]).items():
+            columns[name][mask] = getattr(values, 'value', values)
+    return columns
+
+
+def _eccentricities(n):
+    """n planetary orbits eccentricities drawn as Orbit does"""
+    return RandomGenerator().truncnorm_draw(0, .8, .20295,
+                                            .15273767544387992, size=n)
+
+
+def _units(columns):
+    """the physical parameters columns with their units"""
+    units = {'density': d_earth, 'diameter': D_earth, 'mass': u.M_earth,
+             'gravity': G_earth, 'temperature': u.K,
+             'blackbody_temperature': u.K, 'pressure': cds.atm,
+             'orbital_radius': u.au}
+    return {name: (values * units[name] if name in units else values)
+            for name, values in columns.items()}
+
+
+def catalog(n, open_cluster=False, garden_host=False):
+    """generates n star systems down to their moons as linked tables,
+    following the StarSystem, Star and populate_star procedures without
+    building any object
+
+    returns a Catalog of:
+    - the systems table of star_systems
+    - the stars table of star_systems
+    - an orbits table of the star and radius of each orbit of the stars
+      layouts and of the index of the world occupying it, -1 if empty
+    - a worlds table of the star, orbit, world type code (indexing
+      WORLD_TYPES), orbital radius and eccentricity, blackbody temperature,
+      physical parameters, climate and pressure category codes and numbers
+      of moons, moonlets and captured moonlets of each world
+    - a moons table of the parent world, world type code, orbital radius and
+      eccentricity, blackbody temperature, physical parameters, climate and
+      pressure category codes of each major moon
+    - the offsets of the stars of each system, of the orbits and worlds of
+      each star and of the moons of each world
+
+    nan values stand for parameters not applicable to the world type, the
+    distributions follow the object model while the draws are taken from
+    the generator stream in another order"""
+    systems = star_systems(n, open_cluster, garden_host)
+    stars = systems.stars
+    layouts = star_layouts(stars)
+    n_stars = len(stars['system'])
+    orbit_star = np.repeat(np.arange(n_stars), np.diff(layouts.offsets))
+    snow_line = stars['snow_line'].to(u.au).value[orbit_star]
+
+    gas_giant, first_beyond = place_gas_giants(stars, layouts)
+    content = place_worlds(stars, layouts, gas_giant)
+    occupied = gas_giant | (content > 0)
+    world_orbit = np.flatnonzero(occupied)
+    world_star = orbit_star[world_orbit]
+    radius = layouts.radii[world_orbit]
+    gas_giant, content = gas_giant[world_orbit], content[world_orbit]
+    belt = content == _ORBIT_CONTENTS.outcomes.index(AsteroidBelt)
+    terrestrials = ~gas_giant & ~belt
+    size = np.where(terrestrials, content - 2, -1)
+    blackbody_temperature = (278 * np.power(stars['luminosity'].value[
+        world_star], (1 / 4)) / np.sqrt(radius))
+    age = systems.systems['age'].to(u.Ga).value[stars['system']]
+    ammonia = stars['mass'].to(u.M_sun).value <= .65
+    n_worlds = len(world_orbit)
+
+    codes = np.full(n_worlds, WORLD_TYPES.index(AsteroidBelt))
+    codes[terrestrials] = terrestrial_types(
+        size[terrestrials], blackbody_temperature[terrestrials],
+        ammonia[world_star[terrestrials]], age[world_star[terrestrials]])
+    columns = _physical_properties(np.where(terrestrials, codes, -1),
+                                   blackbody_temperature)
+    eccentricity = np.empty(n_worlds)
+    eccentricity[~gas_giant] = _eccentricities(np.count_nonzero(~gas_giant))
+
+    giants = gas_giant_properties(
+        radius[gas_giant], snow_line[world_orbit][gas_giant],
+        first_beyond[world_orbit][gas_giant],
+        stars['gas_giant_arrangement'][world_star[gas_giant]] == _ECCENTRIC)
+    codes[gas_giant] = giants['size'] + 1
+    eccentricity[gas_giant] = giants['eccentricity']
+    for name in ('density', 'diameter', 'mass'):
+        columns[name][gas_giant] = giants[name].value
+    # asteroid belts temperatures are rolled in their temperature range
+    lower, upper = (t.to(u.K).value for t in AsteroidBelt._temperature_bounds)
+    columns['temperature'][belt] = lower + RandomGenerator().roll3d6(
+        -3, continuous=True, size=np.count_nonzero(belt)) / 15 * (
+            upper - lower)
+
+    # moons of the gas giants and terrestrials
+    parents = np.flatnonzero(~belt)
+    moons = moon_systems(gas_giant[parents], np.maximum(size[parents], 0),
+                         radius[parents], (columns['diameter'][parents] *
+                                           D_earth).to(u.au).value)
+    moon_world = np.repeat(parents, moons.n_moons)
+    moon_star = world_star[moon_world]
+    moon_temperature = blackbody_temperature[moon_world]
+    moon_codes = terrestrial_types(moons.sizes, moon_temperature,
+                                   ammonia[moon_star], age[moon_star],
+                                   gas_giant[moon_world])
+    moon_columns = _physical_properties(moon_codes, moon_temperature)
+
+    counts = {name: np.zeros(n_worlds, dtype=int)
+              for name in ('n_moons', 'n_moonlets', 'n_captured')}
+    for name in counts:
+        counts[name][parents] = getattr(moons, name)
+
+    world_index = np.full(len(layouts.radii), -1)
+    world_index[world_orbit] = np.arange(n_worlds)
+    orbits = {'star': orbit_star,
+              'radius': layouts.radii * u.au,
+              'world': world_index}
+    worlds = _units({'star': world_star,
+                     'orbit': world_orbit,
+                     'type': codes,
+                     'orbital_radius': radius,
+                     'eccentricity': eccentricity,
+                     'blackbody_temperature': blackbody_temperature,
+                     **columns,
+                     'climate': climate(columns['temperature']),
+                     'pressure_category': pressure_category(
+                         columns['pressure']),
+                     **counts})
+    moons = _units({'world': moon_world,
+                    'type': moon_codes,
+                    'orbital_radius': moons.radii,
+                    'eccentricity': _eccentricities(len(moon_world)),
+                    'blackbody_temperature': moon_temperature,
+                    **moon_columns,
+                    'climate': climate(moon_columns['temperature']),
+                    'pressure_category': pressure_category(
+                        moon_columns['pressure'])})
+    offsets = {'stars': systems.offsets,
+               'orbits': layouts.offsets,
+               'worlds': _offsets(world_star, n_stars),
+               'moons': _offsets(moon_world, n_worlds)}
+    return Catalog(systems.systems, stars, orbits, worlds, moons, offsets)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from astropy import units as u
+from astropy.units import cds
+
+from ..world import World
+from ..terrestrial import Pressure
+from ..terrestrial.terrestrial import InplaceTerrestrial
+from ..terrestrial.atmosphere import _PRESSURE_CATEGORIES
+
+# categories in order of their codes in the classifiers outputs, -1 stands
+# for unclassified nan values
+CLIMATES = tuple(sorted(World.Climate, key=lambda x: x.value))
+PRESSURES = tuple(sorted(Pressure, key=lambda x: x.value))
+# activities codes of the habitability scorer inputs
+VOLCANIC_ACTIVITIES = tuple(InplaceTerrestrial.VolcanicActivity)
+TECTONIC_ACTIVITIES = tuple(InplaceTerrestrial.TectonicActivity)
+
+# habitability scores by hydrographic coverage from .1, .6 and .9, by
+# pressure category and by climate of breathable atmospheres
+_HYDROGRAPHIC_THRESHOLDS = np.array([.1, .6, .9])
+_HYDROGRAPHIC_SCORES = np.array([0, 1, 2, 2])
+_PRESSURE_SCORES = np.array([{'VERY_THIN': 1, 'THIN': 2, 'STANDARD': 3,
+                              'DENSE': 3, 'VERY_DENSE': 1,
+                              'SUPER_DENSE': 1}.get(p.name, 0)
+                             for p in PRESSURES])
+_CLIMATE_SCORES = np.array([{'COLD': 1, 'CHILLY': 2, 'COOL': 2, 'NORMAL': 2,
+                             'WARM': 2, 'TROPICAL': 2, 'HOT': 1}.get(c.name, 0)
+                            for c in CLIMATES])
+# habitability modifiers by volcanic and tectonic activity
+_ACTIVITY_SCORES = np.array([0, 0, 0, -1, -2])
+
+
+def climate(temperature):
+    """the climate codes (indexing CLIMATES) of average temperatures in K
+    over the World Climate Table, -1 for nan temperatures"""
+    return World._climates.index(u.Quantity(temperature, u.K))
+
+
+def pressure_category(pressure):
+    """the pressure category codes (indexing PRESSURES) of atmospheric
+    pressures in atm over the Atmospheric Pressure Categories Table, -1 for
+    nan pressures"""
+    return _PRESSURE_CATEGORIES.index(u.Quantity(pressure, cds.atm))
+
+
+def habitability(hydrographic_coverage, atmosphere, breathable, corrosive,
+                 marginal, pressure_category, climate, volcanic_activity=None,
+                 tectonic_activity=None):
+    """the habitability scores of worlds given their hydrographic coverages,
+    whether they have an atmosphere, whether it is breathable, corrosive or
+    marginal, their pressure category and climate codes, and for worlds in
+    orbit their volcanic and tectonic activity codes (indexing
+    VOLCANIC_ACTIVITIES and TECTONIC_ACTIVITIES)"""
+    hydrographic_coverage = np.asarray(hydrographic_coverage, dtype=float)
+    atmosphere, breathable, corrosive, marginal = (
+        np.asarray(a, dtype=bool) for a in (atmosphere, breathable,
+                                            corrosive, marginal))
+    pressure_category, climate = (np.asarray(pressure_category),
+                                  np.asarray(climate))
+
+    score = np.where(np.isnan(hydrographic_coverage), 0, _HYDROGRAPHIC_SCORES[
+        np.searchsorted(_HYDROGRAPHIC_THRESHOLDS, hydrographic_coverage,
+                        side='right')])
+    score = score + np.where(
+        atmosphere & breathable,
+        np.where(pressure_category >= 0,
+                 _PRESSURE_SCORES[pressure_category], 0) +
+        np.where(marginal, 0, 1) +
+        np.where(climate >= 0, _CLIMATE_SCORES[climate], 0), 0)
+    # corrosive unbreathable atmospheres account for -2 and -1
+    score = score + np.where(atmosphere & ~breathable & corrosive, -3, 0)
+    if volcanic_activity is not None and tectonic_activity is not None:
+        score = score + np.maximum(
+            _ACTIVITY_SCORES[np.asarray(volcanic_activity)] +
+            _ACTIVITY_SCORES[np.asarray(tectonic_activity)], -2)
+    return score
+
+
+def affinity(resource, habitability):
+    """the affinity scores of worlds given their resource values and
+    habitability scores"""
+    return np.asarray(resource) + np.asarray(habitability)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+from types import SimpleNamespace
+
+import numpy as np
+from astropy import units as u
+
+from ..random import RandomGenerator
+from ..units import d_earth, D_earth
+from ..gas_giant import SmallGasGiant, MediumGasGiant, LargeGasGiant
+from ..populate_star import _GAS_GIANT_SIZES
+
+# gas giant types in order of their size codes in the kernel outputs
+GAS_GIANT_TYPES = (SmallGasGiant, MediumGasGiant, LargeGasGiant)
+
+
+def gas_giant_properties(orbital_radius, snow_line, first_beyond=False,
+                         eccentric=False):
+    """generates gas giants at arrays of orbital radii and snow lines in AU,
+    given whether they are the first beyond the snow line and whether the
+    parent star arrangement is eccentric, following make_gas_giant
+
+    returns a dict of arrays of the size (codes indexing GAS_GIANT_TYPES),
+    mass, density, diameter and eccentricity"""
+    radius, snow_line, first_beyond, eccentric = (np.ravel(a) for a in (
+        np.broadcast_arrays(np.asarray(orbital_radius, dtype=float),
+                            np.asarray(snow_line, dtype=float),
+                            np.asarray(first_beyond, dtype=bool),
+                            np.asarray(eccentric, dtype=bool))))
+    n = len(radius)
+    inside = radius <= snow_line
+
+    # sum of a 3d roll over Gas Giant Size Table, +4 inside the snow line or
+    # for the first gas giant beyond it
+    size_roll = RandomGenerator().roll3d6(size=n) + np.where(
+        inside | first_beyond, 4, 0)
+    size = _GAS_GIANT_SIZES.index(size_roll)
+
+    mass, density = np.empty(n), np.empty(n)
+    for code, gas_giant_type in enumerate(GAS_GIANT_TYPES):
+        mask = size == code
+        bounds = gas_giant_type._mass_bounds
+        mass[mask] = RandomGenerator().truncexpon_draw(
+            bounds.lower.value, bounds.upper.value,
+            gas_giant_type._mass_scale, size=np.count_nonzero(mask))
+        # density fits evaluated through the gas giant type property
+        density[mask] = gas_giant_type.density.fget(
+            SimpleNamespace(mass=mass[mask] * u.M_earth)).to(d_earth).value
+    diameter = np.power(mass / density, (1 / 3))
+
+    eccentricity = np.empty(n)
+    mask = eccentric & inside
+    eccentricity[mask] = RandomGenerator().truncnorm_draw(
+        .1, .8, .45435, .23165400385057022, size=np.count_nonzero(mask))
+    eccentricity[~mask] = RandomGenerator().truncnorm_draw(
+        .0, .2, .04625, .042877004326328585, size=np.count_nonzero(~mask))
+
+    return {'size': size,
+            'mass': mass * u.M_earth,
+            'density': density * d_earth,
+            'diameter': diameter * D_earth,
+            'eccentricity': eccentricity}
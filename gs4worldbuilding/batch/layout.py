@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+import numpy as np
+
+from ..random import RandomGenerator
+from ..star import Star
+
+# gas giant arrangements in order of their codes in the kernel inputs
+GAS_GIANT_ARRANGEMENTS = tuple(Star.GasGiantArrangement)
+
+# ragged orbital radii in AU of a batch of stars: the radii of star i are
+# radii[offsets[i]:offsets[i + 1]] in ascending order
+Layouts = namedtuple('Layouts', ['radii', 'offsets', 'first_gas_giant'])
+
+# orbital spacing ratios drawn per star and per block
+_BLOCK = 8
+
+
+def _spacing_ratios(n):
+    """blocks of ratios drawn over the Orbital Spacing Table"""
+    return RandomGenerator().truncnorm_draw(1.4, 2, 1.6976,
+                                            0.1120457049600742,
+                                            size=(n, _BLOCK))
+
+
+def layout_limits(inner_limit, outer_limit, forbidden_lower=np.nan,
+                  forbidden_upper=np.nan):
+    """the inner and outermost orbital limits given the forbidden zones,
+    stars without companions have nan forbidden zone limits"""
+    inner, outer, forbidden_lower, forbidden_upper = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (inner_limit, outer_limit,
+                                               forbidden_lower,
+                                               forbidden_upper)))
+    # nan forbidden zones compare False and leave the limits untouched
+    below = (forbidden_upper > outer) & (forbidden_lower > inner)
+    above = ~below & (forbidden_lower < inner) & (forbidden_upper < outer)
+    return (np.where(above, np.maximum(inner, forbidden_upper), inner),
+            np.where(below, np.minimum(outer, forbidden_lower), outer))
+
+
+def first_radii(arrangement, snow_line, outer_limit, limits_upper):
+    """the first orbital radius of each star, the first gas giant radius
+    given the arrangement codes if any"""
+    n = len(arrangement)
+    radii = np.empty(n)
+    for code, draw in enumerate([
+            # divided outermost legal distance by roll of 1d * .05 + 1
+            lambda m: limits_upper[m] / (RandomGenerator().roll1d6(
+                continuous=True, size=m.sum()) * .05 + 1),
+            # roll of 2d-2 * .05 + 1 multiplied by the snow line radius
+            lambda m: (RandomGenerator().roll2d6(
+                -2, continuous=True, size=m.sum()) * .05 + 1) * snow_line[m],
+            # roll of 1d-1 * .125 multiplied by the snow line radius
+            lambda m: RandomGenerator().roll1d6(
+                -1, continuous=True, size=m.sum()) * .125 * snow_line[m],
+            # roll of 3d * .1 multiplied by the outer limit radius
+            lambda m: RandomGenerator().roll3d6(
+                continuous=True, size=m.sum()) / 10 * outer_limit[m]]):
+        mask = arrangement == code
+        radii[mask] = draw(mask)
+    return radii
+
+
+def inward_radii(first, lower, upper):
+    """the orbits worked inward from the first radii as a nan padded
+    matrix, stepped over every star at once as the .15 AU minimum spacing
+    makes the sequence non multiplicative"""
+    columns, previous = [], first
+    active = np.ones(len(first), dtype=bool)
+    while active.any():
+        ratios = _spacing_ratios(len(first))
+        for k in range(_BLOCK):
+            radius = np.minimum(previous / ratios[:, k], previous - .15)
+            active &= (radius >= lower) & (radius <= upper)
+            previous = np.where(active, radius, np.nan)
+            columns.append(previous)
+            if not active.any():
+                break
+    return np.column_stack(columns)
+
+
+def outward_radii(last, lower, upper):
+    """the orbits worked outward from the outermost radii as a nan padded
+    matrix through cumulative products of the spacing ratios"""
+    blocks, previous = [], last
+    active = np.ones(len(last), dtype=bool)
+    while active.any():
+        radii = previous[:, None] * np.cumprod(_spacing_ratios(len(last)),
+                                               axis=1)
+        valid = np.logical_and.accumulate(
+            active[:, None] & (radii >= lower[:, None]) &
+            (radii <= upper[:, None]), axis=1)
+        blocks.append(np.where(valid, radii, np.nan))
+        active, previous = valid[:, -1], radii[:, -1]
+    return np.hstack(blocks)
+
+
+def orbital_layouts(arrangement, snow_line, inner_limit, outer_limit,
+                    forbidden_lower=np.nan, forbidden_upper=np.nan):
+    """generates the orbital radii of a batch of stars from their gas giant
+    arrangement codes (indexing GAS_GIANT_ARRANGEMENTS), snow lines, orbital
+    limits and forbidden zones in AU, following the make_radii procedure
+
+    returns Layouts of the ragged radii, their offsets and the index of the
+    first gas giant orbit of each star, -1 if none"""
+    arrangement = np.ravel(arrangement)
+    snow_line, inner_limit, outer_limit, forbidden_lower, forbidden_upper = (
+        np.broadcast_to(np.asarray(a, dtype=float), arrangement.shape)
+        for a in (snow_line, inner_limit, outer_limit, forbidden_lower,
+                  forbidden_upper))
+    lower, upper = layout_limits(inner_limit, outer_limit, forbidden_lower,
+                                 forbidden_upper)
+    n = len(arrangement)
+    if n == 0:
+        return Layouts(np.empty(0), np.zeros(1, dtype=int),
+                       np.empty(0, dtype=int))
+
+    first = first_radii(arrangement, snow_line, outer_limit, upper)
+    inward = inward_radii(first, lower, upper)
+    n_inward = np.count_nonzero(~np.isnan(inward), axis=1)
+    # the first radius may lie out of the limits, the outermost radius is
+    # the first one in any case as inward orbits are all below it
+    outward = outward_radii(first, lower, upper)
+
+    radii = np.hstack([inward[:, ::-1], first[:, None], outward])
+    placed = ~np.isnan(radii)
+    offsets = np.zeros(n + 1, dtype=int)
+    np.cumsum(np.count_nonzero(placed, axis=1), out=offsets[1:])
+    return Layouts(radii[placed], offsets,
+                   np.where(arrangement == 0, -1, n_inward))
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+import numpy as np
+from astropy import units as u
+
+from ..random import RandomGenerator
+from ..orbit import Orbit
+from ..terrestrial import Terrestrial
+from ..gas_giant import GasGiant
+from ..populate_star import (terrestrial_type, _MOONLET_MODIFIERS,
+                             _MOON_MODIFIERS, _CAPTURED_MODIFIERS)
+from ..tables import Table
+
+# terrestrial sizes in order of their codes in the kernel inputs and outputs
+SIZES = tuple(sorted(Terrestrial.Size))
+
+# moon systems of a batch of parent worlds: the moons of parent i are
+# sizes[offsets[i]:offsets[i + 1]] and radii[offsets[i]:offsets[i + 1]]
+# sorted by orbital radius in AU
+Moons = namedtuple('Moons', ['n_moons', 'n_moonlets', 'n_captured', 'sizes',
+                             'radii', 'offsets'])
+
+# orbital radius thresholds in AU of the terrestrials moons and moonlets
+# roll modifiers, and modifiers by terrestrial size
+_TERRESTRIAL_MOONS = Table({.75: -3, 1.5: -1}, default=0, inclusive=True)
+_TERRESTRIAL_SIZE_MODIFIERS = np.array([-2, -1, 0, 1])
+
+
+def _roll(roll, modifier):
+    """non negative rolls with modifiers drawn for each modifier"""
+    if len(modifier) == 0:
+        return np.zeros(0, dtype=int)
+    return np.maximum(roll(size=len(modifier)) + modifier, 0)
+
+
+def moon_counts(gas_giant, size, orbital_radius):
+    """the numbers of major moons, moonlets and captured moonlets of parent
+    worlds given whether they are gas giants, their size codes (indexing
+    SIZES, ignored for gas giants) and orbital radii in AU"""
+    gas_giant = np.asarray(gas_giant, dtype=bool)
+    size = np.broadcast_to(size, gas_giant.shape)
+    radius = np.broadcast_to(np.asarray(orbital_radius, dtype=float),
+                             gas_giant.shape)
+    n_moons, n_moonlets, n_captured = (np.zeros(gas_giant.shape, dtype=int)
+                                       for _ in range(3))
+
+    n_moonlets[gas_giant] = _roll(RandomGenerator().roll2d6,
+                                  _MOONLET_MODIFIERS.lookup(radius[gas_giant]))
+    mask = gas_giant & (radius > .1)
+    n_moons[mask] = _roll(RandomGenerator().roll1d6,
+                          _MOON_MODIFIERS.lookup(radius[mask]))
+    mask = gas_giant & (radius > .5)
+    n_captured[mask] = _roll(RandomGenerator().roll1d6,
+                             _CAPTURED_MODIFIERS.lookup(radius[mask]))
+
+    mask = ~gas_giant & (radius > .5)
+    modifier = (_TERRESTRIAL_MOONS.lookup(radius[mask]) +
+                _TERRESTRIAL_SIZE_MODIFIERS[size[mask]])
+    n_moons[mask] = _roll(RandomGenerator().roll1d6, -4 + modifier)
+    # moonlets are rolled only for terrestrials without major moons
+    moonlets = _roll(RandomGenerator().roll1d6, -2 + modifier)
+    n_moonlets[mask] = np.where(n_moons[mask] == 0, moonlets, 0)
+    return n_moons, n_moonlets, n_captured
+
+
+def moon_orbits(gas_giant, size, diameter, n_moons):
+    """the size codes and orbital radii in AU of the major moons of parent
+    worlds given whether they are gas giants, their size codes, diameters in
+    AU and numbers of major moons, in order of their parents"""
+    parent = np.repeat(np.arange(len(n_moons)), n_moons)
+    gas_giant = np.broadcast_to(np.asarray(gas_giant, dtype=bool),
+                                np.shape(n_moons))[parent]
+    # gas giants moons are sized as large terrestrials moons
+    parent_size = np.where(gas_giant, SIZES.index(Terrestrial.Size.LARGE),
+                           np.broadcast_to(size, np.shape(n_moons))[parent])
+    diameter = np.broadcast_to(np.asarray(diameter, dtype=float),
+                               np.shape(n_moons))[parent]
+    n = len(parent)
+
+    size_roll = RandomGenerator().roll3d6(size=n)
+    scale = np.select([size_roll < 12, size_roll < 15], [-3, -2], -1)
+    sizes = np.maximum(parent_size + scale, 0)
+
+    radii = np.empty(n)
+    # orbital radius for major moons of terrestrial planets
+    terrestrial = ~gas_giant
+    diff = (parent_size - sizes)[terrestrial]
+    modifier = np.select([diff == 2, diff == 1], [2, 4], 0)
+    radii[terrestrial] = (RandomGenerator().roll2d6(
+        continuous=True, size=len(modifier)) + modifier) * 2.5 * \
+        diameter[terrestrial]
+    # and of gas giants
+    radius_roll = RandomGenerator().roll3d6(3, continuous=True,
+                                            size=np.count_nonzero(gas_giant))
+    far = radius_roll >= 15
+    radius_roll[far] += RandomGenerator().roll2d6(size=np.count_nonzero(far))
+    radii[gas_giant] = radius_roll / 2 * diameter[gas_giant]
+
+    order = np.lexsort((radii, parent))
+    return sizes[order], radii[order]
+
+
+def moon_systems(gas_giant, size, orbital_radius, diameter):
+    """generates the moon systems of a batch of parent worlds given whether
+    they are gas giants, their size codes (indexing SIZES, ignored for gas
+    giants), orbital radii and diameters in AU, following the make_moons
+    procedure
+
+    returns Moons of the numbers of major moons, moonlets and captured
+    moonlets of each parent, and of the ragged sizes and orbital radii of
+    the major moons"""
+    gas_giant, size, orbital_radius, diameter = (np.ravel(a) for a in (
+        np.broadcast_arrays(np.asarray(gas_giant, dtype=bool), size,
+                            np.asarray(orbital_radius, dtype=float),
+                            np.asarray(diameter, dtype=float))))
+    n_moons, n_moonlets, n_captured = moon_counts(gas_giant, size,
+                                                  orbital_radius)
+    sizes, radii = moon_orbits(gas_giant, size, diameter, n_moons)
+    offsets = np.zeros(len(n_moons) + 1, dtype=int)
+    np.cumsum(n_moons, out=offsets[1:])
+    return Moons(n_moons, n_moonlets, n_captured, sizes, radii, offsets)
+
+
+def materialize_moons(parent, moons, i):
+    """builds the major moons objects of the parent world from the moon
+    systems batch entry i, as make_moons does"""
+    parent._n_moonlets = int(moons.n_moonlets[i])
+    if issubclass(type(parent), GasGiant):
+        parent._n_captured = int(moons.n_captured[i])
+    materialized = []
+    for j, (size, radius) in enumerate(zip(
+            moons.sizes[moons.offsets[i]:moons.offsets[i + 1]],
+            moons.radii[moons.offsets[i]:moons.offsets[i + 1]])):
+        moon_type = terrestrial_type(parent, SIZES[size], radius,
+                                     innermost=(j == 0))
+        materialized.append(moon_type(orbit=Orbit(parent, radius * u.au)))
+    return materialized
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+from multiprocessing import shared_memory, resource_tracker
+import weakref
+
+import numpy as np
+from astropy import units as u
+from astropy.units import cds
+
+from ..units import d_earth, D_earth, G_earth
+from ..world import World
+from ..terrestrial import Terrestrial
+from ..companion_star import CompanionStar
+from .stellar import LUMINOSITY_CLASSES
+from .layout import GAS_GIANT_ARRANGEMENTS
+from .star_system import POPULATIONS
+from .classify import CLIMATES
+from .catalog import WORLD_TYPES
+
+# fixed record schemas of flattened star systems, quantities are stored in
+# M☉, L☉, K, AU, d🜨, D🜨, M🜨, g and atm, codes index the batch categories
+# and -1 or nan stand for what does not apply to a record
+SYSTEM_RECORD = np.dtype([('seed', 'i8'),
+                          ('population', 'i1'),
+                          ('age', 'f8'),
+                          ('multiplicity', 'i1')], align=True)
+# stars reference their system row and their parent star row, -1 for
+# primaries which have no orbital radius nor eccentricity
+STAR_RECORD = np.dtype([('system', 'i4'),
+                        ('parent', 'i4'),
+                        ('mass', 'f8'),
+                        ('luminosity_class', 'i1'),
+                        ('luminosity', 'f8'),
+                        ('temperature', 'f8'),
+                        ('radius', 'f8'),
+                        ('inner_limit', 'f8'),
+                        ('outer_limit', 'f8'),
+                        ('snow_line', 'f8'),
+                        ('gas_giant_arrangement', 'i1'),
+                        ('orbital_radius', 'f8'),
+                        ('eccentricity', 'f8')], align=True)
+# worlds reference their star row and, for moons, their planet row, -1 for
+# the worlds orbiting their star
+WORLD_RECORD = np.dtype([('star', 'i4'),
+                         ('parent', 'i4'),
+                         ('type', 'i1'),
+                         ('orbital_radius', 'f8'),
+                         ('eccentricity', 'f8'),
+                         ('blackbody_temperature', 'f8'),
+                         ('temperature', 'f8'),
+                         ('density', 'f8'),
+                         ('diameter', 'f8'),
+                         ('mass', 'f8'),
+                         ('gravity', 'f8'),
+                         ('hydrographic_coverage', 'f8'),
+                         ('pressure', 'f8'),
+                         ('climate', 'i1'),
+                         ('habitability', 'f8'),
+                         ('resource', 'f8')], align=True)
+
+# records of a batch of star systems, the rows of each table are sorted by
+# parent as in a Catalog
+Records = namedtuple('Records', ['systems', 'stars', 'worlds'])
+
+_WORLD_UNITS = {'orbital_radius': u.au, 'blackbody_temperature': u.K,
+                'temperature': u.K, 'density': d_earth, 'diameter': D_earth,
+                'mass': u.M_earth, 'gravity': G_earth}
+
+
+def _code(categories, value):
+    """the code of a category value, -1 for None"""
+    return categories.index(value) if value is not None else -1
+
+
+def _world_type(world):
+    """the code of the world type of a world class"""
+    for world_type in type(world).__mro__:
+        if world_type in WORLD_TYPES:
+            return WORLD_TYPES.index(world_type)
+    return -1
+
+
+def _world_record(world, star, parent):
+    """the record of a world or moon orbiting its star or parent planet"""
+    record = {'star': star, 'parent': parent, 'type': _world_type(world),
+              'eccentricity': world.orbit.eccentricity}
+    for name, unit in _WORLD_UNITS.items():
+        value = (world.orbit.radius if name == 'orbital_radius'
+                 else getattr(world, name, None))
+        record[name] = value.to_value(unit) if value is not None else np.nan
+    if isinstance(world, Terrestrial):
+        record['hydrographic_coverage'] = world.hydrographic_coverage
+        if world.atmosphere is not None:
+            record['pressure'] = world.atmosphere.pressure.to_value(cds.atm)
+    if isinstance(world, World):
+        record['climate'] = _code(CLIMATES, world.climate)
+        record['habitability'] = world.habitability
+        record['resource'] = int(world.resource)
+    return record
+
+
+def _table(rows, dtype):
+    """the structured array of dict rows, the missing fields being nan or
+    -1"""
+    table = np.zeros(len(rows), dtype=dtype)
+    for name in dtype.names:
+        missing = np.nan if dtype[name].kind == 'f' else -1
+        table[name] = [row.get(name, missing) for row in rows]
+    return table
+
+
+def records(systems, seeds):
+    """the Records of star systems generated from seeds"""
+    system_rows, star_rows, world_rows = [], [], []
+    for index, (system, seed) in enumerate(zip(systems, seeds)):
+        system_rows.append({'seed': seed,
+                            'population': _code(POPULATIONS,
+                                                system.population),
+                            'age': system.age.to_value(u.Ga),
+                            'multiplicity': system.multiplicity.value})
+        first = len(star_rows)
+        for star in system._stars:
+            row = {'system': index,
+                   'mass': star.mass.to_value(u.M_sun),
+                   'luminosity_class': _code(LUMINOSITY_CLASSES,
+                                             star.luminosity_class),
+                   'luminosity': star.luminosity.to_value(u.L_sun),
+                   'temperature': star.temperature.to_value(u.K),
+                   'radius': star.radius.to_value(u.au),
+                   'inner_limit': star.limits.lower.to_value(u.au),
+                   'outer_limit': star.limits.upper.to_value(u.au),
+                   'snow_line': star.snow_line.to_value(u.au),
+                   'gas_giant_arrangement': _code(
+                       GAS_GIANT_ARRANGEMENTS, star.gas_giant_arrangement)}
+            if isinstance(star, CompanionStar):
+                row.update({'parent': first + system._stars.index(
+                                star.orbit._parent_body),
+                            'orbital_radius': star.orbit.radius.to_value(
+                                u.au),
+                            'eccentricity': star.orbit.eccentricity})
+            star_rows.append(row)
+        for row, star in enumerate(system._stars, first):
+            for world in star._worlds:
+                world_rows.append(_world_record(world, row, -1))
+                parent = len(world_rows) - 1
+                world_rows.extend(_world_record(moon, row, parent)
+                                  for moon in getattr(world, '_moons', []))
+    return Records(_table(system_rows, SYSTEM_RECORD),
+                   _table(star_rows, STAR_RECORD),
+                   _table(world_rows, WORLD_RECORD))
+
+
+def _layout(lengths):
+    """the byte offsets of the records tables in a block and its size"""
+    offsets, size = [], 0
+    for dtype, length in zip((SYSTEM_RECORD, STAR_RECORD, WORLD_RECORD),
+                             lengths):
+        size += -size % dtype.alignment
+        offsets.append(size)
+        size += dtype.itemsize * length
+    return offsets, size
+
+
+def share(records):
+    """copies records into a new shared memory block, returns the picklable
+    (name, lengths) handle of the block to attach a SharedRecords to
+
+    the block is left to the process attaching it, which unlinks it"""
+    lengths = tuple(len(table) for table in records)
+    offsets, size = _layout(lengths)
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        for table, offset in zip(records, offsets):
+            np.ndarray(table.shape, table.dtype, block.buf,
+                       offset)[:] = table
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    # the block outlives this process, handed over to the attaching one
+    resource_tracker.unregister(block._name, 'shared_memory')
+    block.close()
+    return block.name, lengths
+
+
+def unlink(handle):
+    """unlinks the shared memory block of a handle no SharedRecords is
+    attached to, as the handles of the chunks completed before another one
+    failed"""
+    try:
+        block = shared_memory.SharedMemory(handle[0])
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def _unlink(blocks):
+    """unlinks and closes attached shared memory blocks"""
+    for block in blocks:
+        block.unlink()
+        try:
+            block.close()
+        except BufferError:
+            # views still held keep the mapping until released
+            pass
+    blocks.clear()
+
+
+class SharedRecords():
+    """the Records of shared memory blocks, read through zero-copy views of
+    the blocks, in the order of the handles they are attached from
+
+    the blocks are unlinked on close, on exit of a with statement or once
+    the records are garbage collected, after which the views are no longer
+    valid"""
+
+    def __init__(self, handles):
+        handles = list(handles)
+        self._blocks = []
+        self.chunks = []
+        self._finalizer = weakref.finalize(self, _unlink, self._blocks)
+        try:
+            for name, lengths in handles:
+                block = shared_memory.SharedMemory(name)
+                self._blocks.append(block)
+                offsets, _ = _layout(lengths)
+                self.chunks.append(Records(*(
+                    np.ndarray(length, dtype, block.buf, offset)
+                    for dtype, length, offset in zip(
+                        (SYSTEM_RECORD, STAR_RECORD, WORLD_RECORD), lengths,
+                        offsets))))
+        except BaseException:
+            # the blocks not attached yet are unlinked as well
+            for handle in handles[len(self._blocks):]:
+                unlink(handle)
+            self.close()
+            raise
+
+    def __len__(self):
+        """the number of systems of the records"""
+        return sum(len(chunk.systems) for chunk in self.chunks)
+
+    def concatenate(self) -> Records:
+        """the Records of every chunk copied into single tables, with their
+        rows references offset accordingly"""
+        systems, stars, worlds = [], [], []
+        n_systems = n_stars = n_worlds = 0
+        for chunk in self.chunks:
+            systems.append(chunk.systems)
+            stars.append(chunk.stars.copy())
+            stars[-1]['system'] += n_systems
+            stars[-1]['parent'][chunk.stars['parent'] >= 0] += n_stars
+            worlds.append(chunk.worlds.copy())
+            worlds[-1]['star'] += n_stars
+            worlds[-1]['parent'][chunk.worlds['parent'] >= 0] += n_worlds
+            n_systems += len(chunk.systems)
+            n_stars += len(chunk.stars)
+            n_worlds += len(chunk.worlds)
+        return Records(*(np.concatenate(tables) if tables else
+                         np.empty(0, dtype) for tables, dtype in
+                         ((systems, SYSTEM_RECORD), (stars, STAR_RECORD),
+                          (worlds, WORLD_RECORD))))
+
+    def close(self):
+        """releases the views and unlinks the shared memory blocks"""
+        self.chunks = []
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
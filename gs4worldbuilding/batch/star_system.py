@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+import numpy as np
+from astropy import units as u
+
+from ..random import RandomGenerator
+from ..star_system import StarSystem
+from ..star import Star
+from ..companion_star import CompanionStar
+from .stellar import stellar_properties
+from .layout import orbital_layouts
+
+# populations and separations in order of their codes in the engine outputs
+POPULATIONS = tuple(StarSystem.Population)
+SEPARATIONS = tuple(CompanionStar.Separation)
+
+# star systems of a batch: the stars of system i are the rows
+# offsets[i]:offsets[i + 1] of the stars table, ordered as StarSystem._stars
+StarSystems = namedtuple('StarSystems', ['systems', 'stars', 'offsets'])
+
+# star slots of a system: primary, secondary, tertiary then the
+# sub-companions of the secondary and tertiary stars
+_PARENT_SLOTS = np.array([-1, 0, 0, 1, 2])
+
+# orbital eccentricity draws per separation code, the distributions of the
+# wide and distant separations are shared
+_ECCENTRICITIES = [
+    lambda n: RandomGenerator().truncexpon_draw(0, .6, .1819450191678794,
+                                                size=n),
+    lambda n: RandomGenerator().truncnorm_draw(0, .7, .3055,
+                                               .1839014681833726, size=n),
+    lambda n: RandomGenerator().truncnorm_draw(0, .8, .4151,
+                                               .16553546447815948, size=n),
+    lambda n: RandomGenerator().truncnorm_draw(0, .95, .5204,
+                                               .142456449485448, size=n)]
+
+
+def _separation_dists(garden_host):
+    """the Orbital Separation Table distributions of the secondary,
+    tertiary and sub-companion stars"""
+    if garden_host:
+        return ([0, .0463, .11574, .33796, .5],
+                [0, 0, 0, .01851851851853, .98148148148193],
+                [.740740741, .212962963, .041666667, .00462963, 0])
+    return ([.0926, .2824, .25, .2824, .0926],
+            [0, .00462963, .041666667, .212962963, .740740741],
+            [.740740741, .212962963, .041666667, .00462963, 0])
+
+
+def _choice(n, p):
+    """n codes drawn over a categorical distribution"""
+    return RandomGenerator().rng.choice(len(p), size=n, p=p)
+
+
+def _companion_seed_masses(parent_mass):
+    """companion star seed masses counted down the stellar mass table from
+    their parent star masses in M☉"""
+    n = len(parent_mass)
+    # roll 1d6 - 1 then sum of as many d6 rolls
+    roll = RandomGenerator().roll1d6(-1, size=n)
+    dice = RandomGenerator().roll1d6(size=(n, 5))
+    rolls = np.where(np.arange(5) < roll[:, None], dice, 0).sum(axis=1)
+    mass = parent_mass - .05 * rolls
+    # add noise to value
+    noise = np.where(mass <= 1.5, .025, .05)
+    mass = mass + RandomGenerator().rng.uniform(-noise, noise)
+    # mass in [.1, parent_body.mass] range
+    return np.minimum(np.maximum(.1, mass), parent_mass)
+
+
+def _companion_orbits(separation):
+    """eccentricities and average orbital radii in AU of companion stars
+    given their separation codes"""
+    eccentricity = np.empty(len(separation))
+    for code, draw in enumerate(_ECCENTRICITIES):
+        mask = (separation == code if code < 3 else separation >= code)
+        eccentricity[mask] = draw(np.count_nonzero(mask))
+    scale = np.array([s.value for s in SEPARATIONS])[separation]
+    # roll of 2d6 multiplied by the separation category radius
+    radius = RandomGenerator().roll2d6(continuous=True,
+                                       size=len(separation)) * scale
+    return eccentricity, radius
+
+
+def star_systems(n, open_cluster=False, garden_host=False):
+    """generates n star systems with their stars, following the StarSystem
+    and CompanionStar randomization
+
+    returns StarSystems of the systems table (population codes indexing
+    POPULATIONS, age and number of stars), the stars table (system and
+    parent star indexes, seed mass, gas giant arrangement code, separation
+    code indexing SEPARATIONS, orbital eccentricity and radius, forbidden
+    zone, and the stellar properties) and the offsets of each system's
+    stars, companion values are nan or -1 for primary stars"""
+    population_dist = ([0, .166666667, 0.555555556, .277777778, 0, 0]
+                       if garden_host else
+                       [.00462963, .087962963, .407407407, .407407407,
+                        .087962963, .00462963])
+    stars_dist = ([.162037037, .578703704, .259259259] if open_cluster
+                  else [.5, .453703703, .046296297])
+
+    population = _choice(n, population_dist)
+    base, step_a, step_b = (np.array([getattr(p, step).value
+                                      for p in POPULATIONS])[population]
+                            for step in ('base', 'step_a', 'step_b'))
+    age = (base + RandomGenerator().roll1d6(-1, continuous=True, size=n) *
+           step_a + RandomGenerator().roll1d6(-1, continuous=True, size=n) *
+           step_b)
+    multiplicity = _choice(n, stars_dist) + 1
+
+    # stars by slot, slots of absent stars are masked
+    present = np.zeros((n, 5), dtype=bool)
+    present[:, 0] = True
+    present[:, 1], present[:, 2] = multiplicity > 1, multiplicity > 2
+    seed_mass, mass, separation, eccentricity, radius = (
+        np.full((n, 5), np.nan), np.full((n, 5), np.nan),
+        np.full((n, 5), -1), np.full((n, 5), np.nan), np.full((n, 5), np.nan))
+    arrangement = np.zeros((n, 5), dtype=int)
+
+    seed_mass[:, 0] = RandomGenerator().truncexpon_draw(
+        *((.6, 1.5, .26953477975949597) if garden_host
+          else (.1, 2, .3905806446817353)), size=n)
+    dists = _separation_dists(garden_host)
+    for slot in range(5):
+        if slot > 0:
+            if slot > 2:
+                # sub-companion star rolls of distant companions
+                parent = present[:, slot - 2] & (
+                    separation[:, slot - 2] == len(SEPARATIONS) - 1)
+                present[parent, slot] = RandomGenerator().roll3d6(
+                    size=np.count_nonzero(parent)) >= 11
+            rows = present[:, slot]
+            seed_mass[rows, slot] = _companion_seed_masses(
+                mass[rows, _PARENT_SLOTS[slot]])
+        rows = present[:, slot]
+        mass[rows, slot] = stellar_properties(seed_mass[rows, slot],
+                                              age[rows])['mass'].value
+        # sum of a 3d roll over Gas Giant Arrangement Table
+        arrangement[rows, slot] = Star._gas_giant_arrangements.index(
+            RandomGenerator().roll3d6(size=np.count_nonzero(rows)))
+        if slot > 0:
+            separation[rows, slot] = _choice(np.count_nonzero(rows),
+                                             dists[min(slot, 3) - 1])
+            eccentricity[rows, slot], radius[rows, slot] = \
+                _companion_orbits(separation[rows, slot])
+
+    # the primary forbidden zone is around its secondary star closest
+    # approach, companions forbidden zones are around their own orbit
+    min_separation = (1 - eccentricity) * radius
+    forbidden_lower = min_separation / 3
+    forbidden_upper = (1 + eccentricity) * radius * 3
+    forbidden_lower[:, 0] = min_separation[:, 1] / 3
+    forbidden_upper[:, 0] = min_separation[:, 1] * 3
+
+    # flattened in StarSystem._stars order
+    n_stars = np.count_nonzero(present, axis=1)
+    offsets = np.zeros(n + 1, dtype=int)
+    np.cumsum(n_stars, out=offsets[1:])
+    system = np.repeat(np.arange(n), n_stars)
+    # global index of each slot star once flattened
+    index = np.cumsum(present.ravel()).reshape(n, 5) - 1
+    parent = np.where(_PARENT_SLOTS >= 0,
+                      index[:, np.maximum(_PARENT_SLOTS, 0)], -1)[present]
+
+    stars = {'system': system,
+             'parent': parent,
+             'seed_mass': seed_mass[present] * u.M_sun,
+             'gas_giant_arrangement': arrangement[present],
+             'separation': separation[present],
+             'eccentricity': eccentricity[present],
+             'orbital_radius': radius[present] * u.au,
+             'forbidden_lower': forbidden_lower[present] * u.au,
+             'forbidden_upper': forbidden_upper[present] * u.au,
+             **stellar_properties(seed_mass[present], age[system])}
+    systems = {'population': population,
+               'age': age * u.Ga,
+               'n_stars': n_stars}
+    return StarSystems(systems, stars, offsets)
+
+
+def star_layouts(stars):
+    """generates the orbital layouts of a stars table"""
+    return orbital_layouts(stars['gas_giant_arrangement'],
+                           stars['snow_line'].to(u.au).value,
+                           stars['inner_limit'].to(u.au).value,
+                           stars['outer_limit'].to(u.au).value,
+                           stars['forbidden_lower'].to(u.au).value,
+                           stars['forbidden_upper'].to(u.au).value)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from astropy import units as u
+
+from ..star import (Star, _l_max, _l_min, _m_span, _s_span, _g_span,
+                    _temp_V, _temp_III, _radius)
+
+# luminosity classes in order of their codes in the kernel outputs
+LUMINOSITY_CLASSES = (Star.Luminosity.V, Star.Luminosity.IV,
+                      Star.Luminosity.III, Star.Luminosity.D)
+
+# upper masses in M☉ and spectral types of the Stellar Evolution Table
+_SPECTRAL_MASSES = np.array([.1, .15, .2, .25, .3, .35, .4, .45, .5, .55, .6,
+                             .65, .7, .75, .8, .85, .9, .95, 1, 1.05, 1.10,
+                             1.15, 1.2, 1.25, 1.3, 1.35, 1.4, 1.45, 1.5, 1.6,
+                             1.7, 1.8, 1.9, 2])
+_SPECTRAL_TYPES = np.array(['M7', 'M6', 'M5', 'M4', 'M4', 'M3', 'M2', 'M1',
+                            'M0', 'K8', 'K6', 'K5', 'K4', 'K2', 'K0', 'G8',
+                            'G6', 'G4', 'G2', 'G1', 'G0', 'F9', 'F8', 'F7',
+                            'F6', 'F5', 'F4', 'F3', 'F2', 'F0', 'A9', 'A7',
+                            'A6', 'A5', 'D'])
+
+
+def stellar_properties(seed_mass, age):
+    """evaluates the Star properties over arrays of seed masses in M☉ and
+system ages in Ga, broadcast against each other
+
+returns a dict of arrays of the mass, luminosity_class (codes indexing
+LUMINOSITY_CLASSES), luminosity, temperature, radius, inner_limit,
+outer_limit, snow_line and spectral_type, equal to the scalar Star
+properties"""
+    seed_mass = np.asarray(u.Quantity(seed_mass, u.M_sun).value, dtype=float)
+    age = np.asarray(u.Quantity(age, u.Ga).value, dtype=float)
+    seed_mass, age = np.broadcast_arrays(seed_mass, age)
+
+    # nan spans compare False as the scalar nan checks
+    m_span = _m_span(seed_mass)
+    s_span = _s_span(seed_mass) + m_span
+    g_span = _g_span(seed_mass) + s_span
+    code = np.select([age > g_span, age > s_span, age > m_span], [3, 2, 1], 0)
+    dwarf, giant, subgiant = code == 3, code == 2, code == 1
+
+    mass = np.where(dwarf, .15 + ((seed_mass - .1) / 1.9) * 1.05, seed_mass)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        l_max, l_min, m_span = _l_max(mass), _l_min(mass), _m_span(mass)
+        luminosity = np.select(
+            [dwarf, giant, subgiant, np.isnan(l_max)],
+            [.001, l_max * 25, l_max, l_min],
+            l_min + (age / m_span) * (l_max - l_min))
+
+        temp = np.where(giant, _temp_III(mass), _temp_V(mass))
+        temperature = np.where(subgiant,
+                               temp - ((age - m_span) / _s_span(mass)) *
+                               (temp - 4800), temp)
+
+        radius = _radius(luminosity, temperature)
+        # fmax ignores nan luminosities as the scalar max does
+        inner_limit = np.fmax(0.1 * mass, 0.01 * np.sqrt(luminosity))
+
+    spectral = np.searchsorted(_SPECTRAL_MASSES, mass)
+    if np.any(spectral[~dwarf] >= len(_SPECTRAL_MASSES)):
+        raise ValueError('no spectral type for masses above ' +
+                         f'{_SPECTRAL_MASSES[-1]} M☉')
+
+    return {'mass': mass * u.M_sun,
+            'luminosity_class': code,
+            'luminosity': luminosity * u.L_sun,
+            'temperature': temperature * u.K,
+            'radius': radius * u.au,
+            'inner_limit': inner_limit * u.au,
+            'outer_limit': 40 * mass * u.au,
+            'snow_line': 4.85 * np.sqrt(_l_min(seed_mass)) * u.au,
+            'spectral_type': _SPECTRAL_TYPES[np.where(dwarf, -1, spectral)]}
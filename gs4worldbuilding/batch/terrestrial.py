@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+from types import SimpleNamespace
+
+import numpy as np
+from astropy import units as u
+from astropy.units import cds
+
+from ..random import RandomGenerator
+from ..units import d_earth, D_earth, G_earth
+from .. import terrestrial
+
+
+def hydrographic_coverage(world_type, n):
+    """n hydrographic coverages rolled for the world type from its
+    _hydrographic_roll, nan if the world type has no liquid elements"""
+    if not hasattr(world_type, '_hydrographic_roll'):
+        return np.full(n, np.nan)
+    dice, modifier = world_type._hydrographic_roll
+    roll = getattr(RandomGenerator(), f'roll{dice}d6')(
+        modifier, continuous=True, size=n)
+    return np.clip(roll / 10, 0, 1)
+
+
+def absorption(world_type, hydrographic_coverage):
+    """the world type absorption, evaluating the fits over the Temperature
+    Factors Table through the class property for types defining one"""
+    if hasattr(world_type, '_absorption'):
+        return np.full(np.shape(hydrographic_coverage),
+                       world_type._absorption)
+    return world_type.absorption.fget(
+        SimpleNamespace(hydrographic_coverage=hydrographic_coverage))
+
+
+def temperatures(world_type, n):
+    """n average temperatures in K rolled in the range of the world type,
+    following World.random_temperature"""
+    lower, upper = (bound.to_value(u.K)
+                    for bound in world_type._temperature_bounds)
+    # sum of a 3d6-3 roll in range
+    roll = RandomGenerator().roll3d6(-3, continuous=True, size=n)
+    return (lower + roll / 15 * (upper - lower)) * u.K
+
+
+def terrestrial_properties(world_type, blackbody_temperature=None, n=None):
+    """generates the physical parameters of worlds of the given terrestrial
+    type in orbit at an array of blackbody temperatures in K, following the
+    Terrestrial randomization, or of n worlds out of orbit if no blackbody
+    temperatures are given, their temperatures rolled in the world type
+    range and their blackbody temperatures derived from it
+
+    returns a dict of arrays of the density, diameter, mass, gravity,
+    hydrographic_coverage, volatile_mass, temperature and pressure, nan
+    where not applicable to the world type"""
+    if not (isinstance(world_type, type) and
+            issubclass(world_type, terrestrial.Terrestrial) and
+            hasattr(world_type, '_core')):
+        raise ValueError(f'{world_type} is not a terrestrial world type')
+    if (blackbody_temperature is None) == (n is None):
+        raise ValueError('either blackbody temperatures or n has to be given')
+    if blackbody_temperature is not None:
+        blackbody_temperature = np.ravel(
+            u.Quantity(blackbody_temperature, u.K).value)
+        n = len(blackbody_temperature)
+    has_atmosphere = hasattr(world_type, '_atmosphere')
+
+    hydrographic = hydrographic_coverage(world_type, n)
+    # sum of a 3d6 roll divided by 10
+    volatile_mass = (RandomGenerator().roll3d6(continuous=True, size=n) / 10
+                     if has_atmosphere else np.full(n, np.nan))
+    correction = absorption(world_type, hydrographic)
+    if has_atmosphere:
+        correction = correction * (1 + volatile_mass *
+                                   world_type._greenhouse_factor)
+    if blackbody_temperature is None:
+        temperature = temperatures(world_type, n).value
+        blackbody_temperature = temperature / correction
+    else:
+        temperature = blackbody_temperature * correction
+
+    # sum of a 3d6 roll over World Density Table
+    lower, upper = (bound.to(d_earth).value for bound in world_type._core)
+    density = lower + (upper - lower) * RandomGenerator().truncnorm_draw(
+        0, 1, .376, .2, size=n)
+    # roll of 2d6-2 in range [Dmin, Dmax]
+    scale = np.sqrt(blackbody_temperature / density)
+    lower, upper = scale * world_type._size[0], scale * world_type._size[1]
+    diameter = lower + (RandomGenerator().roll2d6(
+        -2, continuous=True, size=n) / 10) * (upper - lower)
+
+    gravity = density * diameter
+    pressure = volatile_mass * getattr(world_type, '_pressure_factor',
+                                       np.nan) * gravity
+
+    return {'density': density * d_earth,
+            'diameter': diameter * D_earth,
+            'mass': density * diameter ** 3 * u.M_earth,
+            'gravity': gravity * G_earth,
+            'hydrographic_coverage': hydrographic,
+            'volatile_mass': volatile_mass,
+            'temperature': temperature * u.K,
+            'pressure': pressure * cds.atm}
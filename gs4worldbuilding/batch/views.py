@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from types import FunctionType, MethodType
+
+import numpy as np
+
+from ..model import bounds
+from ..orbit import Orbit
+from ..planet import InplacePlanet
+from ..star_system import StarSystem
+from ..star import Star
+from ..companion_star import CompanionStar
+from ..asteroid_belt import AsteroidBelt
+from ..terrestrial import Terrestrial
+from ..gas_giant import GasGiant
+from ..utils import int_to_roman
+from .stellar import LUMINOSITY_CLASSES
+from .layout import GAS_GIANT_ARRANGEMENTS
+from .star_system import POPULATIONS, SEPARATIONS
+from .classify import CLIMATES, PRESSURES
+from .catalog import WORLD_TYPES
+
+
+class _View(ABC):
+    """a read only view over a row of a catalog table, columns are read on
+    access and the other attributes are resolved through the model class of
+    the row, evaluating its properties over the view"""
+
+    __slots__ = ('_catalog', '_row')
+
+    # the catalog table of the view, the categories indexed by its codes
+    # columns and the models resolving what the row model does not define
+    _table = None
+    _categories = {}
+    _extensions = ()
+
+    def __init__(self, catalog, row):
+        self._catalog = catalog
+        self._row = int(row)
+
+    @property
+    @abstractmethod
+    def _model(self):
+        """the model class the attributes are resolved through"""
+        raise NotImplementedError('views should implement the _model '
+                                  'property')
+
+    def _column(self, name):
+        """the value of the column in the view row"""
+        value = getattr(self._catalog, self._table)[name][self._row]
+        if name in self._categories:
+            return self._categories[name][value] if value >= 0 else None
+        return value
+
+    def __getattr__(self, name):
+        if name in ('_catalog', '_row', '_body'):
+            raise AttributeError(name)
+        if name in getattr(self._catalog, self._table):
+            return self._column(name)
+        for model in (self._model, *self._extensions):
+            if hasattr(model, name):
+                attr = getattr(model, name)
+                break
+        else:
+            raise AttributeError(f"'{type(self).__name__}' object has no "
+                                 f"attribute '{name}'")
+        if isinstance(attr, property):
+            return attr.fget(self)
+        if isinstance(attr, FunctionType):
+            return MethodType(attr, self)
+        return attr
+
+    def __eq__(self, obj):
+        return (type(obj) is type(self) and obj._catalog is self._catalog and
+                obj._row == self._row)
+
+    def __hash__(self):
+        return hash((id(self._catalog), self._table, self._row))
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} {self._model.__name__} '
+                f'{self.name}>')
+
+
+class SystemView(_View):
+    """a star system row of a catalog"""
+
+    __slots__ = ()
+    _table = 'systems'
+    _categories = {'population': POPULATIONS}
+    _model = StarSystem
+
+    @property
+    def name(self):
+        return None
+
+    @property
+    def _stars(self):
+        """the views of the system stars"""
+        offsets = self._catalog.offsets['stars']
+        return [StarView(self._catalog, row) for row in
+                range(offsets[self._row], offsets[self._row + 1])]
+
+    def __getattr__(self, name):
+        # stars are accessed by their letter
+        if len(name) == 1 and 'A' <= name <= 'Z':
+            offsets = self._catalog.offsets['stars']
+            row = offsets[self._row] + ord(name) - ord('A')
+            if row < offsets[self._row + 1]:
+                return StarView(self._catalog, row)
+        return super().__getattr__(name)
+
+
+class StarView(_View):
+    """a star row of a catalog"""
+
+    __slots__ = ()
+    _table = 'stars'
+    _categories = {'gas_giant_arrangement': GAS_GIANT_ARRANGEMENTS,
+                   'luminosity_class': LUMINOSITY_CLASSES,
+                   'separation': SEPARATIONS}
+    _orbit_model = CompanionStar.CompanionStarOrbit
+
+    @property
+    def _model(self):
+        return CompanionStar if self._column('parent') >= 0 else Star
+
+    @property
+    def name(self):
+        system = self._column('system')
+        return chr(ord('A') + self._row -
+                   self._catalog.offsets['stars'][system])
+
+    @property
+    def _star_system(self):
+        return SystemView(self._catalog, self._column('system'))
+
+    @property
+    def _parent(self):
+        """the view of the parent star, None for primaries"""
+        parent = self._column('parent')
+        return StarView(self._catalog, parent) if parent >= 0 else None
+
+    @property
+    def orbit(self):
+        if self._column('parent') < 0:
+            raise AttributeError("primary stars have no attribute 'orbit'")
+        return OrbitView(self)
+
+    @property
+    def forbidden_zone(self):
+        lower, upper = (self._column('forbidden_lower'),
+                        self._column('forbidden_upper'))
+        return None if np.isnan(lower) else bounds.QuantityBounds(lower,
+                                                                  upper)
+
+    @property
+    def orbital_radii(self):
+        offsets = self._catalog.offsets['orbits']
+        return self._catalog.orbits['radius'][offsets[self._row]:
+                                              offsets[self._row + 1]]
+
+    @property
+    def _worlds(self):
+        """the views of the star worlds"""
+        offsets = self._catalog.offsets['worlds']
+        return [world_view(self._catalog, row) for row in
+                range(offsets[self._row], offsets[self._row + 1])]
+
+
+class _WorldView(_View):
+    """a world row of a catalog"""
+
+    __slots__ = ()
+    _table = 'worlds'
+    _categories = {'type': WORLD_TYPES, 'climate': CLIMATES,
+                   'pressure_category': PRESSURES}
+    _orbit_model = Orbit
+
+    @property
+    def _model(self):
+        world_type = self._column('type')
+        return world_type if world_type is not None else Terrestrial
+
+    @property
+    def _parent(self):
+        return StarView(self._catalog, self._column('star'))
+
+    @property
+    def name(self):
+        star = self._column('star')
+        return (self._parent.name + chr(ord('b') + self._row -
+                                        self._catalog.offsets['worlds'][star]))
+
+    @property
+    def orbit(self):
+        return OrbitView(self)
+
+
+class _PlanetView(_WorldView):
+    """a planet row of a catalog, with its moons"""
+
+    __slots__ = ()
+
+    @property
+    def _moons(self):
+        """the views of the world major moons"""
+        offsets = self._catalog.offsets['moons']
+        return [MoonView(self._catalog, row) for row in
+                range(offsets[self._row], offsets[self._row + 1])]
+
+    @property
+    def _n_moonlets(self):
+        return self._column('n_moonlets')
+
+    @property
+    def _n_captured(self):
+        return self._column('n_captured')
+
+
+class AsteroidBeltView(_WorldView):
+    """an asteroid belt row of a catalog"""
+
+    __slots__ = ()
+
+
+class GasGiantView(_PlanetView):
+    """a gas giant row of a catalog"""
+
+    __slots__ = ()
+    _orbit_model = GasGiant.GasGiantOrbit
+
+    @property
+    def moons(self):
+        # GasGiant.moons resolves the planet moons through super()
+        return InplacePlanet.moons.fget(self) + self._n_captured
+
+
+class TerrestrialView(_PlanetView):
+    """a terrestrial row of a catalog, atmospheres are never marginal"""
+
+    __slots__ = ()
+    _extensions = (InplacePlanet,)
+
+    @property
+    def atmosphere(self):
+        atmosphere = getattr(self._model, '_atmosphere', None)
+        return atmosphere(self) if atmosphere else None
+
+
+class MoonView(TerrestrialView):
+    """a major moon row of a catalog"""
+
+    __slots__ = ()
+    _table = 'moons'
+
+    @property
+    def _parent(self):
+        return world_view(self._catalog, self._column('world'))
+
+    @property
+    def name(self):
+        world = self._column('world')
+        return self._parent.name + int_to_roman(
+            self._row - self._catalog.offsets['moons'][world] + 1)
+
+    @property
+    def _moons(self):
+        return []
+
+    @property
+    def _n_moonlets(self):
+        return 0
+
+
+class OrbitView(_View):
+    """the orbit of a catalog star, world or moon around its parent body"""
+
+    __slots__ = ('_body',)
+
+    def __init__(self, body):
+        super().__init__(body._catalog, body._row)
+        self._body = body
+
+    @property
+    def _table(self):
+        return self._body._table
+
+    @property
+    def _model(self):
+        return self._body._orbit_model
+
+    @property
+    def _parent_body(self):
+        return self._body._parent
+
+    @property
+    def name(self):
+        return self._body.name
+
+    @property
+    def radius(self):
+        return self._column('orbital_radius')
+
+    @property
+    def eccentricity(self):
+        return self._column('eccentricity')
+
+
+def world_view(catalog, row):
+    """the view of the world of the given row of a catalog worlds table"""
+    code = catalog.worlds['type'][row]
+    if code >= 0 and issubclass(WORLD_TYPES[code], AsteroidBelt):
+        return AsteroidBeltView(catalog, row)
+    if code >= 0 and issubclass(WORLD_TYPES[code], GasGiant):
+        return GasGiantView(catalog, row)
+    return TerrestrialView(catalog, row)
+
+
+class SystemViews(Sequence):
+    """the sequence of the views of the systems of a catalog"""
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+
+    def __len__(self):
+        return len(self._catalog.offsets['stars']) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('system index out of range')
+        return SystemView(self._catalog, index)
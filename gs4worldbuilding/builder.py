@@ -1,39 +1,397 @@
 from gs4worldbuilding import terrestrial, StarSystem
 from .random import RandomGenerator
+from .detail import Detail
+from .model import pool
+from .asteroid_belt import AsteroidBelt
+from .units import d_earth, D_earth, G_earth
+from . import batch
+
+from collections import namedtuple, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+import asyncio
+import gc
+import os
+import time
+
+import numpy as np
+from astropy import units as u
+from astropy.units import cds
+
+
+class Throughput(namedtuple('Throughput', ['systems', 'seconds',
+                                           'workers'])):
+    """the number of systems generated over seconds by workers"""
+
+    @property
+    def rate(self) -> float:
+        """systems generated per second"""
+        return self.systems / self.seconds if self.seconds else float('inf')
+
+
+def _build_star_system(seed, detail):
+    """generates the star system of a seed, in a worker process or thread
+drawing from its own generator, from a random seed if None"""
+    if seed is None:
+        RandomGenerator().randomize_seed()
+    else:
+        RandomGenerator().seed = seed
+    return StarSystem(detail=detail)
+
+
+def _flatten(systems, seeds):
+    """the batch.Records of star systems"""
+    return batch.records(systems, seeds)
+
+
+def _build_star_systems(seeds, detail):
+    """generates the star systems of seeds, in a worker process"""
+    return [_build_star_system(seed, detail) for seed in seeds]
+
+
+def _share_star_systems(seeds, detail):
+    """generates the star systems of seeds into a shared memory block of
+records, in a worker process"""
+    return batch.share(batch.records(_build_star_systems(seeds, detail),
+                                     seeds))
+
+
+def _aggregate_star_systems(seeds, detail, relative_accuracy):
+    """generates the star systems of seeds into their batch.Statistics, in
+a worker process"""
+    statistics = batch.Statistics(relative_accuracy)
+    for seed in seeds:
+        system = _build_star_system(seed, detail)
+        statistics.update(batch.records([system], [seed]))
+    return statistics
+
+
+def _seed_chunks(seeds, workers, chunksize=None):
+    """the chunks of seeds handed to workers, a few per worker by
+default"""
+    seeds = list(seeds)
+    if any(seed is None for seed in seeds):
+        raise ValueError('star systems seeds can\'t be None')
+    if chunksize is None:
+        chunksize = max(len(seeds) // (workers * 4), 1)
+    return [seeds[i:i + chunksize] for i in range(0, len(seeds), chunksize)]
+
+
+def _map_chunks(function, chunks, workers, release=None):
+    """the results of function over the chunks in their order, over a pool
+of workers processes
+
+if a chunk fails, the chunks not started are cancelled and release is called
+on the results of the others as they complete before raising"""
+    if workers == 1:
+        results = []
+        try:
+            for chunk in chunks:
+                results.append(function(chunk))
+        except BaseException:
+            if release:
+                for result in results:
+                    release(result)
+            raise
+        return results
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(function, chunk) for chunk in chunks]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                # the chunks running are waited for, the others cancelled
+                if (not future.cancel() and release and
+                        future.exception() is None):
+                    release(future.result())
+            raise
+
+
+# the number of systems iter_star_systems generates between two collections
+# of the cyclic object graphs of the systems released by its consumer
+_COLLECT_INTERVAL = 64
+
+# Overall Type Table and World Type Table outcomes of consecutive 3d6 rolls
+_WORLD_DIST = {terrestrial.TinySulfur: .0457488,
+               terrestrial.TinyIce: .16274024,
+               terrestrial.TinyRock: .11266216,
+               terrestrial.SmallHadean: .00312988,
+               terrestrial.SmallIce: .00938964,
+               terrestrial.SmallRock: .05007808,
+               terrestrial.StandardChthonian: .00300024,
+               terrestrial.StandardGreenhouse: .01200096,
+               terrestrial.StandardAmmonia: .05924988,
+               terrestrial.StandardHadean: .01877928,
+               terrestrial.StandardIce: .0312988,
+               terrestrial.StandardOcean: .11266216,
+               terrestrial.StandardGarden: .15899976,
+               terrestrial.LargeChthonian: .00300024,
+               terrestrial.LargeGreenhouse: .01200096,
+               terrestrial.LargeAmmonia: .02699892,
+               terrestrial.LargeIce: .00312988,
+               terrestrial.LargeGarden: .00300024,
+               terrestrial.LargeOcean: .00938964,
+               AsteroidBelt: .16274024}
+_WORLD_TYPES = tuple(_WORLD_DIST)
+# the cumulative probabilities of the world types, normalized once
+_WORLD_CDF = np.cumsum(list(_WORLD_DIST.values()))
+_WORLD_CDF /= _WORLD_CDF[-1]
+# the batch.WORLD_TYPES codes of the world types
+_WORLD_TYPE_CODES = np.array([batch.WORLD_TYPES.index(world_type)
+                              for world_type in _WORLD_TYPES])
+# the units of the world columns of build_worlds
+_WORLD_COLUMNS = {'temperature': u.K, 'density': d_earth,
+                  'diameter': D_earth, 'mass': u.M_earth,
+                  'gravity': G_earth, 'hydrographic_coverage': None,
+                  'volatile_mass': None, 'pressure': cds.atm}
+
+
+def _world_types(n):
+    """n codes of world types drawn over the world types distribution, a
+single code if n is None"""
+    # uniform draws located over the cumulative probabilities
+    return np.searchsorted(_WORLD_CDF, RandomGenerator().rng.random(n),
+                           side='right')
+
+
+def _world_properties(world_type, n):
+    """the properties and the resources of n worlds of world type drawn
+together: the temperatures of batch.temperatures for asteroid belts, the
+properties of batch.terrestrial_properties otherwise"""
+    if issubclass(world_type, AsteroidBelt):
+        properties = {'temperature': batch.temperatures(world_type, n)}
+    else:
+        properties = batch.terrestrial_properties(world_type, n=n)
+    # sum of a 3d roll times over Resource Value Table
+    resources = world_type._resources.lookup(RandomGenerator().roll3d6(size=n))
+    return properties, resources
+
+
+def _materialize_worlds(world_type, properties, resources):
+    """the worlds of world type assigned the properties and the resources
+drawn by _world_properties instead of randomizing them, nan values being
+not applicable to the world type"""
+    worlds = []
+    for row, resource in enumerate(resources):
+        world = world_type(randomize=False)
+        world.randomize(['atmosphere'])
+        world.assign({'resource': resource,
+                      **{prop: values[row]
+                         for prop, values in properties.items()
+                         if not np.isnan(np.asarray(values[row]))}})
+        worlds.append(world)
+    return worlds
 
 
 class Builder():
 
     @staticmethod
     def build_world():
-        dist = {terrestrial.TinySulfur: .0457488,
-                terrestrial.TinyIce: .16274024,
-                terrestrial.TinyRock: .11266216,
-                terrestrial.SmallHadean: .00312988,
-                terrestrial.SmallIce: .00938964,
-                terrestrial.SmallRock: .05007808,
-                terrestrial.StandardChthonian: .00300024,
-                terrestrial.StandardGreenhouse: .01200096,
-                terrestrial.StandardAmmonia: .05924988,
-                terrestrial.StandardHadean: .01877928,
-                terrestrial.StandardIce: .0312988,
-                terrestrial.StandardOcean: .11266216,
-                terrestrial.StandardGarden: .15899976,
-                terrestrial.LargeChthonian: .00300024,
-                terrestrial.LargeGreenhouse: .01200096,
-                terrestrial.LargeAmmonia: .02699892,
-                terrestrial.LargeIce: .00312988,
-                terrestrial.LargeGarden: .00300024,
-                terrestrial.LargeOcean: .00938964,
-                terrestrial.AsteroidBelt: .16274024
-                }
-
         # consecutive 3d6 rolls over Overall Type Table and World Type Table
-        type = RandomGenerator.choice(list(dist.keys()), list(dist.values()))
+        type = _WORLD_TYPES[_world_types(None)]
         return type()
 
     @staticmethod
-    def build_star_system(seed=None):
-        if seed:
+    def build_worlds(n, columns=False):
+        """generates n worlds as build_world, their types drawn at once and
+the worlds of each type generated together, or the dict of the columns of
+the worlds if columns: the type codes indexing batch.WORLD_TYPES, the
+resource values and the properties of batch.terrestrial_properties, nan
+where not applicable to the world type"""
+        codes = _world_types(n)
+        if not columns:
+            worlds = [None] * n
+            for code in np.unique(codes):
+                world_type = _WORLD_TYPES[code]
+                rows = np.flatnonzero(codes == code)
+                for row, world in zip(rows, _materialize_worlds(
+                        world_type, *_world_properties(world_type,
+                                                       len(rows)))):
+                    worlds[row] = world
+            return worlds
+
+        table = {'type': _WORLD_TYPE_CODES[codes],
+                 'resource': np.zeros(n, dtype=int),
+                 **{name: np.full(n, np.nan) for name in _WORLD_COLUMNS}}
+        for code in np.unique(codes):
+            world_type = _WORLD_TYPES[code]
+            rows = np.flatnonzero(codes == code)
+            properties, resources = _world_properties(world_type, len(rows))
+            for name, value in properties.items():
+                unit = _WORLD_COLUMNS[name]
+                table[name][rows] = value.to_value(unit) if unit else value
+            table['resource'][rows] = [resource.value
+                                       for resource in resources]
+        return {name: (column * _WORLD_COLUMNS[name]
+                       if _WORLD_COLUMNS.get(name) else column)
+                for name, column in table.items()}
+
+    @staticmethod
+    def build_star_system(seed=None, lazy=False, detail=Detail.FULL,
+                          deadline=None):
+        """generates the star system of seed down to the level of detail,
+within deadline seconds if given: the stars are always generated, then the
+system is refined in priority order until the deadline and system.detail
+reports the level reached, what is left being generated on access or by
+system.refine identically to the system generated without deadline"""
+        if seed is not None:
+            RandomGenerator().seed = seed
+        if deadline is None:
+            return StarSystem(lazy=lazy, detail=detail)
+        start = time.monotonic()
+        system = StarSystem(lazy=lazy, detail=Detail.STARS)
+        system.refine(detail, deadline - (time.monotonic() - start))
+        return system
+
+    @staticmethod
+    def build_star_systems(seeds, workers=None, chunksize=None,
+                           detail=Detail.FULL, report=None):
+        """generates the star systems of seeds over a pool of worker
+processes, in the order of the seeds and identical to build_star_system
+whatever the number of workers, reporting the Throughput to report if given"""
+        workers = workers or os.cpu_count()
+        chunks = _seed_chunks(seeds, workers, chunksize)
+
+        start = time.perf_counter()
+        systems = [system for chunk in _map_chunks(
+                       partial(_build_star_systems, detail=Detail(detail)),
+                       chunks, workers)
+                   for system in chunk]
+        if report:
+            report(Throughput(len(systems), time.perf_counter() - start,
+                              workers))
+        return systems
+
+    @staticmethod
+    def iter_star_systems(seeds, detail=Detail.FULL, batch=None,
+                          flatten=False, pooled=False):
+        """yields the star systems of seeds one at a time, or in lists of
+batch systems, or their batch.Records if flatten, identical to
+build_star_system
+
+the generator holds no reference to the systems it yielded, their cyclic
+object graphs are collected every _COLLECT_INTERVAL systems so the memory
+stays bounded whatever the number of seeds
+
+if pooled, the models of the systems are recycled through a model.pool.Pool
+of the generator, entered only while the systems are generated: the systems
+yielded are released when the next ones are requested, flattened ones right
+away, so the consumer must not keep any reference to them"""
+        seeds = iter(seeds)
+        models = pool.Pool() if pooled else None
+        generated = 0
+        while True:
+            chunk = [seed for _, seed in zip(range(batch or 1), seeds)]
+            if not chunk:
+                return
+            if any(seed is None for seed in chunk):
+                raise ValueError('star systems seeds can\'t be None')
+            if not pooled and generated >= _COLLECT_INTERVAL:
+                # collects the systems released by the consumer
+                gc.collect()
+                generated = 0
+            with models if pooled else nullcontext():
+                systems = [_build_star_system(seed, Detail(detail))
+                           for seed in chunk]
+            generated += len(chunk)
+            if flatten:
+                records = _flatten(systems, chunk)
+                if pooled:
+                    for system in systems:
+                        models.release(system)
+                del systems
+                yield records
+                del records
+                continue
+            yield systems if batch is not None else systems[0]
+            if pooled:
+                # the released systems graphs are broken up, no need to
+                # collect them
+                for system in systems:
+                    models.release(system)
+            del systems
+
+    @staticmethod
+    async def abuild_star_system(seed=None, detail=Detail.FULL,
+                                 executor=None):
+        """generates the star system of seed as build_star_system without
+blocking the event loop, in executor, a thread or process pool executor, or
+the loop default executor if None. Each thread draws from its own generator
+so concurrent generations are identical to sequential ones. Cancelling the
+call discards its result, the generation already started is not
+interrupted"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, partial(_build_star_system, detail=Detail(detail)),
+            seed)
+
+    @staticmethod
+    async def aiter_star_systems(seeds, detail=Detail.FULL, executor=None,
+                                 concurrency=4):
+        """yields the star systems of seeds in their order, generated as by
+abuild_star_system with at most concurrency generations in flight. The
+pending generations are cancelled when the iteration is cancelled or
+closed"""
+        if concurrency < 1:
+            raise ValueError('concurrency has to be at least 1')
+        loop = asyncio.get_running_loop()
+        build = partial(_build_star_system, detail=Detail(detail))
+        pending = deque()
+        try:
+            for seed in seeds:
+                if seed is None:
+                    raise ValueError('star systems seeds can\'t be None')
+                pending.append(loop.run_in_executor(executor, build, seed))
+                if len(pending) >= concurrency:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def build_records(seeds, workers=None, chunksize=None,
+                      detail=Detail.FULL, report=None):
+        """generates the star systems of seeds as build_star_systems,
+flattened by the workers into shared memory blocks of records, and returns
+the batch.SharedRecords of the chunks of seeds in their order"""
+        workers = workers or os.cpu_count()
+        chunks = _seed_chunks(seeds, workers, chunksize)
+
+        start = time.perf_counter()
+        records = batch.SharedRecords(_map_chunks(
+            partial(_share_star_systems, detail=Detail(detail)), chunks,
+            workers, release=batch.unlink))
+        if report:
+            report(Throughput(len(records), time.perf_counter() - start,
+                              workers))
+        return records
+
+    @staticmethod
+    def build_statistics(seeds, workers=None, chunksize=None,
+                         detail=Detail.FULL, relative_accuracy=.01,
+                         report=None):
+        """generates the star systems of seeds as build_star_systems,
+reduced by the workers into the batch.Statistics of their chunks of seeds,
+and returns their merge, a tree merge in the order of the chunks"""
+        workers = workers or os.cpu_count()
+        chunks = _seed_chunks(seeds, workers, chunksize)
+
+        start = time.perf_counter()
+        statistics = batch.merge_tree(_map_chunks(
+            partial(_aggregate_star_systems, detail=Detail(detail),
+                    relative_accuracy=relative_accuracy), chunks, workers)
+            or [batch.Statistics(relative_accuracy)])
+        if report:
+            report(Throughput(statistics.systems,
+                              time.perf_counter() - start, workers))
+        return statistics
+
+    @staticmethod
+    def build_catalog(n, seed=None, open_cluster=False, garden_host=False):
+        """generates n star systems as the linked tables of a batch.Catalog"""
+        if seed is not None:
             RandomGenerator().seed = seed
-        return StarSystem()
+        return batch.catalog(n, open_cluster, garden_host)
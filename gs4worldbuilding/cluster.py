@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""generation of seed ranges split into leases served by a coordinator to
+worker processes on any host, over multiprocessing managers"""
+
+from collections import namedtuple, deque
+from multiprocessing.managers import BaseManager
+import argparse
+import os
+import socket
+import threading
+import time
+
+from .detail import Detail
+from .builder import Builder
+from . import batch
+
+# a lease of seeds to generate, at the level of detail, into an output
+# which is either 'statistics' or 'records'
+Lease = namedtuple('Lease', ['id', 'seeds', 'detail', 'output'])
+
+# the output of a lease, with the (seed, error) pairs of the seeds skipped
+# as their generation failed
+Shard = namedtuple('Shard', ['lease', 'worker', 'output', 'skipped'])
+
+_OUTPUTS = ('statistics', 'records')
+
+
+def _seeds(seeds):
+    """the seeds as a sequence, ranges are kept as they are sliced into
+    ranges without being expanded"""
+    return seeds if isinstance(seeds, range) else list(seeds)
+
+
+class Leases():
+    """the leases of a coordinator, issued to workers and issued again when
+    failed or not renewed within timeout seconds"""
+
+    def __init__(self, seeds, lease_size, timeout, detail, output):
+        seeds = _seeds(seeds)
+        self._leases = [Lease(i, seeds[start:start + lease_size], detail,
+                              output)
+                        for i, start in enumerate(range(0, len(seeds),
+                                                        lease_size))]
+        self._pending = deque(range(len(self._leases)))
+        # lease ids issued to workers with their expiry times
+        self._issued = {}
+        self._shards = {}
+        self._timeout = timeout
+        self._lock = threading.Lock()
+
+    def _expire(self):
+        """makes the expired leases pending again"""
+        now = time.monotonic()
+        for lease, (_, expiry) in list(self._issued.items()):
+            if expiry < now:
+                del self._issued[lease]
+                self._pending.append(lease)
+
+    def acquire(self, worker):
+        """the next lease issued to worker, None when every lease is issued
+        and not yet expired or when every lease is complete"""
+        with self._lock:
+            self._expire()
+            if not self._pending:
+                return None
+            lease = self._pending.popleft()
+            self._issued[lease] = (worker, time.monotonic() + self._timeout)
+            return self._leases[lease]
+
+    def renew(self, lease, worker):
+        """extends the lease of worker, False if it expired"""
+        with self._lock:
+            self._expire()
+            if self._issued.get(lease, (None,))[0] != worker:
+                return False
+            self._issued[lease] = (worker, time.monotonic() + self._timeout)
+            return True
+
+    def complete(self, shard):
+        """records the output of a lease, the first shard of a lease issued
+        twice is kept"""
+        with self._lock:
+            self._issued.pop(shard.lease, None)
+            if shard.lease in self._pending:
+                self._pending.remove(shard.lease)
+            self._shards.setdefault(shard.lease, shard)
+
+    def fail(self, lease, worker):
+        """makes the lease of a worker pending again"""
+        with self._lock:
+            if self._issued.get(lease, (None,))[0] == worker:
+                del self._issued[lease]
+                self._pending.appendleft(lease)
+
+    def done(self):
+        """whether every lease is complete"""
+        with self._lock:
+            return len(self._shards) == len(self._leases)
+
+    def progress(self):
+        """the numbers of complete and total leases"""
+        with self._lock:
+            return len(self._shards), len(self._leases)
+
+    def shards(self):
+        """the shards of the complete leases in their order"""
+        with self._lock:
+            return [self._shards[lease] for lease in sorted(self._shards)]
+
+    def skipped(self):
+        """the (seed, error) pairs of the seeds skipped by the complete
+        leases in their order"""
+        with self._lock:
+            return [skip for lease in sorted(self._shards)
+                    for skip in self._shards[lease].skipped]
+
+
+# the leases of the coordinator server process
+_leases = None
+
+
+def _serve_leases(*args):
+    """creates the leases served by the coordinator server process"""
+    global _leases
+    _leases = Leases(*args)
+
+
+def _served_leases():
+    return _leases
+
+
+class _Manager(BaseManager):
+    pass
+
+
+_Manager.register('leases', callable=_served_leases)
+
+
+class Coordinator():
+    """serves the leases of seeds to workers at address from a server
+    process and collects their shards
+
+    seeds are split into leases of lease_size seeds, a lease is issued again
+    to another worker when its worker fails or does not renew it within
+    lease_timeout seconds"""
+
+    def __init__(self, seeds, authkey, address=('127.0.0.1', 0),
+                 lease_size=1000, lease_timeout=600, detail=Detail.FULL,
+                 output='statistics'):
+        if output not in _OUTPUTS:
+            raise ValueError(f'output has to be one of {_OUTPUTS}')
+        self._args = (_seeds(seeds), lease_size, lease_timeout,
+                      Detail(detail), output)
+        self._manager = _Manager(address, authkey)
+        self._leases = None
+
+    @property
+    def address(self):
+        """the address the workers connect to"""
+        return self._manager.address
+
+    def start(self):
+        """starts the server process serving the leases"""
+        self._manager.start(_serve_leases, self._args)
+        self._leases = self._manager.leases()
+        return self
+
+    def join(self, timeout=None, interval=.1):
+        """waits for every lease to be complete and returns their shards in
+        the order of the seeds, raises TimeoutError after timeout seconds"""
+        start = time.monotonic()
+        while not self._leases.done():
+            if timeout is not None and time.monotonic() - start > timeout:
+                complete, total = self._leases.progress()
+                raise TimeoutError(f'{complete} of {total} leases complete')
+            time.sleep(interval)
+        return self._leases.shards()
+
+    def skipped(self):
+        """the (seed, error) pairs of the seeds whose generation failed in
+        the leases complete so far, in the order of the seeds"""
+        return self._leases.skipped()
+
+    def stop(self):
+        """stops the server process"""
+        if self._leases is not None:
+            self._leases = None
+            self._manager.shutdown()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+
+def _generate(lease, renew):
+    """the output of a lease and the (seed, error) pairs of the seeds
+    skipped, calling renew between seeds
+
+    a seed fails the same way on any worker, so its error is recorded in
+    the shard instead of failing the lease"""
+    systems, seeds, skipped = [], [], []
+    statistics = batch.Statistics()
+    for seed in lease.seeds:
+        renew()
+        try:
+            system = Builder.build_star_system(seed, detail=lease.detail)
+        except Exception as error:
+            skipped.append((seed, repr(error)))
+            continue
+        if lease.output == 'statistics':
+            statistics.update(batch.records([system], [seed]))
+        else:
+            systems.append(system)
+            seeds.append(seed)
+    if lease.output == 'statistics':
+        return statistics, skipped
+    return batch.records(systems, seeds), skipped
+
+
+def work(address, authkey, interval=1., name=None):
+    """generates the leases of the coordinator at address until every lease
+    is complete, returns the number of leases completed"""
+    name = name or f'{socket.gethostname()}:{os.getpid()}'
+    manager = _Manager(tuple(address), authkey)
+    manager.connect()
+    leases = manager.leases()
+    completed = 0
+
+    while not leases.done():
+        lease = leases.acquire(name)
+        if lease is None:
+            time.sleep(interval)
+            continue
+        renewal = time.monotonic()
+
+        def renew():
+            nonlocal renewal
+            if time.monotonic() - renewal > interval:
+                leases.renew(lease.id, name)
+                renewal = time.monotonic()
+
+        try:
+            output, skipped = _generate(lease, renew)
+        except Exception:
+            leases.fail(lease.id, name)
+            raise
+        leases.complete(Shard(lease.id, name, output, skipped))
+        completed += 1
+    return completed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='runs a worker of a generation coordinator')
+    parser.add_argument('address', help='coordinator host:port')
+    parser.add_argument('authkey', help='coordinator authentication key')
+    args = parser.parse_args(argv)
+    host, port = args.address.rsplit(':', 1)
+    work((host, int(port)), args.authkey.encode())
+
+
+if __name__ == '__main__':
+    main()
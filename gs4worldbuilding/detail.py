@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+from ordered_enum import OrderedEnum
+
+
+class Detail(OrderedEnum):
+    """class Detail Enum of the generation levels of detail"""
+    STARS = 'stars'
+    LAYOUT = 'layout'
+    TYPES = 'types'
+    FULL = 'full'
@@ -73,6 +73,13 @@ class GasGiant(model.RandomizableModel, InplacePlanet, ABC):
                              value.unit.physical_type)
         self._set_bounded_property('mass', value.to(u.M_earth))
 
+    def random_mass(self):
+        """mass pdf fit as a truncated exponential of _mass_scale scale"""
+        bounds = type(self)._mass_bounds
+        self.mass = RandomGenerator().truncexpon_draw(
+            bounds.lower.value, bounds.upper.value,
+            self._mass_scale) * u.M_earth
+
     @property
     def moons(self):
         return super().moons + self._n_captured
@@ -85,7 +92,7 @@ class GasGiant(model.RandomizableModel, InplacePlanet, ABC):
 
     def __init__(self, parent_body, radius):
         self._orbit = type(self).GasGiantOrbit(parent_body, radius, self)
-        self.randomize()
+        self._place()
 
 
 class SmallGasGiant(GasGiant):
@@ -94,11 +101,7 @@ class SmallGasGiant(GasGiant):
 
     _mass_bounds = model.bounds.QuantityBounds(10 * u.M_earth, 80 * u.M_earth)
     _size = GasGiant.Size.SMALL
-
-    def random_mass(self):
-        """small mass pdf fit as a truncated exponential"""
-        self.mass = (RandomGenerator().truncexpon_draw(10, 80, 17.69518578597015) *
-                     u.M_earth)
+    _mass_scale = 17.69518578597015
 
     @property
     def density(self) -> u.Quantity:
@@ -114,11 +117,7 @@ class MediumGasGiant(GasGiant):
     _mass_bounds = model.bounds.QuantityBounds(100 * u.M_earth,
                                                500 * u.M_earth)
     _size = GasGiant.Size.MEDIUM
-
-    def random_mass(self):
-        """medium mass pdf fit as a truncated normal"""
-        self.mass = (RandomGenerator().truncexpon_draw(100, 500, 102.41483046902924) *
-                     u.M_earth)
+    _mass_scale = 102.41483046902924
 
     @property
     def density(self) -> u.Quantity:
@@ -134,11 +133,7 @@ class LargeGasGiant(GasGiant):
     _mass_bounds = model.bounds.QuantityBounds(600 * u.M_earth,
                                                4000 * u.M_earth)
     _size = GasGiant.Size.LARGE
-
-    def random_mass(self):
-        """large mass pdf fit as a truncated exponential"""
-        self.mass = (RandomGenerator().truncexpon_draw(600, 4000, 872.1918137657565) *
-                     u.M_earth)
+    _mass_scale = 872.1918137657565
 
     @property
     def density(self) -> u.Quantity:
@@ -1,3 +1,5 @@
+from .transaction import Transaction, edit
 from .model import Model
 from .randomizable_model import RandomizableModel
 from . import bounds
+from . import pool
@@ -6,6 +6,9 @@ from .bounds import Bounds
 class QuantityBounds(Bounds):
 
     def normalize(self, value):
+        if self.upper == self.lower:
+            # a single value range, normalized to its lower bound
+            return 0.
         return ((value.value - self.lower.value) /
                 (self.upper.value - self.lower.value))
 
@@ -13,6 +13,9 @@ class ValueBounds(Bounds):
             return value
         if np.isnan(value):
             raise ValueError('can\'t normalize nan in bounds')
+        if self.upper == self.lower:
+            # a single value range, normalized to its lower bound
+            return 0.
         return (value - self.lower) / (self.upper - self.lower)
 
     def scale(self, value):
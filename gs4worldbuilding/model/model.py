@@ -2,12 +2,29 @@
 
 from abc import ABC
 
+from .transaction import Transaction
+from . import pool
+
 
 class Model(ABC):
     """the Model class"""
 
+    def __new__(cls, *args, **kwargs):
+        # recycled models are empty as new ones, see pool
+        model = pool.acquire(cls)
+        return model if model is not None else super().__new__(cls)
+
     def _set_bounded_property(self, prop, value):
-        """setter for bounded value properties"""
+        """setter for bounded value properties, deferred to commit when
+in an edit transaction"""
+        transaction = Transaction.active(self) if Transaction.open else None
+        if transaction is not None:
+            transaction.defer(self, prop, value)
+            return
+        self._apply_bounded_property(prop, value)
+
+    def _apply_bounded_property(self, prop, value):
+        """validates and stores a bounded value property"""
         bounds = getattr(self, f'{prop}_bounds', None)
         if not bounds:
             raise AttributeError(f'can\'t set attribute, no {prop}_bounds found')
@@ -20,9 +37,20 @@ class Model(ABC):
         bounds = getattr(self, f'{prop}_bounds', None)
         if not bounds:
             raise AttributeError(f"can't get attribute, no {prop}_bounds found")
+        transaction = Transaction.active(self) if Transaction.open else None
+        if transaction is not None:
+            try:
+                return transaction.pending(self, prop)
+            except KeyError:
+                pass
         value = getattr(self, f'_{prop}')
         return bounds.scale(value)
 
+    def edit(self):
+        """returns a transaction deferring the validation of bounded
+properties assignments under this model until commit"""
+        return Transaction(self)
+
     @property
     def name(self) -> str:
         return self._name if hasattr(self, '_name') else None
@@ -32,8 +60,9 @@ class Model(ABC):
         self._name = value
 
     def __iter__(self):
-        """yield property names and values"""
-        for prop in list(filter(lambda x: hasattr(type(self), x)
+        """yield public property names and values"""
+        for prop in list(filter(lambda x: not x.startswith('_')
+                         and hasattr(type(self), x)
                          and isinstance(getattr(type(self), x), property),
                          dir(self))):
             yield prop, getattr(self, prop)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""opt-in recycling of the model objects of released star systems
+
+a Pool keeps free lists of models per class filled by release, which empties
+the models of a star system no longer referenced by its consumer. Models are
+allocated from the pool entered by the current thread only, within its with
+statement, so a pool left suspended in a generator does not leak to the other
+allocations. Recycled models are indistinguishable from new ones, their
+classes are reset to the classes they were derived from in place and their
+attributes are cleared"""
+
+import threading
+
+_local = threading.local()
+
+
+def _stack():
+    """the current thread stack of entered pools"""
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def active():
+    """the pool models are allocated from in the current thread, None if no
+pool is entered"""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def acquire(cls):
+    """a recycled model of class cls from the active pool, None if no pool
+is entered or its free list is empty"""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1].acquire(cls) if stack else None
+
+
+def _base(cls):
+    """the class a class derived in place is derived from"""
+    while '_factory_base' in vars(cls):
+        cls = cls._factory_base
+    return cls
+
+
+def _models(model):
+    """the models reachable from a model through its attributes, lists,
+tuples and dicts"""
+    from .model import Model
+    models, seen, stack = [], set(), [model]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        models.append(obj)
+        for value in vars(obj).values():
+            if isinstance(value, dict):
+                value = list(value.values())
+            if isinstance(value, (list, tuple)):
+                stack.extend(v for v in value if isinstance(v, Model))
+            elif isinstance(value, Model):
+                stack.append(value)
+    return models
+
+
+class Pool():
+    """the free lists of at most size recycled models per class
+
+models are allocated from the pool while the current thread is within its
+with statement"""
+
+    def __init__(self, size=1024):
+        if size < 1:
+            raise ValueError('pool size has to be at least 1')
+        self.size = size
+        self._free = {}
+
+    def __enter__(self):
+        _stack().append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _stack().pop()
+
+    def acquire(self, cls):
+        """a recycled model of class cls, None if its free list is empty"""
+        free = self._free.get(cls)
+        return free.pop() if free else None
+
+    def free(self, cls) -> int:
+        """the number of recycled models of class cls"""
+        return len(self._free.get(cls, ()))
+
+    def release(self, model) -> int:
+        """recycles the models of a star system, or of any model graph,
+that its consumer no longer references, returns the number of models
+recycled
+
+every model reachable from model is emptied, a reference kept to any of
+them is left dangling"""
+        models = _models(model)
+        for obj in models:
+            vars(obj).clear()
+            obj.__class__ = _base(type(obj))
+            free = self._free.setdefault(type(obj), [])
+            if len(free) < self.size:
+                free.append(obj)
+        return len(models)
@@ -8,11 +8,19 @@ class RandomizableModel(Model, ABC):
 
     _precedence = []
 
-    def randomize(self):
+    def randomize(self, props=None):
         """randomizes applicable properties values with precedence
-constraints"""
+constraints, restricted to props if given"""
         # randomizable properties
-        props = list(filter(lambda x: hasattr(self, f'random_{x}'),
+        props = list(filter(lambda x: hasattr(self, f'random_{x}') and
+                            (props is None or x in props),
                             self._precedence))
         for prop in props:
             getattr(type(self), f'random_{prop}')(self)
+
+    def assign(self, values):
+        """assigns the values of the properties in values with precedence
+constraints"""
+        for prop in self._precedence:
+            if prop in values:
+                setattr(self, prop, values[prop])
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+import numpy as np
+
+# back references followed to walk a model up to its root model
+_PARENT_ATTRIBUTES = ('_world', '_orbit', '_parent_body', '_star_system')
+
+_local = threading.local()
+
+_UNSET = object()
+
+
+def _lineage(model):
+    """yield the model and its ancestors up to the root model"""
+    while model is not None:
+        yield model
+        model = next((getattr(model, attr) for attr in _PARENT_ATTRIBUTES
+                      if getattr(model, attr, None) is not None), None)
+
+
+def _stack():
+    """the current thread stack of open transactions"""
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def _check(model, prop, value):
+    """raises ValueError if a committed value is out of the final bounds of
+its property or no longer the stored one, rescaled by later assignments"""
+    bounds = getattr(model, f'{prop}_bounds')
+    if value < bounds.lower or value > bounds.upper:
+        raise ValueError(f'{prop} value {value} out of range {bounds}')
+    stored, expected = getattr(model, f'_{prop}'), bounds.normalize(value)
+    if not (stored == expected or np.isclose(stored, expected)):
+        raise ValueError(f'{prop} value {value} rescaled to '
+                         f'{bounds.scale(stored)} by the bounds {bounds}')
+
+
+class Transaction():
+    """the bounded properties edit transaction
+
+assignments to bounded properties of models under the transaction roots are
+buffered, then applied in dependency order and validated once on commit.
+Every assigned model is rolled back if any of the values is out of range."""
+
+    # the number of transactions open over every thread, models skip the
+    # lookup of their transaction while none is
+    open = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def active(model):
+        """the innermost open transaction covering the model if any"""
+        if not Transaction.open:
+            return None
+        stack = _stack()
+        if not stack:
+            return None
+        lineage = list(_lineage(model))
+        for transaction in reversed(stack):
+            if transaction.covers(lineage):
+                return transaction
+        return None
+
+    def covers(self, lineage):
+        """whether a model lineage is under one of the transaction roots"""
+        return (not self._roots or
+                any(id(model) in self._roots for model in lineage))
+
+    def defer(self, model, prop, value):
+        """buffers a bounded property assignment"""
+        if id(model) not in self._pending:
+            self._pending[id(model)] = (model, {})
+        self._pending[id(model)][1][prop] = value
+
+    def pending(self, model, prop):
+        """the buffered value of a bounded property, raise KeyError if none"""
+        return self._pending[id(model)][1][prop]
+
+    def commit(self):
+        """applies buffered assignments upstream models first and in
+precedence order, rolls every assigned model back on failure"""
+        def depth(item):
+            return len(list(_lineage(item[0])))
+
+        def precedence(model):
+            props = getattr(model, '_precedence', [])
+            return lambda prop: (props.index(prop) if prop in props
+                                 else len(props))
+
+        pending = sorted(self._pending.values(), key=depth)
+        self._pending = {}
+        snapshots = [(model, {f'_{prop}': getattr(model, f'_{prop}', _UNSET)
+                              for prop in props})
+                     for model, props in pending]
+        assignments = [(model, prop, props[prop]) for model, props in pending
+                       for prop in sorted(props, key=precedence(model))]
+        committed = list(assignments)
+        try:
+            while assignments:
+                # values out of the range implied by the previous state are
+                # retried once the other assignments are applied
+                retries, error = [], None
+                for model, prop, value in assignments:
+                    try:
+                        model._apply_bounded_property(prop, value)
+                    except ValueError as e:
+                        retries.append((model, prop, value))
+                        error = e
+                if len(retries) == len(assignments):
+                    raise error
+                assignments = retries
+            # values applied before the bounds they depend on moved
+            for model, prop, value in committed:
+                _check(model, prop, value)
+        except Exception:
+            for model, snapshot in snapshots:
+                for attr, value in snapshot.items():
+                    if value is _UNSET:
+                        model.__dict__.pop(attr, None)
+                    else:
+                        setattr(model, attr, value)
+            raise
+
+    def rollback(self):
+        """discards buffered assignments"""
+        self._pending = {}
+
+    def __enter__(self):
+        _stack().append(self)
+        with Transaction._lock:
+            Transaction.open += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _stack().remove(self)
+        with Transaction._lock:
+            Transaction.open -= 1
+        if exc_type is not None:
+            self.rollback()
+            return False
+        for key, (model, props) in list(self._pending.items()):
+            enclosing = Transaction.active(model)
+            if enclosing is not None:
+                # nested assignments are merged into the enclosing transaction
+                for prop, value in props.items():
+                    enclosing.defer(model, prop, value)
+                del self._pending[key]
+        self.commit()
+        return False
+
+    def __init__(self, *roots):
+        self._roots = {id(root) for root in roots}
+        self._pending = {}
+
+
+def edit(*roots):
+    """returns a transaction over the given root models, over every model
+if none is given"""
+    return Transaction(*roots)
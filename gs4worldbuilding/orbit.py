@@ -9,6 +9,11 @@ import numpy as np
 from astropy import units as u
 
 
+def _model_class(body):
+    """the model class of a body, the model of its row for catalog views"""
+    return getattr(body, '_model', type(body))
+
+
 class Orbit(model.RandomizableModel):
     """the orbit model"""
 
@@ -138,7 +143,7 @@ class Orbit(model.RandomizableModel):
     @property
     def period(self) -> u.Quantity:
         """the orbital period in earth years"""
-        if issubclass(type(self._parent_body), Planet):
+        if issubclass(_model_class(self._parent_body), Planet):
             # handling satellite orbital period
             return np.sqrt(self.radius.to(D_earth).value ** 3 /
                            (self._parent_body.mass.value +
@@ -147,7 +152,7 @@ class Orbit(model.RandomizableModel):
             return np.sqrt(self.radius.value ** 3 /
                            ((self._parent_body.mass.value +
                            self._body.mass.to(u.M_sun).value)
-                           if issubclass(type(self._body), Planet)
+                           if issubclass(_model_class(self._body), Planet)
                            else self._parent_body.mass.value)) * u.a
 
     def __init__(self, parent_body, radius, body=None):
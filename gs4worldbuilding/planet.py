@@ -3,6 +3,7 @@ from gs4worldbuilding.model.bounds.value_bounds import ValueBounds
 from .model import bounds
 from .random import RandomGenerator
 from .units import D_earth, G_earth
+from .tables import Table
 
 from abc import ABC, abstractmethod
 from enum import Enum
@@ -46,18 +47,53 @@ class Planet(ABC):
 class InplacePlanet(Planet, ABC):
     """the Planet given orbital parameters as an abstract class"""
 
+    # properties rolled from the planet own substream once placed in orbit
+    _details = ['rotation', 'resonant', 'retrograde', 'axial_tilt']
+    # the Axial Tilt Table and its extended table of 1d rolls
+    _axial_tilts = Table({6: 0, 9: 10, 12: 20, 14: 30, 16: 40},
+                         inclusive=True)
+    _extended_axial_tilts = Table({2: 50, 4: 60, 5: 70, 6: 80},
+                                  inclusive=True)
+
+    def __getattr__(self, name):
+        """generates the deferred moons and details on first access"""
+        generate_moons = self.__dict__.get('_generate_moons')
+        if (generate_moons is not None and
+            name in ['_moons', '_n_moonlets', '_n_captured']):
+            del self._generate_moons
+            generate_moons(self)
+            return getattr(self, name)
+        if (self.__dict__.get('_details_pending') and
+            name in [f'_{detail}' for detail in self._details]):
+            self.fill_details()
+            return getattr(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no " +
+                             f"attribute '{name}'")
+
+    def _place(self):
+        """randomizes the planet placed in orbit, drawing the entropy of its
+own substream and leaving the details pending"""
+        self._entropy = RandomGenerator().draw_entropy()
+        self.randomize([prop for prop in self._precedence
+                        if prop not in self._details])
+        self._details_pending = True
+
+    def fill_details(self):
+        """randomizes the pending details from the planet own substream"""
+        if self.__dict__.pop('_details_pending', False):
+            with RandomGenerator().substream(self._entropy, 1):
+                self.randomize(self._details)
+
     def random_axial_tilt(self) -> None:
         """Roll 3d over Axial Tilt Tables to define axial tilt"""
         tilt_roll = RandomGenerator().roll2d6(-2, continuous=True)
         table_roll = RandomGenerator().roll3d6()
         if table_roll < 17:
-            table = {6: 0, 9: 10, 12: 20, 14: 30, 16: 40}
+            tilt = self._axial_tilts.lookup(table_roll)
         else:
-            table_roll = RandomGenerator().roll1d6()
-            table = {2: 50, 4: 60, 5: 70, 6: 80}
-        self.axial_tilt = (table[list(filter(lambda x: table_roll <= x,
-                           table.keys()))[0]]
-                           + tilt_roll) * u.deg
+            tilt = self._extended_axial_tilts.lookup(
+                RandomGenerator().roll1d6())
+        self.axial_tilt = (tilt + tilt_roll) * u.deg
 
     def random_resonant(self) -> None:
         """Roll 3d to define resonant property"""
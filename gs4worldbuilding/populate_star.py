@@ -3,6 +3,9 @@ from .random import RandomGenerator
 from .asteroid_belt import AsteroidBelt
 from .orbit import Orbit
 from .gas_giant import GasGiant, SmallGasGiant, MediumGasGiant, LargeGasGiant
+from .utils import int_to_roman
+from .detail import Detail
+from .tables import Table
 
 from collections import namedtuple
 
@@ -10,6 +13,55 @@ import numpy as np
 from astropy import units as u
 
 
+def _world_types(ammonia):
+    """the World Types Table by terrestrial size in K of blackbody
+    temperature, given whether ammonia worlds may form around the star"""
+    return {
+        terrestrial.Terrestrial.Size.SMALL: Table(
+            {0: (terrestrial.SmallHadean,),
+             81: (terrestrial.SmallIce,),
+             141: (terrestrial.SmallRock,)}, floor=True, unit=u.K),
+        terrestrial.Terrestrial.Size.STANDARD: Table(
+            {0: (terrestrial.StandardHadean,),
+             81: ((terrestrial.StandardAmmonia,) if ammonia
+                  else (terrestrial.StandardIce,)),
+             241: (terrestrial.StandardOcean, terrestrial.StandardGarden),
+             321: (terrestrial.StandardGreenhouse,),
+             501: (terrestrial.StandardChthonian,)}, floor=True, unit=u.K),
+        terrestrial.Terrestrial.Size.LARGE: Table(
+            {0: ((terrestrial.LargeAmmonia,) if ammonia
+                 else (terrestrial.LargeIce,)),
+             241: (terrestrial.LargeOcean, terrestrial.LargeGarden),
+             321: (terrestrial.LargeGreenhouse,),
+             501: (terrestrial.LargeChthonian,)}, floor=True, unit=u.K)}
+
+
+# the World Types Tables around stars up to .65 M☉ and around heavier stars
+_WORLD_TYPES = {True: _world_types(True), False: _world_types(False)}
+
+# orbital radius thresholds in AU of the gas giants moonlets, moons and
+# captured moonlets roll modifiers
+_MOONLET_MODIFIERS = Table({.1: -10, .5: -8, .75: -6, 1.5: -3}, default=0,
+                           inclusive=True, unit=u.au)
+_MOON_MODIFIERS = Table({.5: -5, .75: -4, 1.5: -1}, default=0,
+                        inclusive=True, unit=u.au)
+_CAPTURED_MODIFIERS = Table({.75: -5, 1.5: -4, 3: -1}, default=0,
+                            inclusive=True, unit=u.au)
+
+# the Gas Giant Size Table
+_GAS_GIANT_SIZES = Table({11: SmallGasGiant, 17: MediumGasGiant},
+                         default=LargeGasGiant)
+
+# the orbit contents rolled while placing worlds, terrestrial sizes stand
+# for terrestrial planets
+_ORBIT_CONTENTS = Table({4: None,
+                         7: AsteroidBelt,
+                         9: terrestrial.Terrestrial.Size.TINY,
+                         12: terrestrial.Terrestrial.Size.SMALL,
+                         16: terrestrial.Terrestrial.Size.STANDARD},
+                        default=terrestrial.Terrestrial.Size.LARGE)
+
+
 def make_first_gas_giant_radius(star):
     """generates a float representing an orbital radius given the proper
     gas giant arrangement"""
@@ -40,6 +92,26 @@ def make_radius(limits, previous_radius, outward=False):
     return np.nan
 
 
+def make_limits(star):
+    """the inner and outermost orbital limits given the forbidden zone"""
+    limits = star.limits
+    forbidden_zone = star.forbidden_zone
+    if forbidden_zone:
+        if (forbidden_zone.upper > limits.upper and
+            forbidden_zone.lower > limits.lower):
+            limits = model.bounds.QuantityBounds(
+                        limits.lower,
+                        min(limits.upper, forbidden_zone.lower)
+                     )
+        elif (forbidden_zone.lower < limits.lower and
+              forbidden_zone.upper < limits.upper):
+            limits = model.bounds.QuantityBounds(
+                        max(limits.lower, forbidden_zone.upper),
+                        limits.upper
+                     )
+    return limits
+
+
 def make_radii(star):
     """orbital radii generation procedure"""
     radii = []
@@ -47,20 +119,7 @@ def make_radii(star):
     fgg_radius = np.nan
 
     # compute inner and outermost limits
-    limits = star.limits
-    if star.forbidden_zone:
-        if (star.forbidden_zone.upper > star.limits.upper and
-            star.forbidden_zone.lower > star.limits.lower):
-            limits = model.bounds.QuantityBounds(
-                        star.limits.lower,
-                        min(star.limits.upper, star.forbidden_zone.lower)
-                     )
-        elif (star.forbidden_zone.lower < star.limits.lower and
-              star.forbidden_zone.upper < star.limits.upper):
-            limits = model.bounds.QuantityBounds(
-                        max(star.limits.lower, star.forbidden_zone.upper),
-                        star.limits.upper
-                     )
+    limits = make_limits(star)
 
     # place first radius
     if star.gas_giant_arrangement != type(star).GasGiantArrangement.NONE:
@@ -90,7 +149,9 @@ def make_radii(star):
     return radii, (radii.index(fgg_radius) if not np.isnan(fgg_radius) else -1)
 
 
-def terrestrial_type(parent, size, radius=np.nan):
+def terrestrial_types(parent, size, radius=np.nan):
+    """the world types a terrestrial of given size may take over the World
+    Types Table, alternatives are given in order default then rolled type"""
     blackbody_temperature = (parent.blackbody_temperature
                              if issubclass(type(parent), planet.Planet)
                              else (278 * np.power(parent.luminosity.value,
@@ -100,51 +161,44 @@ def terrestrial_type(parent, size, radius=np.nan):
     parent_star = (parent.orbit._parent_body
                    if issubclass(type(parent), planet.Planet) else parent)
 
-    types = {}
-    if size == terrestrial.Terrestrial.Size.SMALL:
-        types = {0 * u.K: terrestrial.SmallHadean,
-                 81 * u.K: terrestrial.SmallIce,
-                 141 * u.K: terrestrial.SmallRock}
-    elif size == terrestrial.Terrestrial.Size.STANDARD:
-        garden_roll_modifier = min(parent_star._star_system.age // (.5 * u.Ga),
-                                   10)
-        types = {0 * u.K: terrestrial.StandardHadean,
-                 81 * u.K: (terrestrial.StandardAmmonia
-                            if parent_star.mass <= .65 *
-                            u.M_sun else terrestrial.StandardIce),
-                 241 * u.K: (terrestrial.StandardGarden
-                             if RandomGenerator().roll3d6(garden_roll_modifier) >= 18
-                             else terrestrial.StandardOcean),
-                 321 * u.K: terrestrial.StandardGreenhouse,
-                 501 * u.K: terrestrial.StandardChthonian}
-    elif size == terrestrial.Terrestrial.Size.LARGE:
-        garden_roll_modifier = min(parent_star._star_system.age // .5 * u.Ga, 5)
-        types = {0 * u.K: (terrestrial.LargeAmmonia
-                           if parent_star.mass <= .65 * u.M_sun
-                           else terrestrial.LargeIce),
-                 241 * u.K: (terrestrial.LargeGarden
-                             if RandomGenerator().roll3d6(garden_roll_modifier) >= 18
-                             else terrestrial.LargeOcean),
-                 321 * u.K: terrestrial.LargeGreenhouse,
-                 501 * u.K: terrestrial.LargeChthonian}
-
-    world_type = None
     if size == terrestrial.Terrestrial.Size.TINY:
-        # TODO: tiny sulfur is almost always the innermost moon, not respected here
-        world_type = ((terrestrial.TinySulfur if
-                      issubclass(type(parent), GasGiant) and
-                      not hasattr(parent, '_moons') and
-                      RandomGenerator().roll1d6() < 4 else terrestrial.TinyIce)
-                      if blackbody_temperature <= 140 * u.K
-                      else terrestrial.TinyRock)
-    else:
-        world_type = (list(filter(lambda x: blackbody_temperature >= x[0],
-                                  types.items()))[-1][1])
+        if blackbody_temperature > 140 * u.K:
+            return (terrestrial.TinyRock,)
+        return ((terrestrial.TinyIce, terrestrial.TinySulfur)
+                if issubclass(type(parent), GasGiant)
+                else (terrestrial.TinyIce,))
+
+    types = _WORLD_TYPES[bool(parent_star.mass <= .65 * u.M_sun)][size]
+    world_types = types.lookup(blackbody_temperature)
+    if world_types is None:
+        raise ValueError('no world type matches a blackbody temperature of ' +
+                         f'{blackbody_temperature}')
+    return world_types
+
+
+def terrestrial_type(parent, size, radius=np.nan, innermost=False):
+    """the world type of a terrestrial of given size rolled over the World
+    Types Table, tiny moons of gas giants being rolled as sulfur worlds only
+    if innermost"""
+    types = terrestrial_types(parent, size, radius)
+    if len(types) == 1:
+        return types[0]
+
+    if size == terrestrial.Terrestrial.Size.TINY:
+        return (types[1] if innermost and RandomGenerator().roll1d6() < 4
+                else types[0])
 
-    return world_type
+    parent_star = (parent.orbit._parent_body
+                   if issubclass(type(parent), planet.Planet) else parent)
+    garden_roll_modifier = min(parent_star._star_system.age // (.5 * u.Ga),
+                               10 if size ==
+                               terrestrial.Terrestrial.Size.STANDARD else 5)
+    return (types[1] if RandomGenerator().roll3d6(garden_roll_modifier) >= 18
+            else types[0])
 
 
-def make_moon(parent):
+def make_moon_orbit(parent):
+    """the size and orbital radius in AU of a major moon of parent"""
     sizes = sorted(list(terrestrial.Terrestrial.Size))
     parent_size = sizes.index(terrestrial.Terrestrial.Size.LARGE
                               if issubclass(type(parent), GasGiant)
@@ -165,56 +219,81 @@ def make_moon(parent):
         radius_roll += RandomGenerator().roll2d6() if radius_roll >= 15 else 0
         radius = radius_roll / 2 * parent.diameter.to(u.au).value
         # TODO: ensure that major moons are not in 1 planetary diameter of each other
-    moon_type = terrestrial_type(parent, sizes[moon_size], radius)
-    moon = moon_type(orbit=Orbit(parent, radius * u.au))
-    return moon
+    return sizes[moon_size], radius
+
+
+def make_moon(parent, size, radius, innermost=False):
+    """the major moon of parent of given size and orbital radius in AU"""
+    moon_type = terrestrial_type(parent, size, radius, innermost)
+    return moon_type(orbit=Orbit(parent, radius * u.au))
 
 
 def make_gas_giant_moons(parent):
     # roll for moonlets:
     moons = []
-    modifiers = {.1 * u.au: -10, .5 * u.au: -8, .75 * u.au: -6,
-                 1.5 * u.au: -3}
-    filtered = list(filter(lambda x: parent.orbit.radius <= x[0],
-                           modifiers.items()))
-    modifier = filtered[0][1] if len(filtered) > 0 else 0
-    parent._n_moonlets = max(RandomGenerator().roll2d6(modifier), 0)
+    parent._n_moonlets = max(RandomGenerator().roll2d6(
+        _MOONLET_MODIFIERS.lookup(parent.orbit.radius)), 0)
     parent._n_captured = 0
     # roll for moons
     if parent.orbit.radius > .1 * u.au:
-        modifiers = {.5 * u.au: -5, .75 * u.au: -4, 1.5 * u.au: -1}
-        filtered = list(filter(lambda x: parent.orbit.radius <= x[0],
-                               modifiers.items()))
-        modifier = filtered[0][1] if len(filtered) > 0 else 0
-        n_moons = max(RandomGenerator().roll1d6(modifier), 0)
-        for _ in range(n_moons):
-            moons.append(make_moon(parent))
+        n_moons = max(RandomGenerator().roll1d6(
+            _MOON_MODIFIERS.lookup(parent.orbit.radius)), 0)
+        # the world types are rolled in orbit order, the innermost moon
+        # being the only one that may be a sulfur world
+        orbits = sorted((make_moon_orbit(parent) for _ in range(n_moons)),
+                        key=lambda orbit: orbit[1])
+        moons = [make_moon(parent, size, radius, innermost=(i == 0))
+                 for i, (size, radius) in enumerate(orbits)]
     # roll for captured moonlets
     if parent.orbit.radius > .5 * u.au:
-        modifiers = {.75 * u.au: -5, 1.5 * u.au: -4, 3 * u.au: -1}
-        filtered = list(filter(lambda x: parent.orbit.radius <= x[0],
-                               modifiers.items()))
-        modifier = filtered[0][1] if len(filtered) > 0 else 0
-        parent._n_captured = max(RandomGenerator().roll1d6(modifier), 0)
+        parent._n_captured = max(RandomGenerator().roll1d6(
+            _CAPTURED_MODIFIERS.lookup(parent.orbit.radius)), 0)
 
     moons.sort(key=lambda m: m.orbit.radius)
     return moons
 
 
-def make_gas_giant(star, radius, fbsl=False):
-    gas_giant_types = {11: SmallGasGiant,
-                       17: MediumGasGiant}
+def make_moons(world):
+    """the moons generation procedure given the world kind"""
+    if issubclass(type(world), GasGiant):
+        return make_gas_giant_moons(world)
+    if issubclass(type(world), terrestrial.Terrestrial):
+        return make_terrestrial_moons(world)
+    return []
+
+
+def generate_moons(world, details=False):
+    """generates the world moons from the world own substream, with their
+    details if applicable"""
+    with RandomGenerator().substream(world._entropy):
+        world._moons = make_moons(world)
+    for i in range(len(world._moons)):
+        if world.name:
+            world._moons[i].name = f'{world.name}{int_to_roman(i + 1)}'
+        if details:
+            world._moons[i].fill_details()
+
+
+def place_moons(world, deferred=False):
+    """generates the world moons and details, on first access to them if
+    deferred"""
+    if deferred:
+        world._generate_moons = generate_moons
+    else:
+        generate_moons(world, details=True)
+        world.fill_details()
+
+
+def make_gas_giant(star, radius, fbsl=False, deferred=False):
     size_roll = RandomGenerator().roll3d6(4 if radius <= star.snow_line.value or fbsl else 0)
-    filtered = list(filter(lambda x: size_roll < x[0],
-                           list(gas_giant_types.items())))
-    gas_giant_type = filtered[0][1] if len(filtered) > 0 else LargeGasGiant
+    gas_giant_type = _GAS_GIANT_SIZES.lookup(size_roll)
     gas_giant = gas_giant_type(star, radius * u.au)
-    gas_giant._moons = make_gas_giant_moons(gas_giant)
+    place_moons(gas_giant, deferred)
 
     return gas_giant
 
 
-def make_gas_giants(star, radii, fbsl_radius):
+def make_gas_giants(star, radii, fbsl_radius, deferred=False):
     gas_giants = []
 
     for radius in radii:
@@ -222,22 +301,26 @@ def make_gas_giants(star, radii, fbsl_radius):
             if star.gas_giant_arrangement == type(star).GasGiantArrangement.ECCENTRIC:
                 if RandomGenerator().roll3d6() <= 8:
                     gas_giants.append(make_gas_giant(star, radius,
-                                                     radius == fbsl_radius))
+                                                     radius == fbsl_radius,
+                                                     deferred))
                     radii.remove(radius)
             elif star.gas_giant_arrangement == type(star).GasGiantArrangement.EPISTELLAR:
                 if RandomGenerator().roll3d6() <= 6:
                     gas_giants.append(make_gas_giant(star, radius,
-                                                     radius == fbsl_radius))
+                                                     radius == fbsl_radius,
+                                                     deferred))
                     radii.remove(radius)
         else:
             if star.gas_giant_arrangement == type(star).GasGiantArrangement.CONVENTIONAL:
                 if RandomGenerator().roll3d6() <= 15:
                     gas_giants.append(make_gas_giant(star, radius,
-                                                     radius == fbsl_radius))
+                                                     radius == fbsl_radius,
+                                                     deferred))
                     radii.remove(radius)
             elif RandomGenerator().roll3d6() <= 14:
                 gas_giants.append(make_gas_giant(star, radius,
-                                                 radius == fbsl_radius))
+                                                 radius == fbsl_radius,
+                                                 deferred))
                 radii.remove(radius)
 
     return gas_giants
@@ -256,7 +339,7 @@ def make_terrestrial_moons(parent):
         modifier += size_modifiers[parent.size]
         n_moons = max(RandomGenerator().roll1d6(-4 + modifier), 0)
         for _ in range(n_moons):
-            moons.append(make_moon(parent))
+            moons.append(make_moon(parent, *make_moon_orbit(parent)))
         parent._n_moonlets = (max(RandomGenerator().roll1d6(-2 + modifier), 0)
                               if len(moons) == 0 else 0)
 
@@ -264,15 +347,16 @@ def make_terrestrial_moons(parent):
     return moons
 
 
-def make_terrestrial(star, radius, size: terrestrial.Terrestrial.Size):
+def make_terrestrial(star, radius, size: terrestrial.Terrestrial.Size,
+                     deferred=False):
     type = terrestrial_type(star, size, radius)
     terrestrial = type(orbit=Orbit(star, radius * u.au))
-    terrestrial._moons = make_terrestrial_moons(terrestrial)
+    place_moons(terrestrial, deferred)
 
     return terrestrial
 
 
-def make_worlds(star, worlds, radii):
+def make_worlds(star, worlds, radii, deferred=False):
 
     # TODO: implement modifiers
 
@@ -287,12 +371,6 @@ def make_worlds(star, worlds, radii):
     orbits.extend([[radius, None, 0] for radius in radii])
     orbits.sort(key=lambda o: o[0])
 
-    methods = {4: lambda _: None,
-               7: lambda x: AsteroidBelt(orbit=Orbit(star, x * u.au)),
-               9: lambda x: make_terrestrial(star, x, terrestrial.Terrestrial.Size.TINY),
-               12: lambda x: make_terrestrial(star, x, terrestrial.Terrestrial.Size.SMALL),
-               16: lambda x: make_terrestrial(star, x, terrestrial.Terrestrial.Size.STANDARD)}
-
     for i in range(1, len(orbits)):
         if not orbits[i][1]:
             if (orbits[i - 1][1] == 'LIMIT' or
@@ -306,19 +384,24 @@ def make_worlds(star, worlds, radii):
                 orbits[i][2] -= 6
 
             roll = RandomGenerator().roll3d6(orbits[i][2])
-            filtered = list(filter(lambda x: roll < x[0], list(methods.items())))
-            method = filtered[0][1] if len(filtered) > 0 else lambda x: make_terrestrial(star, x, terrestrial.Terrestrial.Size.LARGE)
-            w = method(orbits[i][0])
-            if w:
-                worlds.append(w)
+            content = _ORBIT_CONTENTS.lookup(roll)
+            if content is AsteroidBelt:
+                worlds.append(AsteroidBelt(orbit=Orbit(star, orbits[i][0] * u.au)))
+            elif content is not None:
+                worlds.append(make_terrestrial(star, orbits[i][0], content,
+                                               deferred))
 
     return worlds
 
 
-def populate_star(star):
-    """the procedure to populate a star's orbits"""
+def populate_star(star, detail=Detail.FULL, lazy=False, layout=None):
+    """the procedure to populate a star's orbits given its layout, the worlds
+    moons and details are generated on first access if lazy or under the full
+    level of detail"""
+    deferred = lazy or Detail(detail) < Detail.FULL
 
-    radii, fgg_idx = make_radii(star)
+    radii, fgg_idx = (make_radii(star) if layout is None
+                      else (list(layout[0]), layout[1]))
 
     # first radius beyond snow line
     bsl_radii = list(filter(lambda x: x >= star.snow_line.value, radii))
@@ -329,14 +412,74 @@ def populate_star(star):
     # placing first gas_giant
     if fgg_idx > 0:
         worlds.append(make_gas_giant(star, radii[fgg_idx],
-                                     radii[fgg_idx] == fbsl_radius))
+                                     radii[fgg_idx] == fbsl_radius,
+                                     deferred))
         radii.remove(radii[fgg_idx])
 
     if star.gas_giant_arrangement != type(star).GasGiantArrangement.NONE:
-        worlds.extend(make_gas_giants(star, radii, fbsl_radius))
+        worlds.extend(make_gas_giants(star, radii, fbsl_radius, deferred))
 
-    make_worlds(star, worlds, radii)
+    make_worlds(star, worlds, radii, deferred)
 
     worlds.sort(key=lambda w: w.orbit.radius)
 
     return worlds
+
+
+def _orbit_key(radius):
+    """the substream key of an orbit, the bits of its radius in AU, stable
+    whatever the other orbits dropped by updates"""
+    return int(np.float64(radius).view(np.uint64))
+
+
+def update_moons(parent, key):
+    """the procedure to regenerate the moons of a planet whose world type
+    is invalidated by upstream edits"""
+    star = parent.orbit._parent_body
+    moons = []
+    for i, moon in enumerate(parent._moons):
+        types = terrestrial_types(parent, moon.size, moon.orbit.radius.value)
+        if not isinstance(moon, types):
+            with RandomGenerator().substream(star._entropy, 2, key, i + 1):
+                moon_type = terrestrial_type(parent, moon.size,
+                                             moon.orbit.radius.value,
+                                             innermost=(i == 0))
+                moon = moon_type(orbit=Orbit(parent, moon.orbit.radius))
+        moons.append(moon)
+    return moons
+
+
+def update_star(star):
+    """the procedure to update a populated star's worlds after upstream
+    edits, worlds and orbits out of the orbital limits are dropped and worlds
+    with an invalidated world type are regenerated, others are left
+    untouched"""
+    limits = make_limits(star)
+    lower, upper = limits.lower.value, limits.upper.value
+
+    worlds = []
+    for world in star._worlds:
+        radius = world.orbit.radius.value
+        if radius < lower or radius > upper:
+            continue
+        key = _orbit_key(radius)
+        if (isinstance(world, terrestrial.Terrestrial) and
+            not isinstance(world, terrestrial_types(star, world.size,
+                                                    radius))):
+            # regenerating the world from its own substream
+            with RandomGenerator().substream(star._entropy, 2, key):
+                world = make_terrestrial(star, radius, world.size,
+                                         star._star_system.lazy or
+                                         star._star_system._detail <
+                                         Detail.FULL)
+        elif hasattr(world, '_moons'):
+            world._moons = update_moons(world, key)
+        worlds.append(world)
+
+    radii, fgg_idx = star._layout
+    fgg_radius = radii[fgg_idx] if fgg_idx >= 0 else None
+    radii = [radius for radius in radii if lower <= radius <= upper]
+    star._layout = (radii, (radii.index(fgg_radius) if fgg_radius in radii
+                            else -1))
+
+    return worlds
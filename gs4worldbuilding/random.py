@@ -2,25 +2,30 @@
 
 import numpy as np
 import ctypes
+import threading
+from contextlib import contextmanager
 from scipy.stats import truncnorm, truncexpon
 
+_local = threading.local()
+
+
+def _state():
+    """the current thread generator state, threads draw from generators
+of their own"""
+    if not hasattr(_local, 'rng'):
+        _local.rng, _local.seed = None, 0
+    return _local
+
 
 class RandomGenerator:
     """Serves random generation through a seeded rng"""
     __instance = None
-    __rng = None
-    __seed = 0
 
     def __new__(cls, *args, **kwargs):
         if RandomGenerator.__instance is None:
             RandomGenerator.__instance = super().__new__(cls, *args, **kwargs)
         return RandomGenerator.__instance
 
-    @property
-    def rng(self):
-        """the readonly numpy random number generator"""
-        return self.__rng
-
     def randomize_seed(self):
         """Randomize seed with value in 0 INT_MAX range"""
         self.seed = np.random.randint(ctypes.c_uint32(-1).value // 2)
@@ -28,67 +33,101 @@ class RandomGenerator:
     def _seed_dependent(func):
         def init_seed(*args, **kwargs):
             self = args[0]
-            if not self.__rng:
+            if not _state().rng:
                 self.randomize_seed()
             return func(*args, **kwargs)
         return init_seed
 
+    @property
+    @_seed_dependent
+    def rng(self):
+        """the readonly numpy random number generator"""
+        return _state().rng
+
     @property
     @_seed_dependent
     def seed(self):
         """the generator's seed"""
-        return self.__seed
+        return _state().seed
 
     @seed.setter
     def seed(self, value):
-        self.__seed = value
-        self.__rng = np.random.default_rng(value)
+        state = _state()
+        state.seed = value
+        state.rng = np.random.default_rng(value)
+
+    @_seed_dependent
+    def draw_entropy(self):
+        """returns a value in 0 INT64_MAX range to derive substreams from"""
+        return int(_state().rng.integers(np.iinfo(np.int64).max))
+
+    @contextmanager
+    def substream(self, entropy, *key):
+        """draws from an independent generator derived from entropy and key
+        in the context, the current generator state is left untouched"""
+        state = _state()
+        rng = state.rng
+        state.rng = np.random.default_rng(
+            np.random.SeedSequence(entropy, spawn_key=key))
+        try:
+            yield state.rng
+        finally:
+            state.rng = rng
 
     @_seed_dependent
-    def truncnorm_draw(self, lower, upper, mu, sigma):
+    def truncnorm_draw(self, lower, upper, mu, sigma, size=None):
         """returns a continuous value from the corresponding truncated
-        normal distribution"""
+        normal distribution, an array of values of given size if any"""
         a, b = (lower - mu) / sigma, (upper - mu) / sigma
-        return truncnorm(a, b, mu, sigma).rvs(random_state=self.__rng)
+        return truncnorm(a, b, mu, sigma).rvs(size=size,
+                                              random_state=_state().rng)
 
     @_seed_dependent
-    def truncexpon_draw(self, lower, upper, sigma):
+    def truncexpon_draw(self, lower, upper, sigma, size=None):
         """returns a continuous value from the corresponding truncated
-        exponential distribution"""
+        exponential distribution, an array of values of given size if any"""
         mu = lower
         b = (upper - lower) / sigma
-        return truncexpon(b, mu, sigma).rvs(random_state=self.__rng)
+        return truncexpon(b, mu, sigma).rvs(size=size,
+                                            random_state=_state().rng)
 
     @_seed_dependent
-    def roll1d6(self, modifier=0, continuous=False):
+    def roll1d6(self, modifier=0, continuous=False, size=None):
         """returns a discrete or continuous value mimicking a
-        d6 roll probability function"""
+        d6 roll probability function, an array of values of given size if any"""
         if continuous:
-            return self.__rng.uniform(1 + modifier, 6 + modifier)
-        return self.__rng.integers(1, 6) + modifier
+            return _state().rng.uniform(1 + modifier, 6 + modifier, size)
+        return _state().rng.integers(1, 6, size) + modifier
 
     @_seed_dependent
-    def roll2d6(self, modifier=0, continuous=False):
+    def roll2d6(self, modifier=0, continuous=False, size=None):
         """returns a discrete or continuous value mimicking a
-        2d6 roll probability function"""
+        2d6 roll probability function, an array of values of given size if any"""
         if continuous:
             left = 2 + modifier
             right = 12 + modifier
             mode = (left + right) / 2
-            return self.__rng.triangular(left, mode, right)
-        return sum(self.__rng.integers(1, 6, 2)) + modifier
+            return _state().rng.triangular(left, mode, right, size)
+        if size is None:
+            return sum(_state().rng.integers(1, 6, 2)) + modifier
+        return (_state().rng.integers(1, 6, (2, *np.atleast_1d(size)))
+                .sum(axis=0) + modifier)
 
     @_seed_dependent
-    def roll3d6(self, modifier=0, continuous=False):
+    def roll3d6(self, modifier=0, continuous=False, size=None):
         """returns a discrete or continuous value mimicking a
-        3d6 roll probability function"""
+        3d6 roll probability function, an array of values of given size if any"""
         if continuous:
             lower = 3 + modifier
             upper = 18 + modifier
             mu = ((upper - lower) / 2) + lower
-            return self.truncnorm_draw(lower, upper, mu, sigma=2.958040)
-        return sum(self.__rng.integers(1, 6, 3)) + modifier
+            return self.truncnorm_draw(lower, upper, mu, sigma=2.958040,
+                                       size=size)
+        if size is None:
+            return sum(_state().rng.integers(1, 6, 3)) + modifier
+        return (_state().rng.integers(1, 6, (3, *np.atleast_1d(size)))
+                .sum(axis=0) + modifier)
 
     @_seed_dependent
     def choice(self, a, p):
-        return a[self.__rng.choice(list(range(0, len(a))), p=p)]
+        return a[_state().rng.choice(list(range(0, len(a))), p=p)]
@@ -2,29 +2,76 @@
 
 from . import model
 from .random import RandomGenerator
-from .populate_star import populate_star
+from .populate_star import (populate_star, update_star, make_moons,
+                            make_radii)
+from .detail import Detail
+from .utils import int_to_roman
+from .tables import Table
 
 from enum import Enum
+import time
 
 import numpy as np
 from astropy import units as u
 
 
-def int_to_roman(input):
-    """TODO: util function to move, Convert an integer to a Roman numeral. """
+# the fits of the Stellar Evolution Table over arrays of masses in M☉, shared
+# with the batch kernels so that the scalar properties round alike
 
-    if not isinstance(input, type(1)):
-        raise TypeError("expected integer, got %s" % type(input))
-    if not 0 < input < 4000:
-        raise ValueError("Argument must be between 1 and 3999")
-    ints = (1000, 900,  500, 400, 100,  90, 50,  40, 10,  9,   5,  4,   1)
-    nums = ('M', 'CM', 'D', 'CD', 'C', 'XC', 'L', 'XL', 'X', 'IX', 'V', 'IV', 'I')
-    result = []
-    for i in range(len(ints)):
-        count = int(input / ints[i])
-        result.append(nums[i] * count)
-        input -= ints[i] * count
-    return ''.join(result)
+def _l_max(mass):
+    """l_max fitted through the form a*x**b"""
+    return np.where(mass >= .45,
+                    1.417549268949681 * mass ** 3.786542028176919, np.nan)
+
+
+def _l_min(mass):
+    """l_min fitted through the form a*x**b"""
+    return 0.8994825154104518 * mass ** 4.182711149771404
+
+
+def _m_span(mass):
+    """m_span fitted through the form a*exp(b*x)+c"""
+    return np.where(mass >= .45,
+                    355.25732733 * np.exp(-3.62394465 * mass) - 1.19842708,
+                    np.nan)
+
+
+def _s_span(mass):
+    """s_span fitted through the form a*exp(b*x)"""
+    return np.where(mass >= .95,
+                    18.445568275396568 * np.exp(-2.471832533773299 * mass),
+                    np.nan)
+
+
+def _g_span(mass):
+    """g_span fitted through the form a*exp(b*x)"""
+    return np.where(mass >= .95,
+                    11.045171731219448 * np.exp(-2.4574060414344223 * mass),
+                    np.nan)
+
+
+def _temp_V(mass):
+    """temp in interval [3100, 8200] as a forth-degree polynomial"""
+    return (1659.4884130666383 * mass ** 4 - 7449.958040879493
+            * mass ** 3 + 10805.399314976361 * np.power(mass, 2.)
+            - 2568.323443806999 * mass + 3296.2303340370468)
+
+
+def _temp_III(mass):
+    """temp in interval [3000, 5000] linearly through the form a * x + b"""
+    return 1052.63157589 * mass + 2105.26315789
+
+
+def _radius(luminosity, temperature):
+    """radius in AU from luminosity in L☉ and temperature in K"""
+    return (155000 * np.sqrt(luminosity)) / np.power(temperature, 2.)
+
+
+def _evaluate(fit, mass):
+    """a fit at a mass quantity, evaluated over a single element array as
+    the vectorized power and exponential may round differently from their
+    scalar counterparts"""
+    return fit(np.array([mass.value]))[0]
 
 
 class Star(model.RandomizableModel):
@@ -45,6 +92,21 @@ class Star(model.RandomizableModel):
         ECCENTRIC = 'Eccentric gas giant'
         EPISTELLAR = 'Epistellar gas giant'
 
+    _gas_giant_arrangements = Table({11: GasGiantArrangement.NONE,
+                                     13: GasGiantArrangement.CONVENTIONAL,
+                                     15: GasGiantArrangement.ECCENTRIC},
+                                    default=GasGiantArrangement.EPISTELLAR)
+    _spectral_types = Table({2: 'A5', 1.9: 'A6', 1.8: 'A7', 1.7: 'A9',
+                             1.6: 'F0', 1.5: 'F2', 1.45: 'F3', 1.4: 'F4',
+                             1.35: 'F5', 1.3: 'F6', 1.25: 'F7', 1.2: 'F8',
+                             1.15: 'F9', 1.10: 'G0', 1.05: 'G1', 1: 'G2',
+                             .95: 'G4', .9: 'G6', .85: 'G8', .8: 'K0',
+                             .75: 'K2', .7: 'K4', .65: 'K5', .6: 'K6',
+                             .55: 'K8', .5: 'M0', .45: 'M1', .4: 'M2',
+                             .35: 'M3', .3: 'M4', .25: 'M4', .2: 'M5',
+                             .15: 'M6', .1: 'M7'}, inclusive=True,
+                            unit=u.M_sun)
+
     def random_seed_mass(self):
         """consecutive sum of a 3d roll times over Stellar Mass Table with
 modifier if applicable"""
@@ -56,61 +118,43 @@ modifier if applicable"""
 
     def random_gas_giant_arrangement(self):
         """sum of a 3d roll times over Gas Giant Arrangement Table"""
-        arrangements = {11: self.GasGiantArrangement.NONE,
-                        13: self.GasGiantArrangement.CONVENTIONAL,
-                        15: self.GasGiantArrangement.ECCENTRIC}
-        roll = RandomGenerator().roll3d6()
-        filtered = list(filter(lambda x: roll < x[0],
-                               list(arrangements.items())))
-
-        self.gas_giant_arrangement = (filtered[0][1] if len(filtered) > 0
-                                      else self.GasGiantArrangement.EPISTELLAR)
+        self.gas_giant_arrangement = self._gas_giant_arrangements.lookup(
+            RandomGenerator().roll3d6())
 
     @staticmethod
     def __l_max(mass):
         """l_max fitted through the form a*x**b"""
-        if mass >= .45 * u.M_sun:
-            return 1.417549268949681 * mass.value ** 3.786542028176919
-        return np.nan
+        return _evaluate(_l_max, mass)
 
     @staticmethod
     def __l_min(mass):
         """l_min fitted through the form a*x**b"""
-        return 0.8994825154104518 * mass.value ** 4.182711149771404
+        return _evaluate(_l_min, mass)
 
     @staticmethod
     def __m_span(mass):
         """m_span fitted through the form a*exp(b*x)+c"""
-        if mass >= .45 * u.M_sun:
-            return 355.25732733 * np.exp(-3.62394465 * mass.value) - 1.19842708
-        return np.nan
+        return _evaluate(_m_span, mass)
 
     @staticmethod
     def __s_span(mass):
         """s_span fitted through the form a*exp(b*x)"""
-        if mass >= .95 * u.M_sun:
-            return 18.445568275396568 * np.exp(-2.471832533773299 * mass.value)
-        return np.nan
+        return _evaluate(_s_span, mass)
 
     @staticmethod
     def __g_span(mass):
         """g_span fitted through the form a*exp(b*x)"""
-        if mass >= .95 * u.M_sun:
-            return 11.045171731219448 * np.exp(-2.4574060414344223
-                                               * mass.value)
-        return np.nan
+        return _evaluate(_g_span, mass)
 
     @staticmethod
     def __temp_V(mass):
         """temp in interval [3100, 8200] as a forth-degree polynomial"""
-        return (1659.4884130666383 * mass.value ** 4 - 7449.958040879493
-                * mass.value ** 3 + 10805.399314976361 * mass.value ** 2
-                - 2568.323443806999 * mass.value + 3296.2303340370468)
+        return _evaluate(_temp_V, mass)
 
     @staticmethod
     def __temp_III(mass):
         """temp in interval [3000, 5000] linearly through the form a * x + b"""
-        return 1052.63157589 * mass.value + 2105.26315789
+        return _evaluate(_temp_III, mass)
 
     @property
     def mass(self) -> u.Quantity:
@@ -201,8 +245,8 @@ modifier if applicable"""
     def radius(self) -> u.Quantity:
         """radius in AU"""
         # TODO: handle white dwarf luminosity class
-        return ((155000 * np.sqrt(self.luminosity.value)) /
-                self.temperature.value ** 2) * u.au
+        return _radius(np.array([self.luminosity.value]),
+                       np.array([self.temperature.value]))[0] * u.au
 
     @property
     def limits(self) -> model.bounds.QuantityBounds:
@@ -231,27 +275,122 @@ modifier if applicable"""
     @property
     def spectral_type(self):
         """spectral type from mass"""
-        d = {2: 'A5', 1.9: 'A6', 1.8: 'A7', 1.7: 'A9', 1.6: 'F0', 1.5: 'F2',
-             1.45: 'F3', 1.4: 'F4', 1.35: 'F5', 1.3: 'F6', 1.25: 'F7',
-             1.2: 'F8', 1.15: 'F9', 1.10: 'G0', 1.05: 'G1', 1: 'G2',
-             .95: 'G4', .9: 'G6', .85: 'G8', .8: 'K0', .75: 'K2', .7: 'K4',
-             .65: 'K5', .6: 'K6', .55: 'K8', .5: 'M0', .45: 'M1', .4: 'M2',
-             .35: 'M3', .3: 'M4', .25: 'M4', .2: 'M5', .15: 'M6', .1: 'M7'}
         return ('D' if self.luminosity_class == type(self).Luminosity.D
-                else d[list(filter(lambda x: x * u.M_sun >= self.mass,
-                                   sorted(d.keys())))
-                       [0]])
-
-    def populate(self):
-        self._worlds = []
-        worlds = populate_star(self)
-        for i in range(len(worlds)):
-            worlds[i].name = f"{self.name}{chr(ord('b') + i)}"
-            self._worlds.append(worlds[i])
-            if hasattr(worlds[i], '_moons'):
-                for j in range(len(worlds[i]._moons)):
-                    worlds[i]._moons[j].name = f"{self.name}{chr(ord('b') + i)}{int_to_roman(j + 1)}"
+                else self._spectral_types.lookup(self.mass))
+
+    def _name_worlds(self):
+        for i in range(len(self._worlds)):
+            self._worlds[i].name = f"{self.name}{chr(ord('b') + i)}"
+            # deferred moons are named on generation
+            if '_moons' in vars(self._worlds[i]):
+                for j in range(len(self._worlds[i]._moons)):
+                    self._worlds[i]._moons[j].name = f"{self.name}{chr(ord('b') + i)}{int_to_roman(j + 1)}"
+
+    def __getattr__(self, name):
+        """generates the star layout and worlds on first access"""
+        if name == '_layout' and '_entropy' in self.__dict__:
+            self.make_layout()
+            return self._layout
+        if name == '_worlds' and '_star_system' in self.__dict__:
+            self.populate()
+            return self._worlds
+        raise AttributeError(f"'{type(self).__name__}' object has no " +
+                             f"attribute '{name}'")
+
+    @property
+    def orbital_radii(self) -> u.Quantity:
+        """the radii of the star orbital layout in AU"""
+        return self._layout[0] * u.au
+
+    @property
+    def detail(self) -> Detail:
+        """the level of detail generated so far"""
+        if '_worlds' in vars(self):
+            pending = ['_generate_moons', '_details_pending']
+            bodies = [body for world in self._worlds
+                      for body in [world, *vars(world).get('_moons', [])]]
+            return (Detail.TYPES
+                    if any(attr in vars(body) for attr in pending
+                           for body in bodies)
+                    else Detail.FULL)
+        return Detail.LAYOUT if '_layout' in vars(self) else Detail.STARS
+
+    def make_layout(self):
+        """generates the star orbital layout from the star own substream"""
+        with RandomGenerator().substream(self._entropy, 0):
+            radii, fgg_idx = make_radii(self)
+        self._layout = (radii, fgg_idx)
+
+    def populate(self, detail=None):
+        """populates the star orbits from the star own substream down to
+the level of detail, the star system one by default"""
+        detail = max(Detail(detail or self._star_system._detail),
+                     Detail.TYPES)
+        with RandomGenerator().substream(self._entropy, 1):
+            self._worlds = populate_star(self, detail,
+                                         self._star_system.lazy,
+                                         self._layout)
+        self._name_worlds()
+
+    def refine(self, detail=Detail.FULL, deadline=None):
+        """generates what is left of the star down to the level of detail,
+stopping between worlds once deadline seconds have passed if given"""
+        detail = Detail(detail)
+        if detail >= Detail.LAYOUT and '_layout' not in vars(self):
+            self.make_layout()
+        if detail >= Detail.TYPES and '_worlds' not in vars(self):
+            self.populate(detail)
+        if detail >= Detail.FULL:
+            end = time.monotonic() + deadline if deadline is not None else None
+            for world in self._worlds:
+                if end is not None and time.monotonic() >= end:
+                    return
+                for body in [world, *getattr(world, '_moons', [])]:
+                    if hasattr(body, 'fill_details'):
+                        body.fill_details()
+
+    def update(self):
+        """regenerates the worlds invalidated by edits on the star or its
+star system since population, other worlds are left untouched"""
+        self._worlds = update_star(self)
+        self._name_worlds()
+
+    def reroll(self, scope='worlds', seed=None):
+        """regenerates the star worlds, their moons or their details from an
+independent stream seeded with seed, a random one if None"""
+        if scope not in ['worlds', 'moons', 'details']:
+            raise ValueError(f'unknown reroll scope {scope}, expected ' +
+                             "'worlds', 'moons' or 'details'")
+        entropy = (seed if seed is not None
+                   else np.random.SeedSequence().entropy)
+        if scope == 'worlds':
+            self._entropy = entropy
+            vars(self).pop('_layout', None)
+            self.populate()
+            return
+        for slot, world in enumerate(self._worlds):
+            with RandomGenerator().substream(entropy, slot):
+                if (scope == 'moons' and
+                    ('_moons' in vars(world) or
+                     '_generate_moons' in vars(world))):
+                    vars(world).pop('_generate_moons', None)
+                    world._moons = make_moons(world)
+                    for moon in world._moons:
+                        moon.fill_details()
+                    if not vars(world).get('_details_pending'):
+                        # the details rolled with the moons modifiers and
+                        # tidal effects are rolled again from the world own
+                        # substream, as if generated with the new moons
+                        with RandomGenerator().substream(world._entropy, 1):
+                            world.randomize(world._details)
+                elif scope == 'details':
+                    for body in [world, *getattr(world, '_moons', [])]:
+                        if hasattr(body, '_details'):
+                            vars(body).pop('_details_pending', None)
+                            body.randomize(body._details)
+        self._name_worlds()
 
     def __init__(self, star_system):
         self._star_system = star_system
+        self._entropy = RandomGenerator().draw_entropy()
         self.randomize()
@@ -4,10 +4,12 @@ from . import model
 from .random import RandomGenerator
 from .star import Star
 from .companion_star import CompanionStar
+from .detail import Detail
 
 from collections import namedtuple
 import random
 import enum
+import time
 
 from ordered_enum import ValueOrderedEnum
 from astropy import units as u
@@ -38,6 +40,11 @@ steps in Ga"""
         INTERMEDIATE_POPULATION_2 = (8 * u.Ga, .6 * u.Ga, .1 * u.Ga)
         EXTREME_POPULATION_2 = (10 * u.Ga, .6 * u.Ga, .1 * u.Ga)
 
+        def __reduce_ex__(self, protocol):
+            # members are pickled by name as their namedtuple values type
+            # is shadowed by the population property
+            return getattr, (type(self), self.name)
+
     def random_population(self):
         """sum of a 3d roll over Stellar Age Table populations categories"""
         self.population = RandomGenerator().choice(list(self.Population),
@@ -83,10 +90,9 @@ from Stellar Age Table"""
         """the system stars generation and arrangement procedure"""
         primary_star = Star(self)
 
-        if hasattr(self, '_stars'):
-            for i in range(len(self._stars)):
-                delattr(type(self), chr(ord('A') + i))
-
+        # the letters of the stars made before
+        for star in self.__dict__.get('_stars', []):
+            vars(self).pop(star.name, None)
         self._stars = [primary_star]
         if n > 1:
             secondary_star = CompanionStar(self, primary_star)
@@ -114,14 +120,57 @@ from Stellar Age Table"""
 
         for i in range(len(self._stars)):
             self._stars[i].name = chr(ord('A') + i)
-            setattr(type(self), chr(ord('A') + i),
-                    property(lambda self, i=i: self._stars[i]))
+            # the stars accessed by their letter
+            vars(self)[self._stars[i].name] = self._stars[i]
+
+        # populate stars orbits down to the level of detail unless deferred
+        # to first access
+        if not self.lazy:
+            for star in self._stars:
+                star.refine(self._detail)
+
+    @property
+    def detail(self) -> Detail:
+        """the level of detail generated so far"""
+        return min(star.detail for star in self._stars)
+
+    def refine(self, detail=Detail.FULL, deadline=None):
+        """generates what is left of the system down to the level of
+detail, or if deadline is given, level after level over every star in
+priority order (layouts, types then details) until deadline seconds have
+passed, what is left being generated on access. Stars and worlds draw from
+their own substreams so the system ends up identical either way"""
+        detail = Detail(detail)
+        self._detail = max(self._detail, detail)
+        if deadline is None:
+            for star in self._stars:
+                star.refine(detail)
+            return
+        end = time.monotonic() + deadline
+        for level in filter(lambda d: d <= detail, Detail):
+            for star in self._stars:
+                if time.monotonic() >= end:
+                    return
+                star.refine(level, end - time.monotonic())
+
+    @property
+    def _worlds(self):
+        """the worlds of every star in the system"""
+        return [world for star in self._stars for world in star._worlds]
 
-        # populate stars orbits
-        self._worlds = []
+    def update(self):
+        """regenerates the stars worlds invalidated by edits since
+population"""
         for star in self._stars:
-            star.populate()
-            self._worlds.extend(star._worlds)
+            star.update()
+
+    def reroll(self, star='A', scope='worlds', seed=None):
+        """regenerates the worlds, moons or details of a single star from
+an independent stream, leaving the rest of the system untouched"""
+        stars = list(filter(lambda s: s.name == star, self._stars))
+        if len(stars) == 0:
+            raise ValueError(f'no star {star} in the system')
+        stars[0].reroll(scope, seed)
 
     def random_stars(self):
         """the system randomization of stars"""
@@ -151,8 +200,11 @@ from Stellar Age Table"""
                              f'{self.Population}')
         self._set_bounded_property('population', value)
 
-    def __init__(self, open_cluster=False, garden_host=False):
+    def __init__(self, open_cluster=False, garden_host=False, lazy=False,
+                 detail=Detail.FULL):
         self.garden_host = garden_host
+        self.lazy = lazy
+        self._detail = Detail(detail)
         if open_cluster:
             self._stars_dist = [.162037037, .578703704, .259259259]
         else:
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+from astropy import units as u
+
+from .model import bounds
+
+
+class Table():
+    """a GURPS table compiled once into sorted thresholds and outcomes
+
+    a value maps to the outcome of the first threshold it is strictly below,
+    or at most equal to if inclusive, and to the default outcome beyond the
+    last threshold. Floor tables map a value to the outcome of the last
+    threshold it is greater or equal to instead, as categories are matched
+    over the World Climate Table, and to the default outcome below the first
+    threshold. nan values always map to the default outcome"""
+
+    def __init__(self, rows, default=None, inclusive=False, floor=False,
+                 unit=None):
+        keys = sorted(rows, key=lambda k: self._threshold(k, unit))
+        self.thresholds = np.array([self._threshold(k, unit) for k in keys])
+        self.default = default
+        # the default outcome sits last so that the -1 index of the values
+        # below floor tables and the index past the last threshold share it
+        self.outcomes = tuple(rows[k] for k in keys) + (default,)
+        self.inclusive = inclusive
+        self.floor = floor
+        self.unit = unit
+
+        self._keys = self.thresholds.tolist()
+        self._search = bisect_left if inclusive else bisect_right
+        if all(type(o) in (int, float) for o in self.outcomes):
+            self._outcomes = np.array(self.outcomes)
+        else:
+            self._outcomes = np.empty(len(self.outcomes), dtype=object)
+            self._outcomes[:] = self.outcomes
+
+    @staticmethod
+    def _threshold(key, unit):
+        """the float value of a threshold in the table unit"""
+        return float(key.to_value(unit) if isinstance(key, u.Quantity)
+                     else key)
+
+    def _values(self, value):
+        """the values in the table unit"""
+        if isinstance(value, u.Quantity):
+            return value.to_value(self.unit)
+        return value
+
+    def index(self, value):
+        """the index of the outcome of a value or of an array of values, the
+        default outcome is indexed by len(thresholds) or by -1 in floor
+        tables"""
+        value = self._values(value)
+        if np.ndim(value) == 0:
+            if value != value:
+                return -1 if self.floor else len(self._keys)
+            if self.floor:
+                return bisect_right(self._keys, value) - 1
+            return self._search(self._keys, value)
+
+        value = np.asarray(value, dtype=float)
+        if self.floor:
+            index = np.searchsorted(self.thresholds, value, side='right') - 1
+            return np.where(np.isnan(value), -1, index)
+        # nan values are sorted past the last threshold
+        return np.searchsorted(self.thresholds, value,
+                               side='left' if self.inclusive else 'right')
+
+    def lookup(self, value):
+        """the outcome of a value, or the array of outcomes of an array of
+        values"""
+        index = self.index(value)
+        if np.ndim(index) == 0:
+            return self.outcomes[index]
+        return self._outcomes[index]
+
+    def bounds(self, lower, upper) -> bounds.ValueBounds:
+        """the bounds of the outcomes reachable by values in the
+        [lower, upper] range"""
+        lower, upper = self.index(lower), self.index(upper)
+        reachable = list(self.outcomes[max(lower, 0):upper + 1])
+        if lower < 0 or upper < 0:
+            reachable.append(self.default)
+        return bounds.ValueBounds(min(reachable), max(reachable))
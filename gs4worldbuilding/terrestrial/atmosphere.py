@@ -1,13 +1,13 @@
 import enum
 from typing import Optional, List, Union
 
-import numpy as np
 from astropy import units as u
 from astropy.units import cds
 from ordered_enum import ValueOrderedEnum
 
 from .. import model
 from ..model.bounds import ValueBounds
+from ..tables import Table
 
 
 @enum.unique
@@ -22,6 +22,10 @@ class Pressure(u.Quantity, ValueOrderedEnum):
     SUPER_DENSE = 10 * cds.atm
 
 
+_PRESSURE_CATEGORIES = Table({p.to_value(cds.atm): p for p in Pressure},
+                             floor=True, unit=cds.atm)
+
+
 @enum.unique
 class Toxicity(ValueOrderedEnum):
     """class Toxicity Enum from Toxicity Rules categories"""
@@ -68,9 +72,7 @@ class Atmosphere(model.Model):
     def pressure_category(self) -> Optional[Pressure]:
         """atmospheric pressure implied by pressure match over
         Atmospheric Pressure Categories Table"""
-        categories = sorted(list(Pressure), key=lambda x: x.value)
-        return (list(filter(lambda x: self.pressure >= x, categories))[-1]
-                if not np.isnan(self.pressure) else None)
+        return _PRESSURE_CATEGORIES.lookup(self.pressure)
 
     @property
     def breathable(self):
@@ -2,7 +2,6 @@ from astropy import units as u
 
 from . import Atmosphere, Terrestrial, Toxicity
 from .. import model
-from ..random import RandomGenerator
 
 
 class LargeAmmonia(Terrestrial):
@@ -22,13 +21,9 @@ class LargeAmmonia(Terrestrial):
     _pressure_factor = 5
     _greenhouse_factor = .2
     _hydrographic_coverage_bounds = model.bounds.ValueBounds(.2, 1)
+    _hydrographic_roll = (2, 0)
     _absorption = .84
     _atmosphere = LargeAmmoniaAtmosphere
 
-    def random_hydrographic_coverage(self):
-        """roll of 2d capped at 10 and divided by 10"""
-        self.hydrographic_coverage = min(RandomGenerator()
-                                         .roll2d6(continuous=True) / 10, 1)
-
     def __init__(self, **kw):
         super().__init__(**kw)
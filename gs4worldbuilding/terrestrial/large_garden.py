@@ -26,13 +26,9 @@ class LargeGarden(Terrestrial):
     _pressure_factor = 5
     _greenhouse_factor = .16
     _hydrographic_coverage_bounds = model.bounds.ValueBounds(.7, 1)
+    _hydrographic_roll = (1, 6)
     _atmosphere = LargeGardenAtmosphere
 
-    def random_hydrographic_coverage(self):
-        """roll of 1d+6 maxed at 10 divided by 10"""
-        self.hydrographic_coverage = min(RandomGenerator()
-                                         .roll1d6(6, continuous=True), 10) / 10
-
     @property
     def absorption(self):
         """absorbtion from Temperature Factors Table fitted
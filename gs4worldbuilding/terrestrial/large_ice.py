@@ -2,7 +2,6 @@ from astropy import units as u
 
 from . import Atmosphere, Terrestrial, Toxicity
 from .. import model
-from ..random import RandomGenerator
 
 
 class LargeIce(Terrestrial):
@@ -21,14 +20,9 @@ class LargeIce(Terrestrial):
     _pressure_factor = 5
     _greenhouse_factor = .2
     _hydrographic_coverage_bounds = model.bounds.ValueBounds(0, .2)
+    _hydrographic_roll = (2, -10)
     _absorption = .86
     _atmosphere = LargeIceAtmosphere
 
-    def random_hydrographic_coverage(self):
-        """roll of 2d-10 minimum at 0 and divided by 10"""
-        self.hydrographic_coverage = max(RandomGenerator()
-                                         .roll2d6(-10, continuous=True) / 10,
-                                         0)
-
     def __init__(self, **kw):
         super().__init__(**kw)
@@ -3,6 +3,7 @@
 from .atmosphere import Toxicity, Pressure
 from .. import model
 from ..random import RandomGenerator
+from ..utils import class_factory
 
 import copy
 
@@ -16,6 +17,7 @@ class Marginal():
         return (self._base if hasattr(self, '_base') else None)
 
 
+@class_factory
 def chlorine_or_fluorine(atmosphere):
 
     class ChlorineOrFluorine(atmosphere, Marginal):
@@ -28,6 +30,7 @@ def chlorine_or_fluorine(atmosphere):
     return ChlorineOrFluorine
 
 
+@class_factory
 def high_carbon_dioxide(atmosphere):
 
     class HighCarbonDioxide(atmosphere, Marginal):
@@ -43,6 +46,7 @@ def high_carbon_dioxide(atmosphere):
     return HighCarbonDioxide
 
 
+@class_factory
 def high_oxygen(atmosphere):
 
     class HighOxygen(atmosphere, Marginal):
@@ -62,6 +66,7 @@ def high_oxygen(atmosphere):
     return HighOxygen
 
 
+@class_factory
 def inert_gases(atmosphere):
 
     class InertGases(atmosphere, Marginal):
@@ -70,6 +75,7 @@ def inert_gases(atmosphere):
     return InertGases
 
 
+@class_factory
 def low_oxygen(atmosphere):
 
     class LowOxygen(atmosphere, Marginal):
@@ -85,6 +91,7 @@ def low_oxygen(atmosphere):
     return LowOxygen
 
 
+@class_factory
 def nitrogen_compounds(atmosphere):
 
     class NitrogenCompounds(atmosphere, Marginal):
@@ -96,6 +103,7 @@ def nitrogen_compounds(atmosphere):
     return NitrogenCompounds
 
 
+@class_factory
 def sulfur_compounds(atmosphere):
 
     class SulfurCompounds(atmosphere, Marginal):
@@ -107,6 +115,7 @@ def sulfur_compounds(atmosphere):
     return SulfurCompounds
 
 
+@class_factory
 def organic_toxins(atmosphere):
 
     class OrganicToxins(atmosphere, Marginal):
@@ -118,6 +127,7 @@ def organic_toxins(atmosphere):
     return OrganicToxins
 
 
+@class_factory
 def pollutants(atmosphere):
 
     class Pollutants(atmosphere, Marginal):
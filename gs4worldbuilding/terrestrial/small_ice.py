@@ -27,13 +27,9 @@ class SmallIce(Terrestrial):
     _pressure_factor = 10
     _greenhouse_factor = .1
     _hydrographic_coverage_bounds = model.bounds.ValueBounds(.3, .8)
+    _hydrographic_roll = (1, 2)
     _absorption = .93
     _atmosphere = SmallIceAtmosphere
 
-    def random_hydrographic_coverage(self):
-        """roll of 1d+2 divided by 10"""
-        self.hydrographic_coverage = (RandomGenerator()
-                                      .roll1d6(2, continuous=True) / 10)
-
     def __init__(self, **kw):
         super().__init__(**kw)
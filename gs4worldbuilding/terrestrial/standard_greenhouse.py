@@ -2,7 +2,6 @@ from astropy import units as u
 
 from . import Atmosphere, Terrestrial, Toxicity
 from .. import model
-from ..random import RandomGenerator
 
 
 class StandardGreenhouse(Terrestrial):
@@ -26,13 +25,9 @@ class StandardGreenhouse(Terrestrial):
     _pressure_factor = 100
     _greenhouse_factor = 2.0
     _hydrographic_coverage_bounds = model.bounds.ValueBounds(0, .5)
+    _hydrographic_roll = (2, -7)
     _absorption = .77
     _atmosphere = StandardGreenhouseAtmosphere
 
-    def random_hydrographic_coverage(self):
-        """roll of 2d-7 minimum at 0 and divided by 10"""
-        self.hydrographic_coverage = max(RandomGenerator()
-                                         .roll2d6(-7, continuous=True) / 10, 0)
-
     def __init__(self, **kw):
         super().__init__(**kw)
@@ -28,13 +28,9 @@ class StandardOcean(Terrestrial):
     _pressure_factor = 1
     _greenhouse_factor = .16
     _hydrographic_coverage_bounds = model.bounds.ValueBounds(.5, 1)
+    _hydrographic_roll = (1, 4)
     _atmosphere = StandardOceanAtmosphere
 
-    def random_hydrographic_coverage(self):
-        """roll of 1d+4 divided by 10"""
-        self.hydrographic_coverage = (RandomGenerator()
-                                      .roll1d6(4, continuous=True) / 10)
-
     @property
     def absorption(self):
         """absorbtion from Temperature Factors Table fitted
@@ -4,6 +4,8 @@ from .. import World, Planet, InplacePlanet, gas_giant
 from ..model import RandomizableModel, bounds
 from ..units import d_earth, D_earth, G_earth
 from ..random import RandomGenerator
+from ..tables import Table
+from ..utils import class_factory
 from .marginal_atmosphere import Marginal
 from . import Atmosphere, Pressure
 
@@ -22,6 +24,13 @@ class Terrestrial(RandomizableModel, World, Planet, ABC):
                    'temperature', 'density', 'diameter', 'resource']
     _resource_bounds = bounds.ValueBounds(World.Resource.SCANT,
                                           World.Resource.RICH)
+    _resources = Table({3: World.Resource.SCANT,
+                        5: World.Resource.VERY_POOR,
+                        8: World.Resource.POOR,
+                        14: World.Resource.AVERAGE,
+                        17: World.Resource.ABUNDANT,
+                        19: World.Resource.VERY_ABUNDANT},
+                       default=World.Resource.RICH)
 
     class Size(tuple, OrderedEnum):
         """class Size Enum from Size Constraints Table"""
@@ -38,16 +47,16 @@ class Terrestrial(RandomizableModel, World, Planet, ABC):
 
     def random_resource(self):
         """sum of a 3d roll times over Resource Value Table"""
-        table = {3: World.Resource.SCANT,
-                 5: World.Resource.VERY_POOR,
-                 8: World.Resource.POOR,
-                 14: World.Resource.AVERAGE,
-                 17: World.Resource.ABUNDANT,
-                 19: World.Resource.VERY_ABUNDANT}
-        roll = RandomGenerator().roll3d6()
-        filtered = list(filter(lambda x: roll < x, table.keys()))
-        self.resource = (table[filtered[0]] if len(filtered) > 0 else
-                         World.Resource.RICH)
+        self.resource = self._resources.lookup(RandomGenerator().roll3d6())
+
+    def random_hydrographic_coverage(self):
+        """roll of the _hydrographic_roll number of d6 and modifier divided
+by 10 within [0, 1] for world types with liquid elements"""
+        if hasattr(self, '_hydrographic_roll'):
+            dice, modifier = self._hydrographic_roll
+            roll = getattr(RandomGenerator(), f'roll{dice}d6')(
+                modifier, continuous=True)
+            self.hydrographic_coverage = min(max(roll / 10, 0), 1)
 
     def random_density(self):
         """sum of a 3d6 roll over World Density Table"""
@@ -89,6 +98,9 @@ class Terrestrial(RandomizableModel, World, Planet, ABC):
 
     @property
     def atmosphere(self):
+        if self.__dict__.get('_details_pending'):
+            # marginal atmospheres are rolled with the pending details
+            self.fill_details()
         return (self._atmosphere if hasattr(self, '_atmosphere') else None)
 
     @property
@@ -220,13 +232,16 @@ the same type"""
         """the affinity score"""
         return self.resource + self.habitability
 
-    def randomize(self):
-        if (hasattr(type(self._atmosphere), 'randomize') and
+    def randomize(self, props=None):
+        """randomizes the atmosphere and applicable properties values,
+restricted to props if given"""
+        if ((props is None or 'atmosphere' in props) and
+            hasattr(type(self._atmosphere), 'randomize') and
             callable(getattr(type(self._atmosphere), 'randomize'))):
             self._atmosphere.randomize()
-        super().randomize()
+        super().randomize(props)
 
-    def __init__(self, orbit=None):
+    def __init__(self, orbit=None, randomize=True):
 
         self._orbit = orbit
         self._atmosphere = (self._atmosphere(self)
@@ -240,8 +255,10 @@ the same type"""
                                if issubclass(type(orbit._parent_body),
                                              Planet)
                                else place_terrestrial(type(self)))
-
-        self.randomize()
+            self._place()
+        elif randomize:
+            # or left to assign
+            self.randomize()
 
 
 class InplaceTerrestrial(Terrestrial, InplacePlanet):
@@ -250,6 +267,8 @@ class InplaceTerrestrial(Terrestrial, InplacePlanet):
                      (p != 'temperature' and p != 'resource')],
                    'rotation', 'resonant', 'retrograde', 'axial_tilt',
                    'volcanic_activity', 'tectonic_activity', 'resource']
+    _details = [*InplacePlanet._details, 'volcanic_activity',
+                'tectonic_activity', 'resource', 'atmosphere']
     _rotation_modifiers = {Terrestrial.Size.TINY: 18,
                            Terrestrial.Size.SMALL: 14,
                            Terrestrial.Size.STANDARD: 10,
@@ -271,70 +290,71 @@ class InplaceTerrestrial(Terrestrial, InplacePlanet):
         HEAVY = 'Heavy volcanic activity'
         EXTREME = 'Extreme volcanic activity'
 
+    _tectonic_activities = Table({7: TectonicActivity.NONE,
+                                  11: TectonicActivity.LIGHT,
+                                  15: TectonicActivity.MODERATE,
+                                  19: TectonicActivity.HEAVY},
+                                 default=TectonicActivity.EXTREME)
+    _volcanic_activities = Table({17: VolcanicActivity.NONE,
+                                  21: VolcanicActivity.LIGHT,
+                                  27: VolcanicActivity.MODERATE,
+                                  71: VolcanicActivity.HEAVY},
+                                 default=VolcanicActivity.EXTREME)
+    _resource_modifiers = {VolcanicActivity.NONE: -2,
+                           VolcanicActivity.LIGHT: -1,
+                           VolcanicActivity.MODERATE: 0,
+                           VolcanicActivity.HEAVY: 1,
+                           VolcanicActivity.EXTREME: 2}
+
     def random_resource(self):
         """sum of a 3d roll times over Resource Value Table with volcanism modifier"""
-        table = {3: World.Resource.SCANT,
-                 5: World.Resource.VERY_POOR,
-                 8: World.Resource.POOR,
-                 14: World.Resource.AVERAGE,
-                 17: World.Resource.ABUNDANT,
-                 19: World.Resource.VERY_ABUNDANT}
-        modifiers = {self.VolcanicActivity.NONE: -2,
-                     self.VolcanicActivity.LIGHT: -1,
-                     self.VolcanicActivity.MODERATE: 0,
-                     self.VolcanicActivity.HEAVY: 1,
-                     self.VolcanicActivity.EXTREME: 2}
-        roll = RandomGenerator().roll3d6(modifiers[self.volcanic_activity])
-        filtered = list(filter(lambda x: roll < x, table.keys()))
-        self.resource = (table[filtered[0]] if len(filtered) > 0 else
-                         World.Resource.RICH)
+        roll = RandomGenerator().roll3d6(
+            self._resource_modifiers[self.volcanic_activity])
+        self.resource = self._resources.lookup(roll)
 
-    def random_tectonic_activity(self) -> None:
-        table = {7: self.TectonicActivity.NONE,
-                 11: self.TectonicActivity.LIGHT,
-                 15: self.TectonicActivity.MODERATE,
-                 19: self.TectonicActivity.HEAVY}
-        filters = [(self.volcanic_activity ==
-                    self.VolcanicActivity.NONE, -8),
-                   (self.volcanic_activity ==
-                    self.VolcanicActivity.LIGHT, -4),
-                   (self.volcanic_activity ==
-                    self.VolcanicActivity.HEAVY, 4),
-                   (self.volcanic_activity ==
-                    self.VolcanicActivity.EXTREME, 8),
-                   (self.hydrographic_coverage == 0, -4),
-                   (self.hydrographic_coverage > 0 and
-                    self.hydrographic_coverage < .5, -2),
-                   (hasattr(self, '_moons') and len(self._moons) == 1, 2),
-                   (hasattr(self, '_moons') and len(self._moons) > 1, 4)]
-        roll = RandomGenerator().roll3d6(sum(value if truth else 0 for
-                                         truth, value in filters))
-        filtered = list(filter(lambda x: roll < x, table.keys()))
-        self.tectonic_activity = ((table[filtered[0]] if
-                                   len(filtered) > 0 else
-                                   type(self).TectonicActivity.EXTREME) if
-                                  self.size > type(self).Size.SMALL else
-                                  type(self).TectonicActivity.NONE)
+    def _tectonic_activity_modifier(self) -> int:
+        """the tectonic activity roll modifier"""
+        modifiers = [(self.volcanic_activity ==
+                      self.VolcanicActivity.NONE, -8),
+                     (self.volcanic_activity ==
+                      self.VolcanicActivity.LIGHT, -4),
+                     (self.volcanic_activity ==
+                      self.VolcanicActivity.HEAVY, 4),
+                     (self.volcanic_activity ==
+                      self.VolcanicActivity.EXTREME, 8),
+                     (self.hydrographic_coverage == 0, -4),
+                     (self.hydrographic_coverage > 0 and
+                      self.hydrographic_coverage < .5, -2),
+                     (hasattr(self, '_moons') and len(self._moons) == 1, 2),
+                     (hasattr(self, '_moons') and len(self._moons) > 1, 4)]
+        return sum(value if truth else 0 for truth, value in modifiers)
 
-    def random_volcanic_activity(self) -> None:
-        table = {17: self.VolcanicActivity.NONE,
-                 21: self.VolcanicActivity.LIGHT,
-                 27: self.VolcanicActivity.MODERATE,
-                 71: self.VolcanicActivity.HEAVY}
+    def _volcanic_activity_modifier(self) -> int:
+        """the volcanic activity roll modifier"""
         age = (self._orbit._parent_body._star_system.age
                if not issubclass(type(self._orbit._parent_body), Planet)
                else self._orbit._parent_body._orbit._parent_body._star_system.age)
-        modifier = round((self.gravity.value / age.value) * 40)
         modifiers = [(hasattr(self, '_moons') and len(self._moons) == 1, 5),
                      (hasattr(self, '_moons') and len(self._moons) > 1, 10),
                      (self._designation == 'Tiny (Sulfur)', 60),
                      (issubclass(type(self._orbit._parent_body),
                                  gas_giant.GasGiant), 5)]
-        roll = RandomGenerator().roll3d6(modifier + sum(value if truth else 0
-                                         for truth, value in modifiers))
-        filtered = list(filter(lambda x: roll < x, table.keys()))
-        self.volcanic_activity = (table[filtered[0]] if len(filtered) > 0
-                                  else type(self).VolcanicActivity.EXTREME)
+        if not age.value:
+            # the gravity over age term is unbounded for a newborn system,
+            # any roll is past the volcanic activities table
+            return int(self._volcanic_activities.thresholds[-1])
+        return (round((self.gravity.value / age.value) * 40) +
+                sum(value if truth else 0 for truth, value in modifiers))
+
+    def random_tectonic_activity(self) -> None:
+        roll = RandomGenerator().roll3d6(self._tectonic_activity_modifier())
+        self.tectonic_activity = (self._tectonic_activities.lookup(roll) if
+                                  self.size > type(self).Size.SMALL else
+                                  type(self).TectonicActivity.NONE)
+
+    def random_volcanic_activity(self) -> None:
+        roll = RandomGenerator().roll3d6(self._volcanic_activity_modifier())
+        self.volcanic_activity = self._volcanic_activities.lookup(roll)
 
     @property
     def blackbody_temperature(self) -> u.Quantity:
@@ -356,12 +376,7 @@ class InplaceTerrestrial(Terrestrial, InplacePlanet):
 
     @property
     def resource_bounds(self) -> bounds.ValueBounds:
-        modifiers = {self.VolcanicActivity.NONE: -2,
-                     self.VolcanicActivity.LIGHT: -1,
-                     self.VolcanicActivity.MODERATE: 0,
-                     self.VolcanicActivity.HEAVY: 1,
-                     self.VolcanicActivity.EXTREME: 2}
-        modifier = modifiers[self.volcanic_activity]
+        modifier = self._resource_modifiers[self.volcanic_activity]
 
         value_bounds = Terrestrial.resource_bounds.fget(self)
         return bounds.ValueBounds(value_bounds.lower + modifier,
@@ -385,34 +400,8 @@ class InplaceTerrestrial(Terrestrial, InplacePlanet):
     @property
     def tectonic_activity_bounds(self) -> bounds.ValueBounds:
         """tectonic activity range"""
-        table = {7: self.TectonicActivity.NONE,
-                 11: self.TectonicActivity.LIGHT,
-                 15: self.TectonicActivity.MODERATE,
-                 19: self.TectonicActivity.HEAVY}
-        modifiers = [(self.volcanic_activity ==
-                      self.VolcanicActivity.NONE, -8),
-                     (self.volcanic_activity ==
-                      self.VolcanicActivity.LIGHT, -4),
-                     (self.volcanic_activity ==
-                      self.VolcanicActivity.HEAVY, 4),
-                     (self.volcanic_activity ==
-                      self.VolcanicActivity.EXTREME, 8),
-                     (self.hydrographic_coverage == 0, -4),
-                     (self.hydrographic_coverage > 0 and
-                      self.hydrographic_coverage < .5, -2),
-                     (hasattr(self, '_moons') and
-                      len(self._moons) == 1, 2),
-                     (hasattr(self, '_moons') and len(self._moons) > 1, 4)]
-        min_roll = sum(value if truth else 0 for
-                       truth, value in modifiers) + 3
-        filtered = list(filter(lambda x: min_roll < x, table.keys()))
-        min = (table[filtered[0]] if len(filtered) > 0
-               else type(self).TectonicActivity.EXTREME)
-        max_roll = min_roll + 15
-        filtered = list(filter(lambda x: max_roll < x, table.keys()))
-        max = (table[filtered[0]] if len(filtered) > 0
-               else type(self).TectonicActivity.EXTREME)
-        return (bounds.ValueBounds(min, max) if
+        min_roll = self._tectonic_activity_modifier() + 3
+        return (self._tectonic_activities.bounds(min_roll, min_roll + 15) if
                 self.size > type(self).Size.SMALL else
                 bounds.ValueBounds(self.TectonicActivity.NONE,
                                    self.TectonicActivity.NONE))
@@ -432,30 +421,8 @@ class InplaceTerrestrial(Terrestrial, InplacePlanet):
     @property
     def volcanic_activity_bounds(self) -> bounds.ValueBounds:
         """volcanic activity range"""
-        table = {17: self.VolcanicActivity.NONE,
-                 21: self.VolcanicActivity.LIGHT,
-                 27: self.VolcanicActivity.MODERATE,
-                 71: self.VolcanicActivity.HEAVY}
-        age = (self._orbit._parent_body._star_system.age if
-               not issubclass(type(self._orbit._parent_body), Planet) else
-               self._orbit._parent_body._orbit._parent_body._star_system.age)
-        min_roll = round((self.gravity.value / age.value) * 40) + 3
-        modifiers = [(hasattr(self, '_moons') and
-                      len(self._moons) == 1, 5),
-                     (hasattr(self, '_moons') and
-                      len(self._moons) > 1, 10),
-                     (self._designation == 'Tiny (Sulfur)', 60),
-                     (issubclass(type(self._orbit._parent_body),
-                                 gas_giant.GasGiant), 5)]
-        min_roll += sum(value if truth else 0 for truth, value in modifiers)
-        filtered = list(filter(lambda x: min_roll < x, table.keys()))
-        min = (table[filtered[0]] if len(filtered) > 0
-               else type(self).VolcanicActivity.EXTREME)
-        max_roll = min_roll + 15
-        filtered = list(filter(lambda x: max_roll < x, table.keys()))
-        max = (table[filtered[0]] if len(filtered) > 0
-               else type(self).VolcanicActivity.EXTREME)
-        return bounds.ValueBounds(min, max)
+        min_roll = self._volcanic_activity_modifier() + 3
+        return self._volcanic_activities.bounds(min_roll, min_roll + 15)
 
     @volcanic_activity.setter
     def volcanic_activity(self, value):
@@ -465,6 +432,7 @@ class InplaceTerrestrial(Terrestrial, InplacePlanet):
         self._set_bounded_property('volcanic_activity', value)
 
 
+@class_factory
 def place_terrestrial(world):
 
     class ConcreteInplaceTerrestrial(world, InplaceTerrestrial):
@@ -473,6 +441,7 @@ def place_terrestrial(world):
     return ConcreteInplaceTerrestrial
 
 
+@class_factory
 def place_satellite(world):
 
     class Satellite(world, InplaceTerrestrial):
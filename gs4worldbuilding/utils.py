@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import functools
+
+
+def int_to_roman(input):
+    """Convert an integer to a Roman numeral. """
+
+    if not isinstance(input, type(1)):
+        raise TypeError("expected integer, got %s" % type(input))
+    if not 0 < input < 4000:
+        raise ValueError("Argument must be between 1 and 3999")
+    ints = (1000, 900,  500, 400, 100,  90, 50,  40, 10,  9,   5,  4,   1)
+    nums = ('M', 'CM', 'D', 'CD', 'C', 'XC', 'L', 'XL', 'X', 'IX', 'V', 'IV', 'I')
+    result = []
+    for i in range(len(ints)):
+        count = int(input / ints[i])
+        result.append(nums[i] * count)
+        input -= ints[i] * count
+    return ''.join(result)
+
+
+def _instantiate(factory, base):
+    """an empty instance of the class derived by factory from base"""
+    cls = factory(base)
+    return cls.__new__(cls)
+
+
+def class_factory(factory):
+    """memoizes a factory deriving a class from a base class, deriving each
+    class once, and makes the instances of the derived classes picklable as
+    the classes are rebuilt from the factory and base on load"""
+    classes = {}
+
+    @functools.wraps(factory)
+    def derive(base):
+        if base not in classes:
+            cls = factory(base)
+            cls.__reduce__ = lambda self: (_instantiate, (derive, base),
+                                           self.__dict__)
+            # the base of the instances reset by model.pool
+            cls._factory_base = base
+            classes[base] = cls
+        return classes[base]
+
+    return derive
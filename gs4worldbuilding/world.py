@@ -6,6 +6,7 @@ from astropy import units as u
 
 from .random import RandomGenerator
 from .model import bounds
+from .tables import Table
 
 
 class World(ABC):
@@ -41,6 +42,9 @@ class World(ABC):
         VERY_RICH = 4
         MOTHERLODE = 5
 
+    _climates = Table({c.to_value(u.K): c for c in Climate}, floor=True,
+                      unit=u.K)
+
     @abstractmethod
     def random_resource(self) -> None:
         pass
@@ -107,7 +111,7 @@ class World(ABC):
     @property
     def climate(self) -> Climate:
         """climate implied by temperature match over World Climate Table"""
-        return list(filter(lambda x: self.temperature >= x, self.Climate))[-1]
+        return World._climates.lookup(self.temperature)
 
     @property
     @abstractmethod
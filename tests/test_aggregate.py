@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+import numpy as np
+
+from gs4worldbuilding import Builder, batch
+
+
+@pytest.fixture(scope='module')
+def values():
+    values = np.random.default_rng(1).gamma(2, 3, 20000) - 2
+    values[::97] = np.nan
+    return values
+
+
+def test_moments(values):
+    parts = np.array_split(values, 13)
+    moments = batch.merge_tree([batch.Moments().update(p) for p in parts])
+    expected = values[~np.isnan(values)]
+    deviations = expected - expected.mean()
+    assert moments.count == len(expected)
+    assert moments.mean == pytest.approx(expected.mean())
+    assert moments.variance == pytest.approx(expected.var())
+    assert moments.skewness == pytest.approx(
+        np.mean(deviations ** 3) / expected.std() ** 3)
+    assert moments.kurtosis == pytest.approx(
+        np.mean(deviations ** 4) / expected.var() ** 2 - 3)
+
+
+def test_quantiles(values):
+    parts = np.array_split(values, 13)
+    quantiles = batch.merge_tree([batch.Quantiles(.01).update(p)
+                                  for p in parts])
+    expected = values[~np.isnan(values)]
+    for q in (0, .1, .5, .9, 1):
+        assert quantiles.quantile(q) == pytest.approx(
+            np.quantile(expected, q), rel=.02, abs=.05)
+
+
+def test_merge_tree(values):
+    # the merge only depends on the order of the list of aggregates
+    parts = np.array_split(values, 7)
+    merged = [pickle.dumps(batch.merge_tree(
+        [batch.Moments().update(p) for p in parts]).__dict__)
+        for _ in range(2)]
+    assert merged[0] == merged[1]
+    histograms = [batch.Histogram([0, 1, 5, 10]).update(p) for p in parts]
+    histogram = batch.merge_tree(histograms)
+    assert histogram.total == np.sum(~np.isnan(values))
+    assert histogram.underflow == np.sum(values < 0)
+    with pytest.raises(ValueError):
+        batch.Histogram([0, 1]).merge(batch.Histogram([0, 2]))
+    # the last edge falls in the last bin, only the values above it overflow
+    histogram = batch.Histogram([0, 1, 5, 10]).update([10., 10.5])
+    assert list(histogram.counts) == [0, 0, 1] and histogram.overflow == 1
+    counts = batch.merge_tree([batch.Counts('abc').update([0, 2, -1]),
+                               batch.Counts('abc').update([2])])
+    assert (counts['a'], counts['b'], counts['c']) == (1, 0, 2)
+
+
+def test_build_statistics():
+    seeds = [42, 7, 3, 11]
+    statistics = Builder.build_statistics(seeds, workers=2, chunksize=1,
+                                          detail='types')
+    records = batch.records([Builder.build_star_system(seed, detail='types')
+                             for seed in seeds], seeds)
+    planets = records.worlds['parent'] < 0
+    assert statistics.systems == len(seeds)
+    assert statistics.world_types.total == np.sum(
+        records.worlds['type'][planets] >= 0)
+    assert statistics.star_mass.total == len(records.stars)
+    assert statistics.temperature.mean == pytest.approx(
+        np.nanmean(records.worlds['temperature']))
+    # workers send back kilobytes
+    assert len(pickle.dumps(statistics)) < 20000
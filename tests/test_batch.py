@@ -0,0 +1,497 @@
+from multiprocessing import shared_memory
+import os
+
+import pytest
+import numpy as np
+
+from astropy import units as u
+
+from gs4worldbuilding import Builder, Star, Terrestrial, terrestrial, builder
+from gs4worldbuilding.terrestrial import Atmosphere
+from gs4worldbuilding.terrestrial.marginal_atmosphere import Marginal
+from gs4worldbuilding.units import D_earth, d_earth
+from gs4worldbuilding.gas_giant import GasGiant
+from gs4worldbuilding.world import World
+from gs4worldbuilding.asteroid_belt import AsteroidBelt
+from gs4worldbuilding.random import RandomGenerator
+from gs4worldbuilding.populate_star import (make_radii, make_limits,
+                                            make_moons, make_gas_giant)
+from gs4worldbuilding import batch
+from gs4worldbuilding.batch import (stellar_properties, LUMINOSITY_CLASSES,
+                                    orbital_layouts, GAS_GIANT_ARRANGEMENTS,
+                                    moon_systems, materialize_moons, SIZES,
+                                    terrestrial_properties,
+                                    gas_giant_properties, GAS_GIANT_TYPES,
+                                    star_systems, star_layouts, SEPARATIONS)
+
+
+@pytest.fixture(scope='module')
+def stars():
+    # returns (star, age) pairs over generated systems and seed mass grids
+    stars = []
+    for seed in range(1, 60):
+        system = Builder.build_star_system(seed, detail='stars')
+        stars.extend((star, system.age) for star in system._stars)
+    return stars
+
+
+def assert_matches(stars, properties):
+    result = stellar_properties([star.seed_mass.value for star, _ in stars],
+                                [age.value for _, age in stars])
+    for name, scalar in properties.items():
+        expected = [scalar(star) for star, _ in stars]
+        values = getattr(result[name], 'value', result[name])
+        np.testing.assert_array_equal(values, expected, err_msg=name)
+
+
+properties = {
+    'mass': lambda s: s.mass.value,
+    'luminosity_class': lambda s: LUMINOSITY_CLASSES.index(s.luminosity_class),
+    'luminosity': lambda s: s.luminosity.value,
+    'temperature': lambda s: s.temperature.value,
+    'radius': lambda s: s.radius.value,
+    'inner_limit': lambda s: s.limits.lower.value,
+    'outer_limit': lambda s: s.limits.upper.value,
+    'snow_line': lambda s: s.snow_line.value,
+    'spectral_type': lambda s: s.spectral_type
+}
+
+
+def test_stellar_properties_generated(stars):
+    assert_matches(stars, properties)
+
+
+@pytest.mark.parametrize('seed', [3, 7, 42])
+def test_stellar_properties_grid(seed):
+    system = Builder.build_star_system(seed, detail='stars')
+    expected, masses = {name: [] for name in properties}, []
+    for mass in np.linspace(.1, 2, 96):
+        system.A.seed_mass = mass * u.M_sun
+        # bounded values are stored normalized
+        masses.append(system.A.seed_mass.value)
+        for name, scalar in properties.items():
+            expected[name].append(scalar(system.A))
+    result = stellar_properties(masses, system.age)
+    for name in properties:
+        values = getattr(result[name], 'value', result[name])
+        np.testing.assert_array_equal(values, expected[name], err_msg=name)
+
+
+def test_stellar_properties_broadcast():
+    result = stellar_properties(np.full((2, 3), 1.) * u.M_sun, 4.6 * u.Ga)
+    assert result['luminosity'].shape == (2, 3)
+    assert (result['spectral_type'] == 'G2').all()
+
+
+def repeated_layouts(star, n):
+    forbidden_zone = star.forbidden_zone
+    return orbital_layouts(
+        np.full(n, GAS_GIANT_ARRANGEMENTS.index(star.gas_giant_arrangement)),
+        star.snow_line.value, star.limits.lower.value,
+        star.limits.upper.value,
+        *((forbidden_zone.lower.value, forbidden_zone.upper.value)
+          if forbidden_zone else ()))
+
+
+@pytest.mark.parametrize('arrangement', list(Star.GasGiantArrangement))
+def test_orbital_layouts(arrangement):
+    system = Builder.build_star_system(7, detail='stars')
+    system.A.gas_giant_arrangement = arrangement
+    layouts = repeated_layouts(system.A, 1000)
+    limits = make_limits(system.A)
+    assert len(layouts.offsets) == 1001
+    for i in range(1000):
+        radii = layouts.radii[layouts.offsets[i]:layouts.offsets[i + 1]]
+        fgg = layouts.first_gas_giant[i]
+        # orbits are spaced by the spacing ratios or .15 AU inward
+        assert ((radii[1:] / radii[:-1] >= 1.4 - 1e-9) |
+                (np.diff(radii) >= .15 - 1e-9)).all()
+        inner = np.delete(radii, fgg) if fgg >= 0 else radii
+        assert ((inner >= limits.lower.value) &
+                (inner <= limits.upper.value)).all()
+        assert fgg == -1 if arrangement == Star.GasGiantArrangement.NONE \
+            else fgg >= 0
+
+    # same statistics as the scalar procedure
+    scalar = [make_radii(system.A) for _ in range(200)]
+    counts = np.diff(layouts.offsets)
+    assert abs(np.mean([len(r) for r, _ in scalar]) - counts.mean()) < .5
+    outermost = layouts.radii[layouts.offsets[1:] - 1]
+    assert (abs(np.mean([r[-1] for r, _ in scalar]) - outermost.mean()) <
+            .1 * outermost.mean())
+
+
+def test_moon_systems():
+    system = Builder.build_star_system(42)
+    gas_giant = next(w for star in system._stars for w in star._worlds
+                     if isinstance(w, GasGiant))
+    moons = moon_systems(np.full(10000, True), 0,
+                         gas_giant.orbit.radius.value,
+                         gas_giant.diameter.to(u.au).value)
+    assert (np.diff(moons.offsets) == moons.n_moons).all()
+    for i in range(100):
+        radii = moons.radii[moons.offsets[i]:moons.offsets[i + 1]]
+        assert (np.diff(radii) >= 0).all()
+
+    # same statistics as the scalar procedure
+    scalar = []
+    for _ in range(100):
+        scalar.append((len(make_moons(gas_giant)), gas_giant._n_moonlets,
+                       gas_giant._n_captured))
+    expected = np.mean(scalar, axis=0)
+    assert abs(expected[0] - moons.n_moons.mean()) < .5
+    assert abs(expected[1] - moons.n_moonlets.mean()) < .5
+    assert abs(expected[2] - moons.n_captured.mean()) < .5
+
+    materialized = materialize_moons(gas_giant, moons, 0)
+    assert len(materialized) == moons.n_moons[0]
+    assert gas_giant._n_captured == moons.n_captured[0]
+    assert [SIZES.index(moon.size) for moon in materialized] == \
+        list(moons.sizes[:moons.offsets[1]])
+
+
+def test_moon_systems_terrestrial():
+    # terrestrials moonlets are rolled only without major moons
+    moons = moon_systems(False, [0, 1, 2, 3] * 2500, 2., 1e-4)
+    assert (moons.n_moonlets[moons.n_moons > 0] == 0).all()
+    assert (moons.n_captured == 0).all()
+    # larger terrestrials have more moons
+    counts = [moons.n_moons[i::4].mean() for i in range(4)]
+    assert counts == sorted(counts)
+    assert (moons.radii > 0).all()
+
+
+@pytest.mark.parametrize('world_type', [terrestrial.StandardGarden,
+                                        terrestrial.LargeOcean,
+                                        terrestrial.StandardIce,
+                                        terrestrial.SmallHadean])
+def test_terrestrial_properties(world_type):
+    worlds = [world_type() for _ in range(200)]
+    blackbody_temperature = [w.blackbody_temperature.value for w in worlds]
+    result = terrestrial_properties(world_type, blackbody_temperature)
+
+    lower, upper = world_type._core.value
+    assert ((result['density'] >= lower) &
+            (result['density'] <= upper)).all()
+    scale = np.sqrt(blackbody_temperature / result['density'].value)
+    diameter = result['diameter'].to(D_earth).value
+    assert ((diameter >= scale * world_type._size[0] - 1e-9) &
+            (diameter <= scale * world_type._size[1] + 1e-9)).all()
+    np.testing.assert_allclose(result['gravity'].value,
+                               result['density'].value * diameter)
+
+    # same statistics as the scalar randomization
+    for name, tolerance in [('density', .05), ('diameter', .05),
+                            ('hydrographic_coverage', .05),
+                            ('volatile_mass', .1), ('temperature', 10)]:
+        expected = np.mean([getattr(getattr(w, name), 'value',
+                                    getattr(w, name)) for w in worlds])
+        value = np.mean(getattr(result[name], 'value', result[name]))
+        if np.isnan(expected):
+            assert np.isnan(value)
+        else:
+            assert abs(value - expected) < tolerance, name
+
+
+def test_terrestrial_properties_type():
+    with pytest.raises(ValueError):
+        terrestrial_properties(Star, [100])
+    with pytest.raises(ValueError):
+        terrestrial_properties(terrestrial.StandardGarden)
+
+
+def test_build_worlds():
+    RandomGenerator().seed = 42
+    worlds = Builder.build_worlds(300)
+    RandomGenerator().seed = 42
+    columns = Builder.build_worlds(300, columns=True)
+    # the types are drawn at once before the worlds are generated
+    assert [batch.WORLD_TYPES[code] for code in columns['type']] == [
+        type(world) for world in worlds]
+    assert isinstance(Builder.build_world(), World)
+    # the types are drawn as by a choice over the distribution
+    RandomGenerator().seed = 42
+    codes = builder._world_types(300)
+    RandomGenerator().seed = 42
+    assert (codes == RandomGenerator().rng.choice(
+        len(builder._WORLD_TYPES), size=300,
+        p=list(builder._WORLD_DIST.values()))).all()
+    # the worlds are built from the columns with atmospheres of their own
+    world = terrestrial.StandardGarden(randomize=False)
+    assert np.isnan(world.density) and world.atmosphere._world is world
+    world.assign({'density': 1 * d_earth, 'temperature': 300 * u.K})
+    assert world.density == 1 * d_earth and world.temperature == 300 * u.K
+    assert all(world.atmosphere._world is world for world in worlds
+               if getattr(world, 'atmosphere', None) is not None)
+    assert any(isinstance(world.atmosphere, Marginal) for world in worlds
+               if getattr(world, 'atmosphere', None) is not None)
+
+    for world_type in set(map(type, worlds)):
+        rows = columns['type'] == batch.WORLD_TYPES.index(world_type)
+        lower, upper = world_type._temperature_bounds
+        assert ((columns['temperature'][rows] >= lower) &
+                (columns['temperature'][rows] <= upper)).all()
+        assert (np.isnan(columns['density'][rows]).all() ==
+                issubclass(world_type, AsteroidBelt))
+    np.testing.assert_allclose(
+        columns['gravity'].value,
+        columns['density'].value * columns['diameter'].value)
+    # same statistics as the worlds
+    for name, tolerance in [('temperature', 10), ('density', .05)]:
+        expected = np.nanmean([getattr(world, name).value
+                               if getattr(world, name, None) is not None
+                               else np.nan for world in worlds])
+        assert abs(np.nanmean(columns[name].value) - expected) < tolerance
+
+
+@pytest.mark.parametrize('snow_lines', [.8, 2])
+def test_gas_giant_properties(snow_lines):
+    system = Builder.build_star_system(42, detail='stars')
+    system.A.gas_giant_arrangement = Star.GasGiantArrangement.ECCENTRIC
+    radius = system.A.snow_line.value * snow_lines
+    gas_giants = [make_gas_giant(system.A, radius, deferred=True)
+                  for _ in range(200)]
+    result = gas_giant_properties(np.full(10000, radius),
+                                  system.A.snow_line.value, eccentric=True)
+
+    for code, gas_giant_type in enumerate(GAS_GIANT_TYPES):
+        mass = result['mass'][result['size'] == code]
+        assert ((mass >= gas_giant_type._mass_bounds.lower) &
+                (mass <= gas_giant_type._mass_bounds.upper)).all()
+    np.testing.assert_allclose(
+        result['diameter'].value,
+        np.power(result['mass'].value / result['density'].value, 1 / 3))
+
+    # same statistics as the scalar generation
+    counts = np.bincount([GAS_GIANT_TYPES.index(type(g)) for g in gas_giants],
+                         minlength=3) / 200
+    np.testing.assert_allclose(np.bincount(result['size'], minlength=3) / 1e4,
+                               counts, atol=.1)
+    assert abs(np.mean([g.orbit.eccentricity for g in gas_giants]) -
+               result['eccentricity'].mean()) < .05
+
+
+def test_star_systems():
+    batch = star_systems(5000)
+    stars = batch.stars
+    assert (np.diff(batch.offsets) == batch.systems['n_stars']).all()
+    primary = stars['parent'] == -1
+    assert (np.flatnonzero(primary) == batch.offsets[:-1]).all()
+    companions = np.flatnonzero(~primary)
+    parents = stars['parent'][companions]
+    assert (parents < companions).all()
+    assert (stars['system'][parents] == stars['system'][companions]).all()
+    assert (stars['seed_mass'][companions] <=
+            stars['mass'][parents] + 1e-9 * u.M_sun).all()
+    # sub-companions orbit distant companions only
+    sub = companions[parents != batch.offsets[stars['system'][companions]]]
+    assert (stars['separation'][stars['parent'][sub]] ==
+            len(SEPARATIONS) - 1).all()
+    assert (stars['forbidden_lower'] < stars['forbidden_upper'])[
+        batch.systems['n_stars'][stars['system']] > 1].all()
+
+    layouts = star_layouts(stars)
+    assert len(layouts.offsets) == len(stars['system']) + 1
+
+    # same statistics as the scalar generation
+    systems = [Builder.build_star_system(seed, detail='stars')
+               for seed in range(1, 101)]
+    assert abs(np.mean([len(s._stars) for s in systems]) -
+               batch.systems['n_stars'].mean()) < .2
+    assert abs(np.mean([s._stars[0].seed_mass.value for s in systems]) -
+               stars['seed_mass'][primary].value.mean()) < .1
+
+
+def classify(worlds, inplace=True):
+    atmospheres = [w.atmosphere for w in worlds]
+    climates = batch.climate([w.temperature.value for w in worlds])
+    pressures = batch.pressure_category([a.pressure.value if a else np.nan
+                                         for a in atmospheres])
+    categories = [batch.PRESSURES.index(a.pressure_category)
+                  if a and a.pressure_category is not None else -1
+                  for a in atmospheres]
+    activities = ([[batch.VOLCANIC_ACTIVITIES.index(w.volcanic_activity)
+                    for w in worlds],
+                   [batch.TECTONIC_ACTIVITIES.index(w.tectonic_activity)
+                    for w in worlds]] if inplace else [])
+    habitability = batch.habitability(
+        [w.hydrographic_coverage for w in worlds],
+        [a is not None for a in atmospheres],
+        [bool(a and a.breathable) for a in atmospheres],
+        [bool(a and a.corrosive) for a in atmospheres],
+        [isinstance(a, Marginal) for a in atmospheres],
+        categories, climates, *activities)
+    return climates, pressures, habitability
+
+
+@pytest.mark.parametrize('inplace', [True, False])
+def test_classifiers(inplace):
+    if inplace:
+        system = Builder.build_star_system(42)
+        worlds = [w for w in system._worlds if isinstance(w, Terrestrial)]
+        worlds += [m for w in system._worlds for m in getattr(w, '_moons', [])]
+    else:
+        worlds = [terrestrial.StandardGarden() for _ in range(50)]
+    climates, pressures, habitability = classify(worlds, inplace)
+    assert [batch.CLIMATES[c] for c in climates] == \
+        [w.climate for w in worlds]
+    assert [batch.PRESSURES[c] if c >= 0 else None for c in pressures] == \
+        [Atmosphere.pressure_category.fget(w.atmosphere)
+         if w.atmosphere else None for w in worlds]
+    assert list(habitability) == [w.habitability for w in worlds]
+    assert list(batch.affinity([w.resource for w in worlds],
+                               habitability)) == [w.affinity for w in worlds]
+
+
+def test_classifiers_nan():
+    assert list(batch.climate([np.nan, 0, 250, 1000])) == [-1, 0, 1, 10]
+    assert list(batch.pressure_category([np.nan, 0, 1])) == [-1, 0, 3]
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return Builder.build_catalog(2000, seed=7)
+
+
+def test_catalog_links(catalog):
+    stars, orbits, worlds, moons = (catalog.stars, catalog.orbits,
+                                    catalog.worlds, catalog.moons)
+    for table, parent, key in [(stars, 'system', 'stars'),
+                               (orbits, 'star', 'orbits'),
+                               (worlds, 'star', 'worlds'),
+                               (moons, 'world', 'moons')]:
+        offsets = catalog.offsets[key]
+        assert np.all(np.diff(table[parent]) >= 0)
+        assert list(np.repeat(np.arange(len(offsets) - 1),
+                              np.diff(offsets))) == list(table[parent])
+    occupied = orbits['world'] >= 0
+    assert list(orbits['world'][occupied]) == list(range(len(worlds['type'])))
+    assert list(worlds['orbit']) == list(np.flatnonzero(occupied))
+    assert np.all(orbits['radius'][worlds['orbit']] ==
+                  worlds['orbital_radius'])
+    assert list(np.bincount(moons['world'], minlength=len(worlds['type']))) \
+        == list(worlds['n_moons'])
+
+
+def test_catalog_types(catalog):
+    worlds, moons = catalog.worlds, catalog.moons
+    types = [batch.WORLD_TYPES[c] for c in worlds['type'] if c >= 0]
+    gas_giant = np.array([issubclass(t, GasGiant) for t in types])
+    terrestrials = np.array([issubclass(t, Terrestrial) for t in types])
+    assert np.all(np.isnan(worlds['hydrographic_coverage'][
+        worlds['type'] >= 0][gas_giant]))
+    assert not np.any(np.isnan(worlds['diameter'][worlds['type'] >= 0][
+        gas_giant | terrestrials]))
+    # moons are terrestrials at their parent blackbody temperature
+    assert all(issubclass(batch.WORLD_TYPES[c], Terrestrial)
+               for c in moons['type'] if c >= 0)
+    assert np.all(moons['blackbody_temperature'] ==
+                  worlds['blackbody_temperature'][moons['world']])
+
+
+def test_catalog_distributions(catalog):
+    # world types frequencies and worlds per star against the object model
+    counts, n_stars = {}, 0
+    for seed in range(1, 41):
+        system = Builder.build_star_system(seed, detail='types')
+        n_stars += len(system._stars)
+        for world in system._worlds:
+            for world_type in type(world).__mro__:
+                if world_type in batch.WORLD_TYPES:
+                    counts[world_type] = counts.get(world_type, 0) + 1
+                    break
+    total = sum(counts.values())
+    codes = catalog.worlds['type']
+    assert (total / n_stars ==
+            pytest.approx(len(codes) / len(catalog.stars['system']), abs=1.5))
+    for world_type in batch.WORLD_TYPES:
+        frequency = np.mean(codes == batch.WORLD_TYPES.index(world_type))
+        assert (counts.get(world_type, 0) / total ==
+                pytest.approx(frequency, abs=.06))
+
+
+def test_views(catalog):
+    systems = batch.SystemViews(catalog)
+    assert len(systems) == len(catalog.systems['population'])
+    assert systems[-1] == systems[len(systems) - 1]
+    system = next(s for s in systems if len(s._stars) > 1)
+    assert system.B == system._stars[1] and system.B._parent == system.A
+    assert system.B.orbit.radius == system.B.orbital_radius
+    assert system.B.orbit.period.unit == u.year
+    for star in (s for system in systems[:50] for s in system._stars):
+        assert star in star._star_system._stars
+        assert (star.orbital_radii.base is catalog.orbits['radius'] or
+                star.orbital_radii.base is catalog.orbits['radius'].base)
+        for world in star._worlds:
+            assert world._parent == star
+            assert world.orbit.radius == world.orbital_radius
+            assert world.orbit.period > 0 * u.year
+            assert type(world).__dictoffset__ == 0
+            model = world._model
+            if issubclass(model, GasGiant):
+                assert not isinstance(world, GasGiant)
+                assert world.moons >= len(world._moons)
+            elif issubclass(model, Terrestrial):
+                assert isinstance(world, batch.TerrestrialView)
+                # the climate column agrees with the model property
+                assert world.climate == World.climate.fget(world)
+                assert isinstance(world.habitability, (int, np.integer))
+                for moon in world._moons:
+                    assert moon._parent == world
+                    assert moon.orbit.radius == moon.orbital_radius
+                    assert isinstance(moon, batch.MoonView)
+                    # moons orbit their planet model
+                    assert moon.orbit.period == np.sqrt(
+                        moon.orbit.radius.to(D_earth).value ** 3 /
+                        (world.mass.value + moon.mass.value)) * .166 * u.a
+
+
+def test_shared_records():
+    seeds = [42, 7, 3, 11, 5]
+    systems = [Builder.build_star_system(seed, detail='types')
+               for seed in seeds]
+    expected = batch.records(systems, seeds)
+    assert len(expected.stars) == sum(len(s._stars) for s in systems)
+    assert (np.sum(expected.worlds['parent'] < 0) ==
+            sum(len(s._worlds) for s in systems))
+    with Builder.build_records(seeds, workers=2, chunksize=2,
+                               detail='types') as records:
+        assert len(records) == len(seeds)
+        assert [len(chunk.systems) for chunk in records.chunks] == [2, 2, 1]
+        # views over the shared blocks, not copies
+        assert all(chunk.worlds.base is not None for chunk in records.chunks)
+        for table, expected_table in zip(records.concatenate(), expected):
+            assert table.dtype == expected_table.dtype
+            for name in table.dtype.names:
+                np.testing.assert_array_equal(table[name],
+                                              expected_table[name])
+        names = [block.name for block in records._blocks]
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name)
+    # the blocks of records never closed are unlinked once collected
+    records = batch.SharedRecords([batch.share(expected)])
+    name = records._blocks[0].name
+    del records
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name)
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'),
+                    reason='shared memory blocks are not listed')
+@pytest.mark.parametrize('workers', [1, 2])
+def test_shared_records_failure(monkeypatch, workers):
+    build = builder._build_star_system
+
+    def build_star_system(seed, detail):
+        if seed == 3:
+            raise ValueError('failing seed')
+        return build(seed, detail)
+    # inherited by the forked workers
+    monkeypatch.setattr(builder, '_build_star_system', build_star_system)
+    blocks = set(os.listdir('/dev/shm'))
+    with pytest.raises(ValueError):
+        Builder.build_records([42, 7, 3, 11, 5], workers=workers,
+                              chunksize=1, detail='stars')
+    # the blocks of the chunks completed are unlinked
+    assert set(os.listdir('/dev/shm')) <= blocks
@@ -0,0 +1,65 @@
+import time
+import multiprocessing
+
+import numpy as np
+
+from gs4worldbuilding import cluster
+
+
+def test_leases():
+    leases = cluster.Leases(range(10), 4, .2, 'stars', 'records')
+    assert [len(leases.acquire('a').seeds) for _ in range(2)] == [4, 4]
+    last = leases.acquire('b')
+    assert last.seeds == range(8, 10) and leases.acquire('b') is None
+    leases.fail(last.id, 'b')
+    assert leases.acquire('c').id == last.id
+    # leases not renewed are issued again
+    time.sleep(.3)
+    assert leases.renew(0, 'a') is False
+    assert leases.acquire('c').id in (0, 1)
+    for lease in range(3):
+        leases.complete(cluster.Shard(lease, 'c', None,
+                                      [(lease * 4, 'ValueError()')]))
+    leases.complete(cluster.Shard(0, 'a', 'late', []))
+    assert leases.done() and leases.shards()[0].worker == 'c'
+    assert [seed for seed, _ in leases.skipped()] == [0, 4, 8]
+
+
+def test_generate_skips_failing_seeds(monkeypatch):
+    build = cluster.Builder.build_star_system
+
+    def build_star_system(seed, detail):
+        if seed == 7:
+            raise ValueError('failing seed')
+        return build(seed, detail=detail)
+    monkeypatch.setattr(cluster.Builder, 'build_star_system',
+                        build_star_system)
+    lease = cluster.Lease(0, [42, 7, 3], 'stars', 'records')
+    records, skipped = cluster._generate(lease, lambda: None)
+    assert records.systems['seed'].tolist() == [42, 3]
+    assert skipped == [(7, repr(ValueError('failing seed')))]
+
+
+def test_coordinator():
+    seeds = [42, 7, 3, 11, 5, 1]
+    with cluster.Coordinator(seeds, b'test', lease_size=2, lease_timeout=1,
+                             detail='stars', output='records') as c:
+        # a worker acquiring a lease and failing silently
+        manager = cluster._Manager(c.address, b'test')
+        manager.connect()
+        lost = manager.leases().acquire('lost')
+        workers = [multiprocessing.Process(target=cluster.work,
+                                           args=(c.address, b'test', .1))
+                   for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        shards = c.join(timeout=120)
+        assert c.skipped() == []
+        for worker in workers:
+            worker.join()
+    assert [shard.lease for shard in shards] == [0, 1, 2]
+    assert all(shard.worker != 'lost' for shard in shards)
+    assert (shards[lost.id].output.systems['seed'].tolist() ==
+            list(lost.seeds))
+    assert np.concatenate([shard.output.systems['seed']
+                           for shard in shards]).tolist() == seeds
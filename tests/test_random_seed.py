@@ -1,6 +1,15 @@
+import asyncio
+import pickle
+import threading
+import weakref
+
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 import gs4worldbuilding as gs4wb
+from gs4worldbuilding.model import pool
+from gs4worldbuilding.random import RandomGenerator
 
 
 @pytest.fixture
@@ -15,3 +24,192 @@ def test_seeds_42_42(system_42):
 
 def test_seeds_84_42(system_42):
     assert system_42 != gs4wb.Builder().build_star_system(84)
+
+
+def test_lazy_seeds_42_42(system_42):
+    system = gs4wb.Builder().build_star_system(42, lazy=True)
+    assert system_42 == system
+    assert all('_worlds' not in vars(star) for star in system._stars)
+
+    def worlds(system):
+        return [(world.name, type(world).__mro__[1], world.orbit.radius,
+                 [(moon.name, type(moon).__mro__[1], moon.orbit.radius)
+                  for moon in getattr(world, '_moons', [])])
+                for world in system._worlds]
+    assert worlds(system_42) == worlds(system)
+
+
+@pytest.mark.parametrize('detail', list(gs4wb.Detail))
+def test_detail_seeds_42_42(system_42, detail):
+    system = gs4wb.Builder().build_star_system(42, detail=detail)
+    assert system_42 == system
+    assert system.detail == detail
+    system.refine(gs4wb.Detail.FULL)
+    assert system.detail == gs4wb.Detail.FULL
+
+    def worlds(system):
+        return [(world.name, type(world).__mro__[1], world.orbit.radius,
+                 getattr(world, 'rotation', None),
+                 getattr(world, 'resource', None),
+                 [(moon.name, moon.rotation)
+                  for moon in getattr(world, '_moons', [])])
+                for world in system._worlds]
+    assert worlds(system_42) == worlds(system)
+
+
+def test_deadline_seeds_42_42(system_42):
+    def worlds(system):
+        return [(world.name, type(world).__mro__[1], world.orbit.radius,
+                 getattr(world, 'rotation', None),
+                 [(moon.name, moon.rotation)
+                  for moon in getattr(world, '_moons', [])])
+                for world in system._worlds]
+    expected = worlds(system_42)
+
+    # the stars are generated whatever the deadline
+    system = gs4wb.Builder.build_star_system(42, deadline=0)
+    assert system == system_42 and system.detail == gs4wb.Detail.STARS
+    # the rest is generated on access
+    assert worlds(system) == expected
+
+    system = gs4wb.Builder.build_star_system(42, deadline=0)
+    system.refine(deadline=0)
+    assert system.detail == gs4wb.Detail.STARS
+    system.refine(gs4wb.Detail.TYPES, deadline=60)
+    assert system.detail == gs4wb.Detail.TYPES
+    system.refine()
+    assert system.detail == gs4wb.Detail.FULL and worlds(system) == expected
+
+    system = gs4wb.Builder.build_star_system(42, deadline=60)
+    assert system.detail == gs4wb.Detail.FULL and worlds(system) == expected
+
+
+def test_pickle_seeds_42_42(system_42):
+    system = pickle.loads(pickle.dumps(system_42))
+    assert system == system_42
+    assert system.A is system._stars[0]
+
+    def worlds(system):
+        return [(world.name, type(world), world.orbit.radius,
+                 str(world.atmosphere) if hasattr(world, 'atmosphere')
+                 else None,
+                 [(moon.name, type(moon), moon.rotation)
+                  for moon in getattr(world, '_moons', [])])
+                for world in system._worlds]
+    assert worlds(system) == worlds(system_42)
+
+
+def test_build_star_systems():
+    seeds = [42, 0, 7, 3]
+    reports = []
+    systems = gs4wb.Builder.build_star_systems(seeds, workers=2, chunksize=1,
+                                               detail='types',
+                                               report=reports.append)
+    assert reports[0].systems == len(seeds) and reports[0].rate > 0
+
+    def worlds(system):
+        return [(world.name, type(world), world.orbit.radius)
+                for world in system._worlds]
+    for seed, system in zip(seeds, systems):
+        expected = gs4wb.Builder.build_star_system(seed, detail='types')
+        assert system == expected
+        assert worlds(system) == worlds(expected)
+    assert [worlds(s) for s in systems] == [
+        worlds(s) for s in gs4wb.Builder.build_star_systems(
+            seeds, workers=1, detail='types')]
+    # the seeds are chunked as by build_records and build_statistics
+    with pytest.raises(ValueError):
+        gs4wb.Builder.build_star_systems([42, None], workers=1)
+
+
+def test_iter_star_systems(monkeypatch):
+    seeds = [42, 7, 3, 11, 5]
+    # collecting every 2 systems
+    monkeypatch.setattr(gs4wb.builder, '_COLLECT_INTERVAL', 2)
+    systems = gs4wb.Builder.iter_star_systems(seeds, detail='stars')
+    released = []
+    for seed, system in zip(seeds, systems):
+        # the loop variable holds the previous system until the next one
+        # is generated, the ones before the last collection are released
+        if len(released) % 2 == 0:
+            assert all(ref() is None for ref in released[:-1])
+        assert system == gs4wb.Builder.build_star_system(seed,
+                                                         detail='stars')
+        released.append(weakref.ref(system))
+    del system
+    assert [len(chunk) for chunk in gs4wb.Builder.iter_star_systems(
+        seeds[:3], detail='stars', batch=2)] == [2, 1]
+    records = list(gs4wb.Builder.iter_star_systems(
+        seeds[:3], detail='stars', batch=2, flatten=True))
+    assert [list(r.systems['seed']) for r in records] == [[42, 7], [3]]
+
+
+def test_pooled_star_systems():
+    seeds = [42, 7, 3]
+    expected = [[(world.name, type(world), world.orbit.radius)
+                 for world in gs4wb.Builder.build_star_system(
+                     seed, detail='types')._worlds] for seed in seeds]
+    worlds = []
+    for system in gs4wb.Builder.iter_star_systems(seeds, detail='types',
+                                                  pooled=True):
+        # the pool is not entered while the generator is suspended
+        assert pool.active() is None
+        worlds.append([(world.name, type(world), world.orbit.radius)
+                       for world in system._worlds])
+    assert worlds == expected
+
+    models = pool.Pool()
+    with models:
+        system = gs4wb.Builder.build_star_system(42, detail='types')
+    ids = {id(model) for model in pool._models(system)}
+    assert models.release(system) == len(ids)
+    # the released models are reused by the next system
+    with models:
+        system = gs4wb.Builder.build_star_system(42, detail='types')
+    assert {id(model) for model in pool._models(system)} == ids
+    assert [(world.name, type(world), world.orbit.radius)
+            for world in system._worlds] == expected[0]
+    # and only within the with statement
+    models.release(system)
+    assert models.free(gs4wb.StarSystem) == 1
+    assert pool.acquire(gs4wb.StarSystem) is None
+    with pytest.raises(ValueError):
+        pool.Pool(0)
+
+
+def test_thread_generators():
+    RandomGenerator().seed = 42
+    seeds = []
+    thread = threading.Thread(
+        target=lambda: seeds.append(RandomGenerator().seed))
+    thread.start()
+    thread.join()
+    # threads draw from generators of their own
+    assert RandomGenerator().seed == 42 and seeds[0] != 42
+
+
+def test_async_star_systems():
+    seeds = [42, 7, 3, 11]
+
+    def worlds(system):
+        return [(world.name, type(world), world.orbit.radius)
+                for world in system._worlds]
+    expected = [worlds(gs4wb.Builder.build_star_system(seed, detail='types'))
+                for seed in seeds]
+
+    async def generate(executor):
+        systems = [system async for system in gs4wb.Builder.
+                   aiter_star_systems(seeds, detail='types',
+                                      executor=executor, concurrency=3)]
+        system = await gs4wb.Builder.abuild_star_system(
+            seeds[0], detail='types', executor=executor)
+        # closing the iteration cancels the pending generations
+        iteration = gs4wb.Builder.aiter_star_systems(
+            seeds, detail='types', executor=executor, concurrency=2)
+        await iteration.__anext__()
+        await iteration.aclose()
+        return [worlds(s) for s in systems], worlds(system)
+
+    with ThreadPoolExecutor(4) as executor:
+        systems, system = asyncio.run(generate(executor))
+    assert systems == expected and system == expected[0]
@@ -3,7 +3,12 @@ import numpy as np
 
 from astropy import units as u
 
-from gs4worldbuilding import Star, StarSystem
+from gs4worldbuilding import Builder, Star, StarSystem, Terrestrial, model
+from gs4worldbuilding import terrestrial
+from gs4worldbuilding.gas_giant import GasGiant
+from gs4worldbuilding.orbit import Orbit
+from gs4worldbuilding.populate_star import (make_limits, terrestrial_types,
+                                            update_moons)
 
 
 @pytest.fixture
@@ -128,3 +133,204 @@ def test_set_seed_mass_raises_exception_on_out_of_bounds(sol):
 def test_set_seed_mass_raises_exception_on_nan(sol):
     with pytest.raises(ValueError):
         sol.A.seed_mass = np.nan
+
+
+def test_extreme_population_1_age():
+    system = StarSystem()
+    system.population = StarSystem.Population.EXTREME_POPULATION_1
+    # the single value age range of the population
+    system.age = 0 * u.Ga
+    assert system.age == 0 * u.Ga
+    system.make_stars(StarSystem.MultipleStars.UNARY)
+    system.A.seed_mass = 1 * u.M_sun
+    assert not np.isnan(system.A.luminosity)
+
+
+def test_edit_applies_coupled_properties_on_commit(sol):
+    with sol.edit():
+        sol.age = 6 * u.Ga
+        sol.population = StarSystem.Population.OLD_POPULATION_1
+    assert sol.age == 6 * u.Ga
+    assert sol.population == StarSystem.Population.OLD_POPULATION_1
+
+
+def test_edit_rolls_back_on_out_of_bounds(sol):
+    with pytest.raises(ValueError):
+        with sol.edit():
+            sol.population = StarSystem.Population.OLD_POPULATION_1
+            sol.age = 50 * u.Ga
+    assert sol.age == 4.7 * u.Ga
+    assert sol.population == StarSystem.Population.INTERMEDIATE_POPULATION_1
+
+
+def test_edit_validates_final_bounds():
+    class Span(model.Model):
+        _precedence = ['start', 'end']
+        end_bounds = model.bounds.ValueBounds(0., 10.)
+
+        @property
+        def start(self):
+            return self._get_bounded_property('start')
+
+        @start.setter
+        def start(self, value):
+            self._set_bounded_property('start', value)
+
+        @property
+        def start_bounds(self):
+            return model.bounds.ValueBounds(0., self.end)
+
+        @property
+        def end(self):
+            return self._get_bounded_property('end')
+
+        @end.setter
+        def end(self, value):
+            self._set_bounded_property('end', value)
+
+    span = Span()
+    span.end, span.start = 10., 5.
+    # start is applied first, then rescaled by the end its bounds depend on
+    with pytest.raises(ValueError):
+        with span.edit():
+            span.start = 6.
+            span.end = 4.
+    assert (span.start, span.end) == (5., 10.)
+    assert model.Transaction.open == 0
+
+
+def test_edit_batches_star_systems(sol, alpha_centauri):
+    with model.edit(sol, alpha_centauri):
+        sol.A.seed_mass = 1.2 * u.M_sun
+        alpha_centauri.B.seed_mass = 1 * u.M_sun
+        assert alpha_centauri.B.seed_mass == 1 * u.M_sun
+    assert sol.A.seed_mass == 1.2 * u.M_sun
+    assert alpha_centauri.B.seed_mass == 1 * u.M_sun
+
+
+def test_update_regenerates_invalidated_worlds_only(sol):
+    sol.A.seed_mass = .6 * u.M_sun
+    limits = make_limits(sol.A)
+    kept = [world for world in sol.A._worlds
+            if limits.lower <= world.orbit.radius <= limits.upper and
+            (not isinstance(world, Terrestrial) or
+             isinstance(world, terrestrial_types(sol.A, world.size,
+                                                 world.orbit.radius.value)))]
+    sol.update()
+    assert all(any(world is w for w in sol.A._worlds) for world in kept)
+    for world in sol.A._worlds:
+        assert limits.lower <= world.orbit.radius <= limits.upper
+        if isinstance(world, Terrestrial):
+            assert isinstance(world, terrestrial_types(
+                                        sol.A, world.size,
+                                        world.orbit.radius.value))
+    assert sol._worlds == sol.A._worlds
+    # dropped orbits leave the layout
+    assert ((sol.A.orbital_radii >= limits.lower) &
+            (sol.A.orbital_radii <= limits.upper)).all()
+    assert all(world.orbit.radius.value in sol.A._layout[0]
+               for world in sol.A._worlds)
+
+
+def test_update_keys_substreams_by_orbit(sol):
+    sol.A.seed_mass = .6 * u.M_sun
+    worlds = list(sol.A._worlds)
+    sol.update()
+    expected = [(type(w), w.orbit.radius, getattr(w, 'diameter', None))
+                for w in sol.A._worlds]
+    # dropping an orbit beforehand leaves the other regenerated worlds as
+    # they are
+    sol.A._worlds = worlds[1:]
+    sol.update()
+    assert [(type(w), w.orbit.radius, getattr(w, 'diameter', None))
+            for w in sol.A._worlds] == [
+        world for world in expected
+        if world[1] != worlds[0].orbit.radius]
+
+
+def test_update_regenerates_tiny_moons():
+    system = Builder.build_star_system(42, detail='types')
+    gas_giant = next(w for w in system._worlds if isinstance(w, GasGiant))
+    # tiny rock moons invalidated by the cold gas giant
+    gas_giant._moons = [terrestrial.TinyRock(orbit=Orbit(gas_giant,
+                                                         moon.orbit.radius))
+                        for moon in gas_giant._moons[:2]]
+    types = [[type(moon).__mro__[1] for moon in update_moons(gas_giant, key)]
+             for key in range(20)]
+    # as when generated, only the innermost moon may be a sulfur world
+    assert {innermost for innermost, _ in types} == {terrestrial.TinyIce,
+                                                    terrestrial.TinySulfur}
+    assert {outer for _, outer in types} == {terrestrial.TinyIce}
+
+
+def test_reroll_regenerates_a_single_star(alpha_centauri):
+    a_worlds, c_worlds = list(alpha_centauri.A._worlds), list(alpha_centauri.C._worlds)
+    alpha_centauri.reroll(star='B', scope='worlds', seed=42)
+    b_worlds = [(type(w).__mro__[1], w.orbit.radius) for w in alpha_centauri.B._worlds]
+    alpha_centauri.reroll(star='B', scope='worlds', seed=42)
+    assert b_worlds == [(type(w).__mro__[1], w.orbit.radius)
+                        for w in alpha_centauri.B._worlds]
+    assert all(w is v for w, v in zip(alpha_centauri.A._worlds, a_worlds))
+    assert all(w is v for w, v in zip(alpha_centauri.C._worlds, c_worlds))
+
+
+def reroll_state(system):
+    # the worlds state, their details and their moons
+    return [((type(w), w.orbit.radius, getattr(w, '_entropy', None),
+              getattr(w, 'diameter', None)),
+             tuple(getattr(w, detail) for detail in getattr(w, '_details', [])
+                   if detail != 'atmosphere'),
+             [(m, m.orbit.radius, m.rotation)
+              for m in getattr(w, '_moons', [])])
+            for w in system._worlds]
+
+
+def test_reroll_moons_changes_moons_only():
+    system = Builder.build_star_system(42)
+    before = reroll_state(system)
+    system.reroll(star='A', scope='moons', seed=42)
+    after = reroll_state(system)
+    # the worlds are kept, their moons are generated again
+    assert [world for world, _, _ in after] == [w for w, _, _ in before]
+    assert any(moons != m for (_, _, moons), (_, _, m) in zip(after, before))
+    for world in system._worlds:
+        if isinstance(world, Terrestrial):
+            # the activities are rolled with the modifiers of the new moons
+            for activity in ('volcanic_activity', 'tectonic_activity'):
+                bounds = getattr(world, f'{activity}_bounds')
+                assert (bounds.lower <= getattr(world, activity) <=
+                        bounds.upper)
+    # the same seed rolls the same moons
+    other = Builder.build_star_system(42)
+    other.reroll(star='A', scope='moons', seed=42)
+    assert ([[(type(m), r, rotation) for m, r, rotation in moons]
+             for _, _, moons in reroll_state(other)] ==
+            [[(type(m), r, rotation) for m, r, rotation in moons]
+             for _, _, moons in after])
+
+
+def test_reroll_details_changes_details_only():
+    system = Builder.build_star_system(42)
+    before = reroll_state(system)
+    system.reroll(star='A', scope='details', seed=42)
+    after = reroll_state(system)
+    assert [world for world, _, _ in after] == [w for w, _, _ in before]
+    assert [[m for m, _, _ in moons] for _, _, moons in after] == \
+        [[m for m, _, _ in moons] for _, _, moons in before]
+    assert [details for _, details, _ in after] != \
+        [details for _, details, _ in before]
+
+
+def test_reroll_raises_exception_on_unknown_scope(sol):
+    with pytest.raises(ValueError):
+        sol.reroll(star='A', scope='stars')
+
+
+def test_star_letters(sol, procyon):
+    # letters are stored per system without mutating the class
+    assert sol.A is sol._stars[0] and procyon.B is procyon._stars[1]
+    assert vars(procyon)['B'] is procyon._stars[1]
+    assert not hasattr(sol, 'B')
+    assert not any(letter in vars(StarSystem) for letter in 'ABCDE')
+    procyon.make_stars(StarSystem.MultipleStars.UNARY)
+    assert not hasattr(procyon, 'B')
@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+
+from astropy import units as u
+
+from gs4worldbuilding.tables import Table
+from gs4worldbuilding.world import World
+from gs4worldbuilding.terrestrial.terrestrial import InplaceTerrestrial
+
+
+@pytest.mark.parametrize('inclusive', [False, True])
+def test_table_scalar_matches_array(inclusive):
+    table = Table({11: 'a', 13: 'b', 15: 'c'}, default='d',
+                  inclusive=inclusive)
+    rolls = np.append(np.arange(0, 20, .5), np.nan)
+    assert ([table.lookup(roll) for roll in rolls] ==
+            list(table.lookup(rolls)))
+    assert [table.index(roll) for roll in rolls] == list(table.index(rolls))
+    # thresholds are exclusive unless the table is inclusive
+    assert table.lookup(11) == ('a' if inclusive else 'b')
+    assert table.lookup(np.nan) == 'd'
+
+
+def test_table_floor():
+    climates = World._climates
+    assert climates.lookup(250 * u.K) == World.Climate.VERY_COLD
+    assert climates.lookup(0 * u.K) == World.Climate.FROZEN
+    assert climates.lookup(np.nan * u.K) is None
+    assert list(climates.index([-1, np.nan, 1000] * u.K)) == [-1, -1, 10]
+    # values are converted to the table unit
+    assert climates.lookup(280000 * u.mK) == World.Climate.COOL
+
+
+def test_table_outcomes_dtype():
+    modifiers = Table({.1: -10, .5: -8}, default=0, inclusive=True)
+    assert modifiers.lookup(np.array([.05, .5, 2])).dtype.kind == 'i'
+    assert list(modifiers.lookup(np.array([.05, .5, 2]))) == [-10, -8, 0]
+
+
+def test_table_bounds():
+    activities = InplaceTerrestrial._tectonic_activities
+    bounds = activities.bounds(-5, 11)
+    assert (bounds.lower, bounds.upper) == (
+        InplaceTerrestrial.TectonicActivity.NONE,
+        InplaceTerrestrial.TectonicActivity.MODERATE)
+    bounds = activities.bounds(16, 31)
+    assert (bounds.lower, bounds.upper) == (
+        InplaceTerrestrial.TectonicActivity.HEAVY,
+        InplaceTerrestrial.TectonicActivity.EXTREME)